@@ -5,8 +5,11 @@ from __future__ import annotations
 import asyncio
 import functools
 import logging
+import math
 import os
+import sys
 import time
+import zlib
 from collections import OrderedDict
 from collections.abc import AsyncGenerator, Awaitable, Callable, Coroutine, Iterator, MutableMapping
 from contextlib import asynccontextmanager
@@ -16,12 +19,24 @@ from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar, cast, ge
 from music_assistant_models.config_entries import ConfigEntry, ConfigValueType
 from music_assistant_models.enums import ConfigEntryType
 
-from music_assistant.constants import DB_TABLE_CACHE, DB_TABLE_SETTINGS, MASS_LOGGER_NAME
-from music_assistant.helpers.api import parse_value
+from music_assistant.constants import (
+    DB_TABLE_AUDIO_CACHE,
+    DB_TABLE_CACHE,
+    DB_TABLE_QUEUE_ITEMS_LOG,
+    DB_TABLE_SETTINGS,
+    MASS_LOGGER_NAME,
+)
+from music_assistant.helpers.api import api_command, parse_value
 from music_assistant.helpers.database import DatabaseConnection
-from music_assistant.helpers.json import async_json_loads, json_dumps
+from music_assistant.helpers.json import json_dumpb, json_loads
 from music_assistant.models.core_controller import CoreController
 
+try:
+    # zstd is part of the standard library since python 3.14
+    from compression import zstd
+except ImportError:
+    zstd = None
+
 if TYPE_CHECKING:
     from music_assistant_models.config_entries import CoreConfig
 
@@ -30,8 +45,22 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.cache")
 CONF_CLEAR_CACHE = "clear_cache"
+CONF_MAX_CACHE_SIZE = "max_cache_size"
+CONF_MAX_CACHE_ENTRIES = "max_cache_entries"
+CONF_MEMORY_CACHE_SIZE = "memory_cache_size"
+CONF_MEMORY_CACHE_GROUP_QUOTA = "memory_cache_group_quota"
+DEFAULT_MEMORY_CACHE_SIZE = 64  # MB
+DEFAULT_MEMORY_CACHE_GROUP_QUOTA = 25  # percent
 DEFAULT_CACHE_EXPIRATION = 86400 * 30  # 30 days
+# max number of records removed in a single (short) write transaction during cleanup
+CLEANUP_CHUNK_SIZE = 5000
 DB_SCHEMA_VERSION = 6
+# payloads larger than this (in bytes) are stored compressed in the database
+COMPRESS_THRESHOLD = 4096
+# header byte of the (binary) payload formats, legacy records are stored as json text
+PAYLOAD_JSON = b"\x01"
+PAYLOAD_JSON_ZLIB = b"\x02"
+PAYLOAD_JSON_ZSTD = b"\x03"
 
 BYPASS_CACHE: ContextVar[bool] = ContextVar("BYPASS_CACHE", default=False)
 
@@ -40,12 +69,15 @@ class CacheController(CoreController):
     """Basic cache controller using both memory and database."""
 
     domain: str = "cache"
+    config: CoreConfig
 
     def __init__(self, mass: MusicAssistant) -> None:
         """Initialize core controller."""
         super().__init__(mass)
         self.database: DatabaseConnection | None = None
-        self._mem_cache = MemoryCache(500)
+        self._mem_cache = MemoryCache(
+            DEFAULT_MEMORY_CACHE_SIZE * 1024 * 1024, DEFAULT_MEMORY_CACHE_GROUP_QUOTA / 100
+        )
         self.manifest.name = "Cache controller"
         self.manifest.description = (
             "Music Assistant's core controller for caching data throughout the application."
@@ -74,11 +106,67 @@ class CacheController(CoreController):
                 label="Clear cache",
                 description="Reset/clear all items in the cache. ",
             ),
+            ConfigEntry(
+                key=CONF_MAX_CACHE_SIZE,
+                type=ConfigEntryType.INTEGER,
+                default_value=0,
+                label="Maximum cache size (MB)",
+                description="Maximum size of the cache database (in megabytes). "
+                "When the cache grows larger, the entries which expire first are evicted.\n\n"
+                "Set to 0 for no limit.",
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_MAX_CACHE_ENTRIES,
+                type=ConfigEntryType.INTEGER,
+                default_value=0,
+                label="Maximum number of cache entries",
+                description="Maximum number of entries in the cache database. "
+                "When the cache has more entries, the entries which expire first are evicted.\n\n"
+                "Set to 0 for no limit.",
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_MEMORY_CACHE_SIZE,
+                type=ConfigEntryType.INTEGER,
+                default_value=DEFAULT_MEMORY_CACHE_SIZE,
+                range=(1, 4096),
+                label="Memory cache size (MB)",
+                description="Approximate amount of memory (in megabytes) used to keep "
+                "recently used cache entries in memory for faster access.",
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_MEMORY_CACHE_GROUP_QUOTA,
+                type=ConfigEntryType.INTEGER,
+                default_value=DEFAULT_MEMORY_CACHE_GROUP_QUOTA,
+                range=(1, 100),
+                label="Memory cache quota per provider (%)",
+                description="Maximum share of the memory cache which may be used by the "
+                "entries of a single provider/category, so one (busy) provider can not "
+                "evict the cached data of all others.",
+                category="advanced",
+            ),
         )
 
     async def setup(self, config: CoreConfig) -> None:
         """Async initialize of cache module."""
         self.logger.info("Initializing cache controller...")
+        self.config = config
+        self._mem_cache.max_bytes = (
+            int(str(config.get_value(CONF_MEMORY_CACHE_SIZE) or DEFAULT_MEMORY_CACHE_SIZE))
+            * 1024
+            * 1024
+        )
+        self._mem_cache.group_quota = (
+            int(
+                str(
+                    config.get_value(CONF_MEMORY_CACHE_GROUP_QUOTA)
+                    or DEFAULT_MEMORY_CACHE_GROUP_QUOTA
+                )
+            )
+            / 100
+        )
         await self._setup_database()
         self.__schedule_cleanup_task()
 
@@ -105,26 +193,45 @@ class CacheController(CoreController):
                     cache object matches the checksum provided
         - default: value to return if no cache object is found
         """
+        entry = await self.get_entry(key, provider, category, checksum, allow_bypass)
+        if entry is None or entry[1] < int(time.time()):
+            return default
+        return entry[0]
+
+    async def get_entry(
+        self,
+        key: str,
+        provider: str = "default",
+        category: int = 0,
+        checksum: str | int | None = None,
+        allow_bypass: bool = True,
+    ) -> tuple[Any, int] | None:
+        """
+        Get object from cache, including its expiration timestamp.
+
+        Unlike `get`, this also returns objects which are already expired (but not yet removed
+        by the cleanup task), so the caller can decide to use stale data while refreshing it.
+        Returns None if no (matching) cache object is found.
+        """
         assert self.database is not None
         assert key, "No key provided"
         if allow_bypass and BYPASS_CACHE.get():
-            return default
-        cur_time = int(time.time())
+            return None
         if checksum is not None and not isinstance(checksum, str):
             checksum = str(checksum)
         # try memory cache first
         memory_key = f"{provider}/{category}/{key}"
         cache_data = self._mem_cache.get(memory_key)
-        if cache_data and (not checksum or cache_data[1] == checksum) and cache_data[2] >= cur_time:
-            return cache_data[0]
+        if cache_data and (not checksum or cache_data[1] == checksum):
+            return cache_data[0], cache_data[2]
         # fall back to db cache
         if (
             db_row := await self.database.get_row(
                 DB_TABLE_CACHE, {"category": category, "provider": provider, "key": key}
             )
-        ) and (not checksum or (db_row["checksum"] == checksum and db_row["expires"] >= cur_time)):
+        ) and (not checksum or db_row["checksum"] == checksum):
             try:
-                data = await async_json_loads(db_row["data"])
+                data, data_size = await asyncio.to_thread(decode_cache_data, db_row["data"])
             except Exception as exc:
                 LOGGER.error(
                     "Error parsing cache data for %s: %s",
@@ -134,13 +241,14 @@ class CacheController(CoreController):
                 )
             else:
                 # also store in memory cache for faster access
-                self._mem_cache[memory_key] = (
-                    data,
-                    db_row["checksum"],
-                    db_row["expires"],
+                self._mem_cache.set(
+                    memory_key,
+                    (data, db_row["checksum"], db_row["expires"]),
+                    size=data_size,
+                    group=f"{provider}/{category}",
                 )
-                return data
-        return default
+                return data, db_row["expires"]
+        return None
 
     async def set(
         self,
@@ -170,11 +278,20 @@ class CacheController(CoreController):
             checksum = str(checksum)
         expires = int(time.time() + expiration)
         memory_key = f"{provider}/{category}/{key}"
-        self._mem_cache[memory_key] = (data, checksum, expires)
         if (expires - time.time()) < 1800:
             # do not cache items in db with short expiration
+            self._mem_cache.set(
+                memory_key, (data, checksum, expires), group=f"{provider}/{category}"
+            )
             return
-        data = await asyncio.to_thread(json_dumps, data)
+        db_data, data_size = await asyncio.to_thread(encode_cache_data, data)
+        # the serialized size is a good approximation of the size in memory
+        self._mem_cache.set(
+            memory_key,
+            (data, checksum, expires),
+            size=data_size,
+            group=f"{provider}/{category}",
+        )
         await self.database.insert_or_replace(
             DB_TABLE_CACHE,
             {
@@ -183,11 +300,16 @@ class CacheController(CoreController):
                 "key": key,
                 "expires": expires,
                 "checksum": checksum,
-                "data": data,
+                "data": db_data,
                 "persistent": persistent,
             },
         )
 
+    @api_command("cache/memory_stats", required_role="admin")
+    def get_memory_stats(self) -> dict[str, Any]:
+        """Return statistics (size, hits, misses, evictions) of the in-memory cache."""
+        return self._mem_cache.stats()
+
     async def delete(
         self, key: str | None, category: int | None = None, provider: str | None = None
     ) -> None:
@@ -234,17 +356,41 @@ class CacheController(CoreController):
         """Run scheduled auto cleanup task."""
         assert self.database is not None
         self.logger.debug("Running automatic cleanup...")
-        # simply reset the memory cache
-        self._mem_cache.clear()
-        cur_timestamp = int(time.time())
-        cleaned_records = 0
-        for db_row in await self.database.get_rows(DB_TABLE_CACHE):
-            # clean up db cache object only if expired
-            if db_row["expires"] < cur_timestamp:
-                await self.database.delete(DB_TABLE_CACHE, {"id": db_row["id"]})
-                cleaned_records += 1
-            await asyncio.sleep(0)  # yield to eventloop
-        self.logger.debug("Automatic cleanup finished (cleaned up %s records)", cleaned_records)
+        start_time = time.time()
+        # remove the expired entries from the memory cache (the others remain valid)
+        for memory_key, (cache_data, _, _) in list(self._mem_cache.d.items()):
+            if cache_data[2] < int(start_time):
+                self._mem_cache.pop(memory_key)
+        db_size_before = await self._get_db_used_size()
+        # remove all expired records
+        expired_records = 0
+        while removed := await self.__delete_records("expires < :now", {"now": int(start_time)}):
+            expired_records += removed
+        # evict the (non persistent) records which expire first if the cache exceeds its limits
+        evicted_records = 0
+        if max_entries := int(str(self.config.get_value(CONF_MAX_CACHE_ENTRIES) or 0)):
+            while (excess := await self.database.get_count(DB_TABLE_CACHE) - max_entries) > 0:
+                if not (removed := await self.__evict_records(excess)):
+                    break
+                evicted_records += removed
+        if max_size := int(str(self.config.get_value(CONF_MAX_CACHE_SIZE) or 0)) * 1024 * 1024:
+            while (db_size := await self._get_db_used_size()) > max_size:
+                # estimate the number of records to evict from the average record size
+                record_count = await self.database.get_count(DB_TABLE_CACHE)
+                excess = math.ceil((db_size - max_size) / (db_size / max(record_count, 1)))
+                if not (removed := await self.__evict_records(excess)):
+                    break
+                evicted_records += removed
+        db_size_after = await self._get_db_used_size()
+        self.logger.debug(
+            "Automatic cleanup finished in %.2f seconds: removed %s expired and evicted %s "
+            "records, reclaimed %.1f MB (%.1f MB in use)",
+            time.time() - start_time,
+            expired_records,
+            evicted_records,
+            (db_size_before - db_size_after) / 1024 / 1024,
+            db_size_after / 1024 / 1024,
+        )
 
     @asynccontextmanager
     async def handle_refresh(self, bypass: bool) -> AsyncGenerator[None, None]:
@@ -317,12 +463,28 @@ class CacheController(CoreController):
                     [key] TEXT NOT NULL,
                     [provider] TEXT NOT NULL,
                     [expires] INTEGER NOT NULL,
-                    [data] TEXT NULL,
+                    [data] BLOB NULL,
                     [checksum] TEXT NULL,
                     [persistent] INTEGER NOT NULL DEFAULT 0,
                     UNIQUE(category, key, provider)
                     )"""
         )
+        await self.database.execute(
+            f"""CREATE TABLE IF NOT EXISTS {DB_TABLE_QUEUE_ITEMS_LOG}(
+                    [id] INTEGER PRIMARY KEY AUTOINCREMENT,
+                    [queue_id] TEXT NOT NULL,
+                    [data] TEXT NOT NULL
+                    )"""
+        )
+        await self.database.execute(
+            f"""CREATE TABLE IF NOT EXISTS {DB_TABLE_AUDIO_CACHE}(
+                    [key] TEXT PRIMARY KEY,
+                    [uri] TEXT NOT NULL,
+                    [size] INTEGER NOT NULL,
+                    [last_access] INTEGER NOT NULL,
+                    [expires] INTEGER NOT NULL
+                    )"""
+        )
 
         await self.database.commit()
 
@@ -356,7 +518,49 @@ class CacheController(CoreController):
             f"CREATE INDEX IF NOT EXISTS {DB_TABLE_CACHE}_key_provider_idx "
             f"ON {DB_TABLE_CACHE}(key,provider);"
         )
+        await self.database.execute(
+            f"CREATE INDEX IF NOT EXISTS {DB_TABLE_CACHE}_expires_idx ON {DB_TABLE_CACHE}(expires);"
+        )
+        await self.database.execute(
+            f"CREATE INDEX IF NOT EXISTS {DB_TABLE_QUEUE_ITEMS_LOG}_queue_id_idx "
+            f"ON {DB_TABLE_QUEUE_ITEMS_LOG}(queue_id,id);"
+        )
+        await self.database.commit()
+
+    async def _get_db_used_size(self) -> int:
+        """Return the (used) size of the cache database in bytes, excluding free pages."""
+        assert self.database is not None
+        rows = await self.database.get_rows_from_query(
+            "SELECT page_count, freelist_count, page_size "
+            "FROM pragma_page_count(), pragma_freelist_count(), pragma_page_size()",
+            limit=0,
+        )
+        return int((rows[0]["page_count"] - rows[0]["freelist_count"]) * rows[0]["page_size"])
+
+    async def __evict_records(self, count: int) -> int:
+        """Evict (at most) count non-persistent records which expire first."""
+        return await self.__delete_records(
+            "persistent = 0", order_by="expires", limit=min(count, CLEANUP_CHUNK_SIZE)
+        )
+
+    async def __delete_records(
+        self,
+        where_clause: str,
+        params: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int = CLEANUP_CHUNK_SIZE,
+    ) -> int:
+        """Delete a chunk of (matching) records in a single transaction, return the count."""
+        assert self.database is not None
+        sub_query = f"SELECT id FROM {DB_TABLE_CACHE} WHERE {where_clause}"
+        if order_by:
+            sub_query += f" ORDER BY {order_by}"
+        cursor = await self.database.execute(
+            f"DELETE FROM {DB_TABLE_CACHE} WHERE id IN ({sub_query} LIMIT {limit})", params
+        )
         await self.database.commit()
+        await asyncio.sleep(0)  # yield to eventloop
+        return int(cursor.rowcount)
 
     def __schedule_cleanup_task(self) -> None:
         """Schedule the cleanup task."""
@@ -380,15 +584,24 @@ def use_cache(
     persistent: bool = False,
     cache_checksum: str | None = None,
     allow_bypass: bool = True,
+    stale_while_revalidate: bool = True,
 ) -> Callable[
     [Callable[Concatenate[ProviderT, P], Awaitable[R]]],
     Callable[Concatenate[ProviderT, P], Coroutine[Any, Any, R]],
 ]:
-    """Return decorator that can be used to cache a method's result."""
+    """
+    Return decorator that can be used to cache a method's result.
+
+    Concurrent calls (with the same arguments) which miss the cache share a single call
+    of the decorated method. If stale_while_revalidate is set, an expired (but not yet
+    cleaned up) cache object is returned immediately while it is refreshed in the background.
+    """
 
     def _decorator(
         func: Callable[Concatenate[ProviderT, P], Awaitable[R]],
     ) -> Callable[Concatenate[ProviderT, P], Coroutine[Any, Any, R]]:
+        return_type: Any = None
+
         @functools.wraps(func)
         async def wrapper(self: ProviderT, *args: P.args, **kwargs: P.kwargs) -> R:
             cache = self.mass.cache
@@ -399,75 +612,225 @@ def use_cache(
             for key in sorted(kwargs.keys()):
                 cache_key_parts.append(f"{key}{kwargs[key]}")
             cache_key = ".".join(map(str, cache_key_parts))
+
+            async def _fetch() -> R:
+                # get data from method/provider
+                result = await func(self, *args, **kwargs)
+                # store result in cache (but don't await)
+                self.mass.create_task(
+                    cache.set(
+                        key=cache_key,
+                        data=result,
+                        expiration=expiration,
+                        provider=provider_id,
+                        category=category,
+                        checksum=cache_checksum,
+                        persistent=persistent,
+                    )
+                )
+                return result
+
+            # concurrent calls for the same cache key share a single (in-flight) task
+            task_id = f"use_cache.{provider_id}.{category}.{cache_key}"
             # try to retrieve data from the cache
-            cachedata = await cache.get(
-                cache_key,
-                provider=provider_id,
-                checksum=cache_checksum,
-                category=category,
-                allow_bypass=allow_bypass,
-            )
-            if cachedata is not None:
-                type_hints = get_type_hints(func)
-                return cast("R", parse_value(func.__name__, cachedata, type_hints["return"]))
-            # get data from method/provider
-            result = await func(self, *args, **kwargs)
-            # store result in cache (but don't await)
-            self.mass.create_task(
-                cache.set(
-                    key=cache_key,
-                    data=result,
-                    expiration=expiration,
+            if (
+                entry := await cache.get_entry(
+                    cache_key,
                     provider=provider_id,
-                    category=category,
                     checksum=cache_checksum,
-                    persistent=persistent,
+                    category=category,
+                    allow_bypass=allow_bypass,
                 )
-            )
-            return result
+            ) is not None and (stale_while_revalidate or entry[1] >= time.time()):
+                cachedata, expires = entry
+                if expires < time.time():
+                    # serve the stale data and refresh it in the background
+                    task = self.mass.create_task(_fetch, task_id=task_id, abort_existing=False)
+                    task.add_done_callback(functools.partial(_log_refresh_error, cache_key))
+                nonlocal return_type
+                if return_type is None:
+                    # resolve (once) on first use, as the hints may contain forward references
+                    return_type = get_type_hints(func)["return"]
+                return cast("R", parse_value(func.__name__, cachedata, return_type))
+            task = self.mass.create_task(_fetch, task_id=task_id, abort_existing=False)
+            # shield the shared task so a cancelled caller does not cancel it for the others
+            return await asyncio.shield(task)
 
         return wrapper
 
     return _decorator
 
 
+def encode_cache_data(data: Any) -> tuple[bytes, int]:
+    """
+    Encode data for storage in the cache database.
+
+    Returns the (binary) payload and the size of the uncompressed data.
+    """
+    raw = json_dumpb(data)
+    if len(raw) <= COMPRESS_THRESHOLD:
+        return PAYLOAD_JSON + raw, len(raw)
+    if zstd is not None:
+        return PAYLOAD_JSON_ZSTD + zstd.compress(raw), len(raw)
+    return PAYLOAD_JSON_ZLIB + zlib.compress(raw, 1), len(raw)
+
+
+def decode_cache_data(payload: bytes | str) -> tuple[Any, int]:
+    """
+    Decode a payload from the cache database.
+
+    Returns the data and the size of the uncompressed data.
+    """
+    if isinstance(payload, str):
+        # legacy format: plain json text
+        return json_loads(payload), len(payload)
+    header, raw = payload[:1], payload[1:]
+    if header == PAYLOAD_JSON_ZSTD:
+        if zstd is None:
+            msg = "zstd compressed cache data is not supported on this python version"
+            raise RuntimeError(msg)
+        raw = zstd.decompress(raw)
+    elif header == PAYLOAD_JSON_ZLIB:
+        raw = zlib.decompress(raw)
+    elif header != PAYLOAD_JSON:
+        msg = f"Unknown cache data format: {header!r}"
+        raise ValueError(msg)
+    return json_loads(raw), len(raw)
+
+
+def _log_refresh_error(cache_key: str, task: asyncio.Task[Any]) -> None:
+    """Log (and retrieve) the exception of a background cache refresh."""
+    if task.cancelled() or not (err := task.exception()):
+        return
+    LOGGER.warning(
+        "Error while refreshing cached data for %s: %s",
+        cache_key,
+        str(err),
+        exc_info=err if LOGGER.isEnabledFor(logging.DEBUG) else None,
+    )
+
+
 class MemoryCache(MutableMapping[str, Any]):
-    """Simple limited in-memory cache implementation."""
+    """
+    Limited in-memory LRU cache implementation.
+
+    The cache is bounded by the (approximate) size of its values in bytes. Entries can be
+    assigned to a group (e.g. provider/category), which may use at most a share of the
+    total budget, so a single group can not push all other entries out of the cache.
+    """
 
-    def __init__(self, maxlen: int) -> None:
+    def __init__(self, max_bytes: int, group_quota: float = 1.0) -> None:
         """Initialize."""
-        self._maxlen = maxlen
-        self.d: OrderedDict[str, Any] = OrderedDict()
+        self.max_bytes = max_bytes
+        self.group_quota = group_quota
+        # key -> (value, size, group)
+        self.d: OrderedDict[str, tuple[Any, int, str | None]] = OrderedDict()
+        self._groups: dict[str, OrderedDict[str, None]] = {}
+        self._group_bytes: dict[str, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     @property
-    def maxlen(self) -> int:
-        """Return max length."""
-        return self._maxlen
+    def size(self) -> int:
+        """Return (approximate) total size of all values in bytes."""
+        return self._bytes
 
     def get(self, key: str, default: Any = None) -> Any:
         """Return item or default."""
-        return self.d.get(key, default)
+        if (entry := self.d.get(key)) is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(key, entry[2])
+        return entry[0]
+
+    def set(self, key: str, value: Any, size: int | None = None, group: str | None = None) -> None:
+        """Set item, with an optional (precomputed) size in bytes and group."""
+        self._remove(key)
+        if size is None:
+            size = estimate_size(value)
+        group_limit = int(self.max_bytes * self.group_quota) if group else self.max_bytes
+        if size > group_limit:
+            # never store an item that would evict (almost) everything else
+            return
+        if group:
+            # make room within the quota of the group
+            group_keys = self._groups.setdefault(group, OrderedDict())
+            while group_keys and self._group_bytes.get(group, 0) + size > group_limit:
+                self._evict(next(iter(group_keys)))
+            # evicting the last item of the group removes the group (and its keys)
+            self._groups.setdefault(group, group_keys)[key] = None
+            self._group_bytes[group] = self._group_bytes.get(group, 0) + size
+        # make room within the total budget
+        while self.d and self._bytes + size > self.max_bytes:
+            self._evict(next(iter(self.d)))
+        self.d[key] = (value, size, group)
+        self._bytes += size
 
     def pop(self, key: str, default: Any = None) -> Any:
         """Pop item from collection."""
-        return self.d.pop(key, default)
+        if (entry := self._remove(key)) is None:
+            return default
+        return entry[0]
+
+    def stats(self) -> dict[str, Any]:
+        """Return statistics of the cache."""
+        return {
+            "entries": len(self.d),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "group_quota": self.group_quota,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "groups": {
+                group: {"entries": len(keys), "bytes": self._group_bytes.get(group, 0)}
+                for group, keys in self._groups.items()
+            },
+        }
+
+    def _touch(self, key: str, group: str | None) -> None:
+        """Mark item as most recently used."""
+        self.d.move_to_end(key)
+        if group:
+            self._groups[group].move_to_end(key)
+
+    def _evict(self, key: str) -> None:
+        """Evict (least recently used) item."""
+        self._remove(key)
+        self.evictions += 1
+
+    def _remove(self, key: str) -> tuple[Any, int, str | None] | None:
+        """Remove item (if present) and update the size accounting."""
+        if (entry := self.d.pop(key, None)) is None:
+            return None
+        _, size, group = entry
+        self._bytes -= size
+        if group:
+            group_keys = self._groups[group]
+            del group_keys[key]
+            self._group_bytes[group] -= size
+            if not group_keys:
+                del self._groups[group]
+                del self._group_bytes[group]
+        return entry
 
     def __getitem__(self, key: str) -> Any:
         """Get item."""
-        self.d.move_to_end(key)
-        return self.d[key]
+        value, _, group = self.d[key]
+        self._touch(key, group)
+        return value
 
     def __setitem__(self, key: str, value: Any) -> None:
         """Set item."""
-        if key in self.d:
-            self.d.move_to_end(key)
-        elif len(self.d) == self.maxlen:
-            self.d.popitem(last=False)
-        self.d[key] = value
+        self.set(key, value)
 
     def __delitem__(self, key: str) -> None:
         """Delete item."""
-        del self.d[key]
+        if self._remove(key) is None:
+            raise KeyError(key)
 
     def __iter__(self) -> Iterator[str]:
         """Iterate items."""
@@ -478,5 +841,35 @@ class MemoryCache(MutableMapping[str, Any]):
         return len(self.d)
 
     def clear(self) -> None:
-        """Clear cache."""
+        """Clear cache (the counters are kept)."""
         self.d.clear()
+        self._groups.clear()
+        self._group_bytes.clear()
+        self._bytes = 0
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Return the (rough) size of a value in bytes.
+
+    Large collections are sampled, as an exact calculation would cost more than it saves.
+    """
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        items: list[Any] = [*value.keys(), *value.values()]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+    if not items:
+        return size
+    if len(items) <= 32:
+        return size + sum(estimate_size(item, _depth + 1) for item in items)
+    sample = items[:: len(items) // 16][:16]
+    return size + sum(estimate_size(item, _depth + 1) for item in sample) * len(items) // len(
+        sample
+    )
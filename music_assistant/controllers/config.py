@@ -103,6 +103,10 @@ class ConfigController:
         self.filename = os.path.join(self.mass.storage_path, "settings.json")
         self._timer_handle: asyncio.TimerHandle | None = None
         self._value_cache: dict[str, ConfigValueType] = {}
+        # resolved (read-only) config snapshots, used for the (frequent) value lookups
+        self._player_config_snapshots: dict[str, PlayerConfig] = {}
+        self._core_config_snapshots: dict[str, CoreConfig] = {}
+        self._snapshots_version = 0
 
     async def setup(self) -> None:
         """Async initialize of controller."""
@@ -633,7 +637,7 @@ class ConfigController:
             perform runtime type validation. Callers are responsible for ensuring the
             specified type matches the actual config value type.
         """
-        conf = await self.get_player_config(player_id)
+        conf = await self.get_player_config_snapshot(player_id)
         if key not in conf.values:
             if default is not None:
                 return default
@@ -647,6 +651,34 @@ class ConfigController:
             else conf.values[key].default_value
         )
 
+    async def get_player_config_snapshot(self, player_id: str) -> PlayerConfig:
+        """
+        Return the (cached) resolved configuration for a single player.
+
+        The snapshot is shared between callers and must be treated as read-only, it is
+        invalidated on any config change (e.g. save of the player or DSP config), when
+        the player (or its provider) is (re)loaded and when the supported features or
+        group members of the player change.
+        """
+        if snapshot := self._player_config_snapshots.get(player_id):
+            return snapshot
+        version = self._snapshots_version
+        conf = await self.get_player_config(player_id)
+        # only store the snapshot of a registered player (the config entries of an
+        # unavailable player are not known) and if it was not invalidated in the meantime
+        if version == self._snapshots_version and self.mass.players.get(player_id, False):
+            self._player_config_snapshots[player_id] = conf
+        return conf
+
+    def invalidate_config_snapshots(self, player_id: str | None = None) -> None:
+        """Invalidate the resolved config snapshot(s) of a single player (or all)."""
+        self._snapshots_version += 1
+        if player_id is None:
+            self._player_config_snapshots = {}
+            self._core_config_snapshots = {}
+            return
+        self._player_config_snapshots.pop(player_id, None)
+
     if TYPE_CHECKING:
         # Overload for when default is provided - return type matches default type
         @overload
@@ -970,6 +1002,21 @@ class ConfigController:
         config_entries = await self.get_core_config_entries(domain)
         return cast("CoreConfig", CoreConfig.parse(config_entries, raw_conf))
 
+    async def get_core_config_snapshot(self, domain: str) -> CoreConfig:
+        """
+        Return the (cached) resolved configuration for a single core controller.
+
+        The snapshot is shared between callers and must be treated as read-only,
+        it is invalidated on any config change.
+        """
+        if snapshot := self._core_config_snapshots.get(domain):
+            return snapshot
+        version = self._snapshots_version
+        conf = await self.get_core_config(domain)
+        if version == self._snapshots_version:
+            self._core_config_snapshots[domain] = conf
+        return conf
+
     @overload
     async def get_core_config_value(
         self,
@@ -1020,7 +1067,7 @@ class ConfigController:
             perform runtime type validation. Callers are responsible for ensuring the
             specified type matches the actual config value type.
         """
-        conf = await self.get_core_config(domain)
+        conf = await self.get_core_config_snapshot(domain)
         if key not in conf.values:
             if default is not None:
                 return default
@@ -1207,6 +1254,9 @@ class ConfigController:
     def save(self, immediate: bool = False) -> None:
         """Schedule save of data to disk."""
         self._value_cache = {}
+        # any (raw) config change, such as a saved player or DSP config,
+        # invalidates all resolved config snapshots
+        self.invalidate_config_snapshots()
         if self._timer_handle is not None:
             self._timer_handle.cancel()
             self._timer_handle = None
@@ -19,7 +19,7 @@ from music_assistant_models.media_items import (
 )
 
 from music_assistant.constants import DB_TABLE_ALBUM_ARTISTS, DB_TABLE_ALBUM_TRACKS, DB_TABLE_ALBUMS
-from music_assistant.controllers.media.base import MediaControllerBase
+from music_assistant.controllers.media.base import LibraryItemsPage, MediaControllerBase
 from music_assistant.controllers.webserver.helpers.auth_middleware import get_current_user
 from music_assistant.helpers.compare import (
     compare_album,
@@ -140,8 +140,9 @@ class AlbumsController(MediaControllerBase[Album]):
                 "JOIN artists ON artists.item_id = album_artists.artist_id "
             )
             artist_table_joined = True
-        if search and " - " in search:
+        if search and " - " in search and not self._use_fts_search(search):
             # handle combined artist + title search
+            # (the full-text search index already matches on artist names)
             artist_str, title_str = search.split(" - ", 1)
             search = None
             title_str = create_safe_string(title_str, True, True)
@@ -173,8 +174,15 @@ class AlbumsController(MediaControllerBase[Album]):
         # Calculate how many more items we need to reach the original limit
         remaining_limit = limit - len(result)
 
-        if search and len(result) < 25 and not offset and remaining_limit > 0:
+        if (
+            search
+            and len(result) < 25
+            and not offset
+            and remaining_limit > 0
+            and not self._use_fts_search(search)
+        ):
             # append artist items to result
+            # (not needed for the full-text search index, which also matches artist names)
             search = create_safe_string(search, True, True)
             extra_join_parts.append(
                 "JOIN album_artists ON album_artists.album_id = albums.item_id "
@@ -204,6 +212,42 @@ class AlbumsController(MediaControllerBase[Album]):
                         break
         return result
 
+    async def library_items_page(
+        self,
+        favorite: bool | None = None,
+        search: str | None = None,
+        limit: int = 500,
+        order_by: str = "sort_name",
+        provider: str | list[str] | None = None,
+        cursor: str | None = None,
+        album_types: list[AlbumType] | None = None,
+    ) -> LibraryItemsPage[Album]:
+        """Get a page of in-database albums, using cursor based pagination.
+
+        :param favorite: Filter by favorite status.
+        :param search: Filter by search query.
+        :param limit: Maximum number of items to return.
+        :param order_by: Order by field (e.g. 'sort_name', 'timestamp_added').
+        :param provider: Filter by provider instance ID (single string or list).
+        :param cursor: The next_cursor of the previous page (None for the first page).
+        :param album_types: Filter by album types.
+        """
+        extra_query_params: dict[str, Any] = {}
+        extra_query_parts: list[str] = []
+        if album_types:
+            extra_query_parts.append("albums.album_type IN :album_types")
+            extra_query_params["album_types"] = [x.value for x in album_types]
+        return await self.get_library_items_page_by_query(
+            favorite=favorite,
+            search=search,
+            limit=limit,
+            order_by=order_by,
+            cursor=cursor,
+            provider_filter=self._ensure_provider_filter(provider),
+            extra_query_parts=extra_query_parts,
+            extra_query_params=extra_query_params,
+        )
+
     async def library_count(
         self, favorite_only: bool = False, album_types: list[AlbumType] | None = None
     ) -> int:
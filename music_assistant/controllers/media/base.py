@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import logging
 from abc import ABCMeta, abstractmethod
 from collections.abc import Iterable
 from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, TypeVar, cast, final
 
 from music_assistant_models.enums import EventType, ExternalID, MediaType, ProviderFeature
 from music_assistant_models.errors import (
     InsufficientPermissions,
+    InvalidDataError,
     MediaNotFoundError,
     ProviderUnavailableError,
 )
@@ -21,7 +24,13 @@ from music_assistant_models.media_items import ItemMapping, MediaItemType, Provi
 from music_assistant.constants import DB_TABLE_PLAYLOG, DB_TABLE_PROVIDER_MAPPINGS, MASS_LOGGER_NAME
 from music_assistant.controllers.webserver.helpers.auth_middleware import get_current_user
 from music_assistant.helpers.compare import compare_media_item, create_safe_string
-from music_assistant.helpers.json import json_loads, serialize_to_json
+from music_assistant.helpers.database import fts_match_query
+from music_assistant.helpers.json import (
+    JSON_DECODE_EXCEPTIONS,
+    json_dumps,
+    json_loads,
+    serialize_to_json,
+)
 from music_assistant.helpers.util import guard_single_request
 
 if TYPE_CHECKING:
@@ -70,8 +79,48 @@ SORT_KEYS = {
     "artist_name_desc": "artists.search_name DESC",
     "random": "RANDOM()",
     "random_play_count": "RANDOM(), play_count ASC",
+    # only available when searching with the full-text search index
+    "relevance": "fts_match.fts_rank ASC",
+}
+
+# sort keys that support keyset (cursor) pagination:
+# order_by --> (column, direction, nullable)
+KEYSET_SORT_KEYS: dict[str, tuple[str, str, bool]] = {
+    "name": ("search_name", "ASC", False),
+    "name_desc": ("search_name", "DESC", False),
+    "duration": ("duration", "ASC", True),
+    "duration_desc": ("duration", "DESC", True),
+    "sort_name": ("search_sort_name", "ASC", False),
+    "sort_name_desc": ("search_sort_name", "DESC", False),
+    "timestamp_added": ("timestamp_added", "ASC", True),
+    "timestamp_added_desc": ("timestamp_added", "DESC", True),
+    "timestamp_modified": ("timestamp_modified", "ASC", False),
+    "timestamp_modified_desc": ("timestamp_modified", "DESC", False),
+    "last_played": ("last_played", "ASC", True),
+    "last_played_desc": ("last_played", "DESC", True),
+    "play_count": ("play_count", "ASC", True),
+    "play_count_desc": ("play_count", "DESC", True),
+    "year": ("year", "ASC", True),
+    "year_desc": ("year", "DESC", True),
 }
 
+# very short search strings match (and need to rank) a large part of the library,
+# for those the (early terminating) LIKE scan is faster than the full-text search
+FTS_MIN_SEARCH_LENGTH = 2
+
+
+@dataclass
+class LibraryItemsPage[ItemCls: "MediaItemType"]:
+    """A page of library items with the (opaque) cursor to fetch the next page."""
+
+    items: list[ItemCls]
+    # None if there are no more items
+    next_cursor: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the serializable dict representation."""
+        return {"items": [x.to_dict() for x in self.items], "next_cursor": self.next_cursor}
+
 
 class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
     """Base model for controller managing a MediaType."""
@@ -105,6 +154,9 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         self.api_base = api_base = f"{self.media_type}s"
         self.mass.register_api_command(f"music/{api_base}/count", self.library_count)
         self.mass.register_api_command(f"music/{api_base}/library_items", self.library_items)
+        self.mass.register_api_command(
+            f"music/{api_base}/library_items_page", self.library_items_page
+        )
         self.mass.register_api_command(f"music/{api_base}/get", self.get)
         # Backward compatibility alias - prefer the generic "get" endpoint
         self.mass.register_api_command(
@@ -126,16 +178,18 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
     ) -> ItemCls:
         """Add item to library and return the new (or updated) database item."""
         new_item = False
-        # check for existing item first
-        if library_id := await self._get_library_item_by_match(item):
-            # update existing item
-            await self._update_library_item(library_id, item, overwrite=overwrite_existing)
-        else:
-            # actually add a new item in the library db
-            self.mass.music.match_provider_instances(item)
-            async with self._db_add_lock:
-                library_id = await self._add_library_item(item)
-                new_item = True
+        # write the item and all its related records (mappings, artists etc.) in one go
+        async with self.mass.music.database.batch():
+            # check for existing item first
+            if library_id := await self._get_library_item_by_match(item):
+                # update existing item
+                await self._update_library_item(library_id, item, overwrite=overwrite_existing)
+            else:
+                # actually add a new item in the library db
+                self.mass.music.match_provider_instances(item)
+                async with self._db_add_lock:
+                    library_id = await self._add_library_item(item)
+                    new_item = True
         # return final library_item
         library_item = await self.get_library_item(library_id)
         self.mass.signal_event(
@@ -263,6 +317,37 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
             provider_filter=self._ensure_provider_filter(provider),
         )
 
+    async def library_items_page(
+        self,
+        favorite: bool | None = None,
+        search: str | None = None,
+        limit: int = 500,
+        order_by: str = "sort_name",
+        provider: str | list[str] | None = None,
+        cursor: str | None = None,
+    ) -> LibraryItemsPage[ItemCls]:
+        """
+        Get a page of library items for this mediatype, using cursor based pagination.
+
+        Pass the next_cursor of the returned page to fetch the next page. Unlike offset based
+        paging, every page is fetched at the same (low) cost, also deep into a large library.
+
+        :param favorite: Filter by favorite status.
+        :param search: Filter by search query.
+        :param limit: Maximum number of items to return.
+        :param order_by: Order by field (e.g. 'sort_name', 'timestamp_added').
+        :param provider: Filter by provider instance ID (single string or list).
+        :param cursor: The next_cursor of the previous page (None for the first page).
+        """
+        return await self.get_library_items_page_by_query(
+            favorite=favorite,
+            search=search,
+            limit=limit,
+            order_by=order_by,
+            cursor=cursor,
+            provider_filter=self._ensure_provider_filter(provider),
+        )
+
     async def iter_library_items(
         self,
         favorite: bool | None = None,
@@ -271,26 +356,26 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         provider: str | list[str] | None = None,
     ) -> AsyncGenerator[ItemCls, None]:
         """Iterate all in-database items."""
-        limit: int = 500
-        offset: int = 0
         if provider is not None:
             provider_filter = provider if isinstance(provider, list) else [provider]
         else:
             provider_filter = None
+        if order_by not in KEYSET_SORT_KEYS:
+            # iterating (all items) requires a stable sort order
+            order_by = "sort_name"
+        cursor: str | None = None
         while True:
-            next_items = await self.get_library_items_by_query(
+            page = await self.get_library_items_page_by_query(
                 favorite=favorite,
                 search=search,
-                limit=limit,
-                offset=offset,
                 order_by=order_by,
+                cursor=cursor,
                 provider_filter=provider_filter,
             )
-            for item in next_items:
+            for item in page.items:
                 yield item
-            if len(next_items) < limit:
+            if not (cursor := page.next_cursor):
                 break
-            offset += limit
 
     async def get(
         self,
@@ -324,7 +409,7 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         # create safe search string
         search_query = search_query.replace("/", " ").replace("'", "")
         if provider_instance_id_or_domain == "library":
-            return await self.library_items(search=search_query, limit=limit)
+            return await self.library_items(search=search_query, limit=limit, order_by="relevance")
         if not (prov := self.mass.get_provider(provider_instance_id_or_domain)):
             return []
         prov = cast("MusicProvider", prov)
@@ -445,6 +530,28 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         offset: int = 0,
     ) -> list[ItemCls]:
         """Fetch all records from library for given provider."""
+        query, query_params = self._get_prov_id_query(
+            provider_domain=provider_domain,
+            provider_instance=provider_instance,
+            provider_instance_id_or_domain=provider_instance_id_or_domain,
+            provider_item_id=provider_item_id,
+        )
+        return await self.get_library_items_by_query(
+            limit=limit,
+            offset=offset,
+            extra_query_parts=[query],
+            extra_query_params=query_params,
+        )
+
+    @final
+    def _get_prov_id_query(
+        self,
+        provider_domain: str | None = None,
+        provider_instance: str | None = None,
+        provider_instance_id_or_domain: str | None = None,
+        provider_item_id: str | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Return the query (part) and params to filter library items on provider (item) id."""
         assert provider_instance_id_or_domain != "library"
         assert provider_domain != "library"
         assert provider_instance != "library"
@@ -466,13 +573,7 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
             subquery_parts.append("provider_mappings.provider_item_id = :item_id")
             query_params["item_id"] = provider_item_id
         subquery = f"SELECT item_id FROM provider_mappings WHERE {' AND '.join(subquery_parts)}"
-        query = f"WHERE {self.db_table}.item_id IN ({subquery})"
-        return await self.get_library_items_by_query(
-            limit=limit,
-            offset=offset,
-            extra_query_parts=[query],
-            extra_query_params=query_params,
-        )
+        return (f"WHERE {self.db_table}.item_id IN ({subquery})", query_params)
 
     @final
     async def iter_library_items_by_prov_id(
@@ -481,20 +582,22 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         provider_item_id: str | None = None,
     ) -> AsyncGenerator[ItemCls, None]:
         """Iterate all records from database for given provider."""
-        limit: int = 500
-        offset: int = 0
+        cursor: str | None = None
         while True:
-            next_items = await self.get_library_items_by_prov_id(
+            query, query_params = self._get_prov_id_query(
                 provider_instance_id_or_domain=provider_instance_id_or_domain,
                 provider_item_id=provider_item_id,
-                limit=limit,
-                offset=offset,
             )
-            for item in next_items:
+            page = await self.get_library_items_page_by_query(
+                order_by="sort_name",
+                cursor=cursor,
+                extra_query_parts=[query],
+                extra_query_params=query_params,
+            )
+            for item in page.items:
                 yield item
-            if len(next_items) < limit:
+            if not (cursor := page.next_cursor):
                 break
-            offset += limit
 
     @final
     async def set_favorite(self, item_id: str | int, favorite: bool) -> None:
@@ -715,6 +818,7 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
                 DB_TABLE_PROVIDER_MAPPINGS,
                 {"media_type": self.media_type.value, "item_id": db_id},
             )
+        prov_map_objs: list[dict[str, Any]] = []
         for provider_mapping in provider_mappings:
             prov_map_obj = {
                 "media_type": self.media_type.value,
@@ -728,10 +832,8 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
             for key in ("url", "details", "in_library", "is_unique"):
                 if (value := getattr(provider_mapping, key, None)) is not None:
                     prov_map_obj[key] = value
-            await self.mass.music.database.upsert(
-                DB_TABLE_PROVIDER_MAPPINGS,
-                prov_map_obj,
-            )
+            prov_map_objs.append(prov_map_obj)
+        await self.mass.music.database.upsert_many(DB_TABLE_PROVIDER_MAPPINGS, prov_map_objs)
 
     @abstractmethod
     async def _add_library_item(
@@ -786,7 +888,10 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
         query_params = extra_query_params or {}
         query_parts: list[str] = extra_query_parts or []
         join_parts: list[str] = extra_join_parts or []
-        search = self._preprocess_search(search, query_params)
+        search = self._apply_search(search, query_params, join_parts)
+        if order_by == "relevance" and "fts_query" not in query_params:
+            # relevance can only be determined by the full-text search
+            order_by = "sort_name"
         # create special performant random query
         if order_by and order_by.startswith("random"):
             self._apply_random_subquery(
@@ -818,6 +923,105 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
             )
         ]
 
+    @final
+    async def get_library_items_page_by_query(
+        self,
+        favorite: bool | None = None,
+        search: str | None = None,
+        limit: int = 500,
+        order_by: str = "sort_name",
+        cursor: str | None = None,
+        provider_filter: list[str] | None = None,
+        extra_query_parts: list[str] | None = None,
+        extra_query_params: dict[str, Any] | None = None,
+        extra_join_parts: list[str] | None = None,
+    ) -> LibraryItemsPage[ItemCls]:
+        """
+        Fetch a page of MediaItem records from database using keyset (cursor) pagination.
+
+        Instead of skipping all previous rows with an OFFSET, the query seeks directly past
+        the (sort value, item_id) position stored in the cursor.
+        """
+        if not (keyset_sort_key := KEYSET_SORT_KEYS.get(order_by)):
+            raise InvalidDataError(f"Cursor pagination is not supported for order_by {order_by}")
+        sort_column, sort_direction, nullable = keyset_sort_key
+        query_params = extra_query_params or {}
+        query_parts: list[str] = extra_query_parts or []
+        join_parts: list[str] = extra_join_parts or []
+        search = self._apply_search(search, query_params, join_parts)
+        self._apply_filters(
+            query_parts=query_parts,
+            query_params=query_params,
+            join_parts=join_parts,
+            favorite=favorite,
+            search=search,
+            provider_filter=provider_filter,
+        )
+        # NULL values can not be compared, so those are sorted as 0
+        sort_expr = f"{self.db_table}.{sort_column}"
+        if nullable:
+            sort_expr = f"IFNULL({sort_expr}, 0)"
+        if cursor:
+            query_params["cursor_value"], query_params["cursor_item_id"] = self._decode_cursor(
+                cursor, order_by
+            )
+            operator = ">" if sort_direction == "ASC" else "<"
+            query_parts.append(
+                f"({sort_expr}, {self.db_table}.item_id) {operator} "
+                "(:cursor_value, :cursor_item_id)"
+            )
+        sql_query = self._build_final_query(query_parts, join_parts, None)
+        sql_query += (
+            f" ORDER BY {sort_expr} {sort_direction}, {self.db_table}.item_id {sort_direction}"
+        )
+        db_rows = await self.mass.music.database.get_rows_from_query(
+            sql_query, query_params, limit=limit
+        )
+        next_cursor: str | None = None
+        if limit and len(db_rows) == limit:
+            last_row = db_rows[-1]
+            sort_value = last_row[sort_column]
+            if sort_value is None and nullable:
+                sort_value = 0
+            next_cursor = self._encode_cursor(order_by, sort_value, last_row["item_id"])
+        return LibraryItemsPage(
+            items=[
+                cast("ItemCls", self.item_cls.from_dict(self._parse_db_row(db_row)))
+                for db_row in db_rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    @final
+    @staticmethod
+    def _encode_cursor(order_by: str, sort_value: Any, item_id: int) -> str:
+        """Encode the position of an item in the (sorted) library into an opaque cursor."""
+        raw_cursor = json_dumps([order_by, sort_value, item_id]).encode()
+        return base64.urlsafe_b64encode(raw_cursor).decode()
+
+    @final
+    @staticmethod
+    def _decode_cursor(cursor: str, order_by: str) -> tuple[Any, int]:
+        """Decode an opaque cursor into the (sort value, item_id) position."""
+        try:
+            cursor_order_by, sort_value, item_id = json_loads(base64.urlsafe_b64decode(cursor))
+        except (*JSON_DECODE_EXCEPTIONS, ValueError, TypeError) as err:
+            raise InvalidDataError("Invalid cursor") from err
+        if cursor_order_by != order_by:
+            raise InvalidDataError("Cursor does not match the requested order_by")
+        return (sort_value, int(item_id))
+
+    @final
+    def _apply_search(
+        self, search: str | None, query_params: dict[str, Any], join_parts: list[str]
+    ) -> str | None:
+        """Apply the full-text search index if possible, return the remaining LIKE search."""
+        if search and self._use_fts_search(search) and (fts_query := fts_match_query(search)):
+            # use the (ranked) full-text search index instead of a LIKE table scan
+            self._apply_fts_filter(join_parts, query_params, fts_query)
+            return None
+        return self._preprocess_search(search, query_params)
+
     @final
     def _preprocess_search(self, search: str | None, query_params: dict[str, Any]) -> str | None:
         """Preprocess search string and add to query params."""
@@ -826,6 +1030,23 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
             query_params["search"] = f"%{search}%"
         return search
 
+    @final
+    def _use_fts_search(self, search: str) -> bool:
+        """Return if the full-text search index should be used for the given search string."""
+        return self.mass.music.fts_enabled and len(search.strip()) >= FTS_MIN_SEARCH_LENGTH
+
+    @final
+    def _apply_fts_filter(
+        self, join_parts: list[str], query_params: dict[str, Any], fts_query: str
+    ) -> None:
+        """Join the (ranked) matches from the full-text search index."""
+        query_params["fts_query"] = fts_query
+        join_parts.append(
+            "JOIN (SELECT rowid AS fts_item_id, rank AS fts_rank "
+            f"FROM {self.db_table}_fts WHERE {self.db_table}_fts MATCH :fts_query) AS fts_match "
+            f"ON fts_match.fts_item_id = {self.db_table}.item_id"
+        )
+
     @final
     @staticmethod
     def _clean_query_parts(query_parts: list[str]) -> list[str]:
@@ -954,6 +1175,10 @@ class MediaControllerBase[ItemCls: "MediaItemType"](metaclass=ABCMeta):
                 continue
             db_row_dict[key] = json_loads(raw_value)
 
+        # the joined data of a track is stored (pre-serialized) in the track_view table
+        if raw_track_view := db_row_dict.pop("track_view", None):
+            db_row_dict.update(json_loads(raw_track_view))
+
         # copy track_album --> album
         if track_album := db_row_dict.get("track_album"):
             db_row_dict["album"] = track_album
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import urllib.parse
 from collections.abc import Iterable
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
 from music_assistant_models.enums import MediaType, ProviderFeature
 from music_assistant_models.errors import (
@@ -25,6 +25,7 @@ from music_assistant.constants import (
     DB_TABLE_ALBUM_TRACKS,
     DB_TABLE_ALBUMS,
     DB_TABLE_TRACK_ARTISTS,
+    DB_TABLE_TRACK_VIEW,
     DB_TABLE_TRACKS,
 )
 from music_assistant.helpers.compare import (
@@ -43,21 +44,15 @@ from .base import MediaControllerBase
 if TYPE_CHECKING:
     from music_assistant import MusicAssistant
 
-
-class TracksController(MediaControllerBase[Track]):
-    """Controller managing MediaItems of type Track."""
-
-    db_table = DB_TABLE_TRACKS
-    media_type = MediaType.TRACK
-    item_cls = Track
-
-    def __init__(self, mass: MusicAssistant) -> None:
-        """Initialize class."""
-        super().__init__(mass)
-        self.base_query = """
-        SELECT
-            tracks.*,
-            (SELECT JSON_GROUP_ARRAY(
+# query which builds the (denormalized) rows of the track_view table:
+# the provider mappings, artists and album of a track, pre-serialized as one json document
+# a track has a row for each album it is on (album_id 0 if it is not on any album)
+TRACK_VIEW_QUERY: Final[str] = f"""
+    SELECT
+        tracks.item_id AS track_id,
+        IFNULL(album_tracks.album_id, 0) AS album_id,
+        json_object(
+            'provider_mappings', json((SELECT JSON_GROUP_ARRAY(
                 json_object(
                 'item_id', track_pm.provider_item_id,
                     'provider_domain', track_pm.provider_domain,
@@ -68,17 +63,16 @@ class TracksController(MediaControllerBase[Track]):
                         'details', track_pm.details,
                         'in_library', track_pm.in_library,
                         'is_unique', track_pm.is_unique
-                )) FROM provider_mappings track_pm WHERE track_pm.item_id = tracks.item_id AND track_pm.media_type = 'track') AS provider_mappings,
-
-            (SELECT JSON_GROUP_ARRAY(
+                )) FROM provider_mappings track_pm WHERE track_pm.item_id = tracks.item_id AND track_pm.media_type = 'track')),
+            'artists', json((SELECT JSON_GROUP_ARRAY(
                 json_object(
                 'item_id', artists.item_id,
                 'provider', 'library',
                     'name', artists.name,
                     'sort_name', artists.sort_name,
                     'media_type', 'artist'
-                )) FROM artists JOIN track_artists on track_artists.track_id = tracks.item_id  WHERE artists.item_id = track_artists.artist_id) AS artists,
-            (SELECT
+                )) FROM artists JOIN track_artists on track_artists.track_id = tracks.item_id  WHERE artists.item_id = track_artists.artist_id)),
+            'track_album', json((SELECT
                 json_object(
                 'item_id', albums.item_id,
                 'provider', 'library',
@@ -88,10 +82,36 @@ class TracksController(MediaControllerBase[Track]):
                     'disc_number', album_tracks.disc_number,
                     'track_number', album_tracks.track_number,
                     'images', json_extract(albums.metadata, '$.images')
-                ) FROM albums WHERE albums.item_id = album_tracks.album_id) AS track_album
+                ) FROM albums WHERE albums.item_id = album_tracks.album_id))
+        ) AS data
+    FROM {DB_TABLE_TRACKS}
+    LEFT JOIN {DB_TABLE_ALBUM_TRACKS} on album_tracks.track_id = tracks.item_id
+    """  # noqa: E501
+
+
+class TracksController(MediaControllerBase[Track]):
+    """Controller managing MediaItems of type Track."""
+
+    db_table = DB_TABLE_TRACKS
+    media_type = MediaType.TRACK
+    item_cls = Track
+
+    def __init__(self, mass: MusicAssistant) -> None:
+        """Initialize class."""
+        super().__init__(mass)
+        # the joined data (provider mappings, artists and album) of each track is
+        # denormalized into the track_view table, which is kept up to date by triggers
+        # (looked up by primary key, so only for the rows that end up in the result)
+        self.base_query = f"""
+        SELECT
+            tracks.*,
+            (SELECT {DB_TABLE_TRACK_VIEW}.data FROM {DB_TABLE_TRACK_VIEW}
+                WHERE {DB_TABLE_TRACK_VIEW}.track_id = tracks.item_id
+                AND {DB_TABLE_TRACK_VIEW}.album_id = IFNULL(album_tracks.album_id, 0)
+            ) AS track_view
             FROM tracks
             LEFT JOIN album_tracks on album_tracks.track_id = tracks.item_id
-            """  # noqa: E501
+            """
         # register (extra) api handlers
         api_base = self.api_base
         self.mass.register_api_command(f"music/{api_base}/track_versions", self.versions)
@@ -180,8 +200,9 @@ class TracksController(MediaControllerBase[Track]):
         extra_query_params: dict[str, Any] = {}
         extra_query_parts: list[str] = []
         extra_join_parts: list[str] = []
-        if search and " - " in search:
+        if search and " - " in search and not self._use_fts_search(search):
             # handle combined artist + title search
+            # (the full-text search index already matches on artist names)
             artist_str, title_str = search.split(" - ", 1)
             search = None
             title_str = create_safe_string(title_str, True, True)
@@ -206,8 +227,9 @@ class TracksController(MediaControllerBase[Track]):
             extra_query_params=extra_query_params,
             extra_join_parts=extra_join_parts,
         )
-        if search and len(result) < 25 and not offset:
+        if search and len(result) < 25 and not offset and not self._use_fts_search(search):
             # append artist items to result
+            # (not needed for the full-text search index, which also matches artist names)
             artist_search_str = create_safe_string(search, True, True)
             extra_join_parts.append(
                 "JOIN track_artists ON track_artists.track_id = tracks.item_id "
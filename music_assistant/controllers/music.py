@@ -13,6 +13,7 @@ from copy import deepcopy
 from datetime import datetime
 from itertools import zip_longest
 from math import inf
+from sqlite3 import OperationalError
 from typing import TYPE_CHECKING, Any, Final, cast
 
 import numpy as np
@@ -59,6 +60,7 @@ from music_assistant.constants import (
     DB_TABLE_SETTINGS,
     DB_TABLE_SMART_FADES_ANALYSIS,
     DB_TABLE_TRACK_ARTISTS,
+    DB_TABLE_TRACK_VIEW,
     DB_TABLE_TRACKS,
     PROVIDERS_WITH_SHAREABLE_URLS,
 )
@@ -83,7 +85,7 @@ from .media.genres import GenreController
 from .media.playlists import PlaylistController
 from .media.podcasts import PodcastsController
 from .media.radio import RadioController
-from .media.tracks import TracksController
+from .media.tracks import TRACK_VIEW_QUERY, TracksController
 
 if TYPE_CHECKING:
     from music_assistant_models.auth import User
@@ -98,12 +100,78 @@ DEFAULT_SYNC_INTERVAL = 12 * 60  # default sync interval in minutes
 CONF_SYNC_INTERVAL = "sync_interval"
 CONF_DELETED_PROVIDERS = "deleted_providers"
 DB_SCHEMA_VERSION: Final[int] = 26
+# number of read-only connections so browsing the library does not wait for (sync) writes
+DB_READ_POOL_SIZE: Final[int] = 3
 
 CACHE_CATEGORY_LAST_SYNC: Final[int] = 9
 CACHE_CATEGORY_SEARCH_RESULTS: Final[int] = 10
 LAST_PROVIDER_INSTANCE_SCAN: Final[str] = "last_provider_instance_scan"
 PROVIDER_INSTANCE_SCAN_INTERVAL: Final[int] = 30 * 24 * 60 * 60  # one month in seconds
 
+# media tables that get a (shadow) FTS5 full-text search index
+FTS_TABLES: Final[tuple[str, ...]] = (
+    DB_TABLE_ARTISTS,
+    DB_TABLE_ALBUMS,
+    DB_TABLE_TRACKS,
+    DB_TABLE_PLAYLISTS,
+    DB_TABLE_RADIOS,
+    DB_TABLE_AUDIOBOOKS,
+    DB_TABLE_PODCASTS,
+)
+# columns of the FTS index that are filled from a linked table:
+# (link table, link column, fts table, fts column, source table, source column)
+FTS_LINKED_COLUMNS: Final[tuple[tuple[str, str, str, str, str, str], ...]] = (
+    (DB_TABLE_TRACK_ARTISTS, "track_id", DB_TABLE_TRACKS, "artists", DB_TABLE_ARTISTS, "artist_id"),
+    (DB_TABLE_ALBUM_TRACKS, "track_id", DB_TABLE_TRACKS, "album", DB_TABLE_ALBUMS, "album_id"),
+    (DB_TABLE_ALBUM_ARTISTS, "album_id", DB_TABLE_ALBUMS, "artists", DB_TABLE_ARTISTS, "artist_id"),
+)
+# bm25 weights of the fts columns (name, sort_name, artists, album) used for ranking
+FTS_RANK_FUNCTION: Final[str] = "bm25(10.0, 5.0, 2.0, 1.0)"
+# triggers which keep the (denormalized) track_view table up to date:
+# (table, trigger event, condition, ids of the tracks of which the rows need a refresh)
+TRACK_VIEW_TRIGGERS: Final[tuple[tuple[str, str, str | None, str], ...]] = (
+    (DB_TABLE_TRACKS, "INSERT", None, "new.item_id"),
+    (DB_TABLE_TRACKS, "DELETE", None, "old.item_id"),
+    (DB_TABLE_PROVIDER_MAPPINGS, "INSERT", "new.media_type = 'track'", "new.item_id"),
+    (
+        DB_TABLE_PROVIDER_MAPPINGS,
+        "UPDATE",
+        "new.media_type = 'track' OR old.media_type = 'track'",
+        "old.item_id, new.item_id",
+    ),
+    (DB_TABLE_PROVIDER_MAPPINGS, "DELETE", "old.media_type = 'track'", "old.item_id"),
+    (DB_TABLE_TRACK_ARTISTS, "INSERT", None, "new.track_id"),
+    (DB_TABLE_TRACK_ARTISTS, "DELETE", None, "old.track_id"),
+    (DB_TABLE_ALBUM_TRACKS, "INSERT", None, "new.track_id"),
+    (DB_TABLE_ALBUM_TRACKS, "UPDATE", None, "old.track_id, new.track_id"),
+    (DB_TABLE_ALBUM_TRACKS, "DELETE", None, "old.track_id"),
+    (
+        DB_TABLE_ARTISTS,
+        "UPDATE",
+        "new.name IS NOT old.name OR new.sort_name IS NOT old.sort_name",
+        f"SELECT track_id FROM {DB_TABLE_TRACK_ARTISTS} WHERE artist_id = new.item_id",
+    ),
+    (
+        DB_TABLE_ARTISTS,
+        "DELETE",
+        None,
+        f"SELECT track_id FROM {DB_TABLE_TRACK_ARTISTS} WHERE artist_id = old.item_id",
+    ),
+    (
+        DB_TABLE_ALBUMS,
+        "UPDATE",
+        "new.name IS NOT old.name OR new.sort_name IS NOT old.sort_name "
+        "OR new.metadata IS NOT old.metadata",
+        f"SELECT track_id FROM {DB_TABLE_ALBUM_TRACKS} WHERE album_id = new.item_id",
+    ),
+    (
+        DB_TABLE_ALBUMS,
+        "DELETE",
+        None,
+        f"SELECT track_id FROM {DB_TABLE_ALBUM_TRACKS} WHERE album_id = old.item_id",
+    ),
+)
+
 
 class MusicController(CoreController):
     """Several helpers around the musicproviders."""
@@ -126,6 +194,10 @@ class MusicController(CoreController):
         self.in_progress_syncs: list[SyncTask] = []
         self._database: DatabaseConnection | None = None
         self._sync_lock = asyncio.Lock()
+        # full-text search index is only used if sqlite was built with FTS5 support
+        self.fts_enabled = False
+        self._fts_rebuild_tables: set[str] = set()
+        self._track_view_rebuild = False
         self.manifest.name = "Music controller"
         self.manifest.description = (
             "Music Assistant's core controller which manages all music from all providers."
@@ -1965,7 +2037,7 @@ class MusicController(CoreController):
     async def _setup_database(self) -> None:
         """Initialize database."""
         db_path = os.path.join(self.mass.storage_path, "library.db")
-        self._database = DatabaseConnection(db_path)
+        self._database = DatabaseConnection(db_path, read_pool_size=DB_READ_POOL_SIZE)
         await self._database.setup()
 
         # always create db tables if they don't exist to prevent errors trying to access them later
@@ -2000,7 +2072,7 @@ class MusicController(CoreController):
 
                 await self._database.close()
                 await asyncio.to_thread(os.remove, db_path)
-                self._database = DatabaseConnection(db_path)
+                self._database = DatabaseConnection(db_path, read_pool_size=DB_READ_POOL_SIZE)
                 await self._database.setup()
                 await self.mass.cache.clear()
                 await self.__create_database_tables()
@@ -2013,6 +2085,14 @@ class MusicController(CoreController):
         # create indexes and triggers if needed
         await self.__create_database_indexes()
         await self.__create_database_triggers()
+        # populate the full-text search index for newly created fts tables
+        for db_table in self._fts_rebuild_tables:
+            await self.__rebuild_database_fts_index(db_table)
+        self._fts_rebuild_tables.clear()
+        # populate the denormalized track listing table if it was newly created
+        if self._track_view_rebuild:
+            await self.__rebuild_database_track_view()
+            self._track_view_rebuild = False
         # compact db
         self.logger.debug("Compacting database...")
         try:
@@ -2450,8 +2530,105 @@ class MusicController(CoreController):
                     UNIQUE(item_id,provider,fragment));"""
         )
 
+        # the (pre-serialized) joined data of the tracks, used to list tracks without
+        # the need for (correlated) subqueries, there is a row per track/album combination
+        if not await self.database.get_row(
+            "sqlite_master", {"type": "table", "name": DB_TABLE_TRACK_VIEW}
+        ):
+            await self.database.execute(
+                f"""CREATE TABLE IF NOT EXISTS {DB_TABLE_TRACK_VIEW}(
+                [track_id] INTEGER NOT NULL,
+                [album_id] INTEGER NOT NULL,
+                [data] json NOT NULL,
+                PRIMARY KEY(track_id, album_id)
+                ) WITHOUT ROWID;"""
+            )
+            self._track_view_rebuild = True
+
+        await self.__create_database_fts_tables()
         await self.database.commit()
 
+    async def __create_database_fts_tables(self) -> None:
+        """Create the (shadow) FTS5 full-text search tables for the media tables."""
+        existing_tables = {
+            row["name"]
+            for row in await self.database.get_rows_from_query(
+                "SELECT name FROM sqlite_master WHERE type = 'table'", limit=0
+            )
+        }
+        for db_table in FTS_TABLES:
+            if f"{db_table}_fts" in existing_tables:
+                continue
+            try:
+                # the (raw) names are stored and tokenized case and diacritics insensitive
+                # rowid of the fts table is the item_id of the media item
+                await self.database.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {db_table}_fts USING fts5("
+                    "name, sort_name, artists, album, "
+                    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');"
+                )
+                # persist the ranking function so the rank column can be used in (sub)queries
+                await self.database.execute(
+                    f"INSERT INTO {db_table}_fts({db_table}_fts, rank) "
+                    f"VALUES ('rank', '{FTS_RANK_FUNCTION}');"
+                )
+            except OperationalError as err:
+                self.logger.warning(
+                    "Full-text search is not available, falling back to (slow) LIKE search: %s",
+                    str(err),
+                )
+                self.fts_enabled = False
+                return
+            self._fts_rebuild_tables.add(db_table)
+        self.fts_enabled = True
+
+    async def __rebuild_database_fts_index(self, db_table: str) -> None:
+        """(Re)populate the full-text search index for a media table."""
+        self.logger.debug("Building full-text search index for %s...", db_table)
+        linked_columns = {
+            fts_column: self.__get_fts_linked_column_query(
+                link_table, link_column, source_table, source_column, f"{db_table}.item_id"
+            )
+            for (
+                link_table,
+                link_column,
+                fts_table,
+                fts_column,
+                source_table,
+                source_column,
+            ) in FTS_LINKED_COLUMNS
+            if fts_table == db_table
+        }
+        artists_query = linked_columns.get("artists", "SELECT NULL")
+        album_query = linked_columns.get("album", "SELECT NULL")
+        await self.database.execute(f"DELETE FROM {db_table}_fts;")
+        await self.database.execute(
+            f"INSERT INTO {db_table}_fts(rowid, name, sort_name, artists, album) "
+            f"SELECT {db_table}.item_id, {db_table}.name, {db_table}.sort_name, "
+            f"({artists_query}), ({album_query}) FROM {db_table};"
+        )
+        await self.database.commit()
+
+    async def __rebuild_database_track_view(self) -> None:
+        """(Re)populate the denormalized track listing table."""
+        self.logger.debug("Building %s table...", DB_TABLE_TRACK_VIEW)
+        await self.database.execute(f"DELETE FROM {DB_TABLE_TRACK_VIEW};")
+        await self.database.execute(
+            f"INSERT INTO {DB_TABLE_TRACK_VIEW}(track_id, album_id, data) {TRACK_VIEW_QUERY};"
+        )
+        await self.database.commit()
+
+    @staticmethod
+    def __get_fts_linked_column_query(
+        link_table: str, link_column: str, source_table: str, source_column: str, item_id: str
+    ) -> str:
+        """Return the subquery which collects the names for a linked fts column."""
+        return (
+            f"SELECT group_concat({source_table}.name, ' ') FROM {link_table} "
+            f"JOIN {source_table} ON {source_table}.item_id = {link_table}.{source_column} "
+            f"WHERE {link_table}.{link_column} = {item_id}"
+        )
+
     async def __create_database_indexes(self) -> None:
         """Create database indexes."""
         for db_table in (
@@ -2589,8 +2766,98 @@ class MusicController(CoreController):
                 END;
                 """
             )
+        # triggers to keep the denormalized track listing table up to date
+        for db_table, trigger_event, condition, track_ids in TRACK_VIEW_TRIGGERS:
+            trigger_name = f"{db_table}_{DB_TABLE_TRACK_VIEW}_{trigger_event.lower()}"
+            when_clause = f"WHEN {condition}" if condition else ""
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {trigger_name}
+                AFTER {trigger_event} ON {db_table} {when_clause}
+                BEGIN
+                    DELETE FROM {DB_TABLE_TRACK_VIEW} WHERE track_id IN ({track_ids});
+                    INSERT INTO {DB_TABLE_TRACK_VIEW}(track_id, album_id, data)
+                    {TRACK_VIEW_QUERY} WHERE tracks.item_id IN ({track_ids});
+                END;
+                """
+            )
+        if self.fts_enabled:
+            await self.__create_database_fts_triggers()
         await self.database.commit()
 
+    async def __create_database_fts_triggers(self) -> None:
+        """Create the triggers which keep the full-text search index in sync."""
+        for db_table in FTS_TABLES:
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_insert
+                AFTER INSERT ON {db_table}
+                BEGIN
+                    INSERT INTO {db_table}_fts(rowid, name, sort_name)
+                    VALUES (new.item_id, new.name, new.sort_name);
+                END;
+                """
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_update
+                AFTER UPDATE OF name, sort_name ON {db_table}
+                BEGIN
+                    UPDATE {db_table}_fts SET name = new.name, sort_name = new.sort_name
+                    WHERE rowid = new.item_id;
+                END;
+                """
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_delete
+                AFTER DELETE ON {db_table}
+                BEGIN
+                    DELETE FROM {db_table}_fts WHERE rowid = old.item_id;
+                END;
+                """
+            )
+        # triggers to keep the linked (artist/album name) columns in sync
+        for (
+            link_table,
+            link_column,
+            fts_table,
+            fts_column,
+            source_table,
+            source_column,
+        ) in FTS_LINKED_COLUMNS:
+            for trigger_event, row_ref in (("INSERT", "new"), ("DELETE", "old")):
+                linked_query = self.__get_fts_linked_column_query(
+                    link_table, link_column, source_table, source_column, f"{row_ref}.{link_column}"
+                )
+                await self.database.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {link_table}_fts_{trigger_event.lower()}
+                    AFTER {trigger_event} ON {link_table}
+                    BEGIN
+                        UPDATE {fts_table}_fts SET {fts_column} = ({linked_query})
+                        WHERE rowid = {row_ref}.{link_column};
+                    END;
+                    """
+                )
+            # a rename of the linked item must be reflected in all items linked to it
+            linked_query = self.__get_fts_linked_column_query(
+                link_table, link_column, source_table, source_column, f"{fts_table}_fts.rowid"
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {link_table}_fts_{source_table}_rename
+                AFTER UPDATE OF name ON {source_table}
+                BEGIN
+                    UPDATE {fts_table}_fts SET {fts_column} = ({linked_query})
+                    WHERE rowid IN (
+                        SELECT {link_column} FROM {link_table}
+                        WHERE {source_column} = new.item_id
+                    );
+                END;
+                """
+            )
+
     async def correct_multi_instance_provider_mappings(self) -> None:
         """Correct provider mappings for multi-instance providers."""
         self.logger.debug("Correcting provider mappings for multi-instance providers...")
@@ -71,13 +71,19 @@ from music_assistant.constants import (
 from music_assistant.controllers.webserver.helpers.auth_middleware import get_current_user
 from music_assistant.helpers.api import api_command
 from music_assistant.helpers.audio import get_stream_details, get_stream_dsp_details
+from music_assistant.helpers.queue_items import (
+    QueueItems,
+    QueueItemsChange,
+    QueueItemsHistory,
+    QueueItemsStore,
+)
 from music_assistant.helpers.throttle_retry import BYPASS_THROTTLER
 from music_assistant.helpers.util import get_changed_keys, percentage
 from music_assistant.models.core_controller import CoreController
 from music_assistant.models.player import Player, PlayerMedia
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncGenerator, Iterator
 
     from music_assistant_models.auth import User
     from music_assistant_models.media_items.metadata import MediaItemImage
@@ -105,6 +111,14 @@ CONF_DEFAULT_ENQUEUE_OPTION_UNKNOWN = "default_enqueue_option_unknown"
 RADIO_TRACK_MAX_DURATION_SECS = 20 * 60  # 20 minutes
 CACHE_CATEGORY_PLAYER_QUEUE_STATE = 0
 CACHE_CATEGORY_PLAYER_QUEUE_ITEMS = 1
+# the max number of items in a single change returned by player_queues/items_diff
+ITEMS_DIFF_CHUNK_SIZE = 100
+# playlists are enqueued progressively: playback starts with the first track(s),
+# the remaining tracks are added in batches of this size in the background
+PROGRESSIVE_ENQUEUE_BATCH_SIZE = 100
+# number of tracks to fetch before starting playback of a (progressively enqueued)
+# playlist with shuffle enabled, so the first track is picked at random from these
+PROGRESSIVE_ENQUEUE_SHUFFLE_SIZE = 50
 
 
 class CompareState(TypedDict):
@@ -136,7 +150,9 @@ class PlayerQueuesController(CoreController):
         """Initialize core controller."""
         super().__init__(mass)
         self._queues: dict[str, PlayerQueue] = {}
-        self._queue_items: dict[str, list[QueueItem]] = {}
+        self._queue_items: dict[str, QueueItems] = {}
+        self._items_store = QueueItemsStore(mass)
+        self._items_history: dict[str, QueueItemsHistory] = {}
         self._prev_states: dict[str, CompareState] = {}
         self._transitioning_players: set[str] = set()
         self.manifest.name = "Player Queues controller"
@@ -151,6 +167,8 @@ class PlayerQueuesController(CoreController):
         for queue in self.all():
             if queue.state in (PlaybackState.PLAYING, PlaybackState.PAUSED):
                 await self.stop(queue.queue_id)
+        # write the pending changes to the queue items
+        await self._items_store.flush()
 
     async def get_config_entries(
         self,
@@ -296,6 +314,40 @@ class PlayerQueuesController(CoreController):
 
         return self._queue_items[queue_id][offset : offset + limit]
 
+    @api_command("player_queues/items_diff")
+    def items_diff(
+        self, queue_id: str, since_version: int, limit: int = 50, offset: int = 0
+    ) -> dict[str, Any]:
+        """
+        Return the changes to the QueueItems of a PlayerQueue since the given version.
+
+        The (current) version and the changes of every update are sent in the
+        QUEUE_ITEMS_UPDATED event. The changes are returned in the order they need to
+        be applied, paged by limit/offset; large inserts are split into multiple changes.
+        If the changes since the given version are no longer available, full_refresh is
+        set and the items should be (re)fetched with player_queues/items.
+        """
+        history = self._items_history[queue_id]
+        version = history.version
+        if (changes := history.get_changes(since_version)) is None:
+            return {"version": version, "full_refresh": True, "total": 0, "changes": []}
+        paged_changes: list[QueueItemsChange] = []
+        for change in changes:
+            if not change.items or len(change.items) <= ITEMS_DIFF_CHUNK_SIZE:
+                paged_changes.append(change)
+                continue
+            for start in range(0, len(change.items), ITEMS_DIFF_CHUNK_SIZE):
+                chunk = change.items[start : start + ITEMS_DIFF_CHUNK_SIZE]
+                paged_changes.append(
+                    QueueItemsChange(change.op, change.index + start, len(chunk), items=chunk)
+                )
+        return {
+            "version": version,
+            "full_refresh": False,
+            "total": len(paged_changes),
+            "changes": [x.to_dict() for x in paged_changes[offset : offset + limit]],
+        }
+
     @api_command("player_queues/get_active_queue")
     def get_active_queue(self, player_id: str) -> PlayerQueue | None:
         """Return the current active/synced queue for a player."""
@@ -432,6 +484,8 @@ class PlayerQueuesController(CoreController):
 
         media_items: list[MediaItemType] = []
         radio_source: list[MediaItemType] = []
+        # the remaining tracks of a progressively enqueued playlist
+        remaining_tracks: AsyncGenerator[Track, None] | None = None
         # resolve all media items
         for item in media_list:
             try:
@@ -488,9 +542,17 @@ class PlayerQueuesController(CoreController):
                         start_item_uri = start_item
                     elif start_item is not None:
                         start_item_uri = start_item.uri
-                    media_items += await self._resolve_media_items(
-                        media_item, start_item_uri, queue_id=queue_id
-                    )
+                    if len(media_list) == 1 and isinstance(media_item, Playlist):
+                        # start playback of a (possibly large) playlist as soon as its first
+                        # track(s) are fetched, the remaining tracks are added in the background
+                        remaining_tracks = self._iter_playlist_tracks(media_item, start_item_uri)
+                        media_items += await self._get_first_playlist_tracks(
+                            media_item, remaining_tracks, queue_id, queue.shuffle_enabled
+                        )
+                    else:
+                        media_items += await self._resolve_media_items(
+                            media_item, start_item_uri, queue_id=queue_id
+                        )
 
             except MusicAssistantError as err:
                 # invalid MA uri or item not found error
@@ -518,6 +580,8 @@ class PlayerQueuesController(CoreController):
             )
 
         if not queue_items:
+            if remaining_tracks:
+                await remaining_tracks.aclose()
             raise MediaNotFoundError("No playable items found")
 
         # load the items into the queue
@@ -539,17 +603,15 @@ class PlayerQueuesController(CoreController):
                 shuffle=shuffle,
             )
             await self.play_index(queue_id, 0)
-            return
         # handle next: add item(s) in the index next to the playing/loaded/buffered index
-        if option == QueueOption.NEXT:
+        elif option == QueueOption.NEXT:
             await self.load(
                 queue_id,
                 queue_items=queue_items,
                 insert_at_index=insert_at_index,
                 shuffle=shuffle,
             )
-            return
-        if option == QueueOption.REPLACE_NEXT:
+        elif option == QueueOption.REPLACE_NEXT:
             await self.load(
                 queue_id,
                 queue_items=queue_items,
@@ -557,9 +619,8 @@ class PlayerQueuesController(CoreController):
                 keep_remaining=False,
                 shuffle=shuffle,
             )
-            return
         # handle play: replace current loaded/playing index with new item(s)
-        if option == QueueOption.PLAY:
+        elif option == QueueOption.PLAY:
             await self.load(
                 queue_id,
                 queue_items=queue_items,
@@ -568,9 +629,8 @@ class PlayerQueuesController(CoreController):
             )
             next_index = min(insert_at_index, len(self._queue_items[queue_id]) - 1)
             await self.play_index(queue_id, next_index)
-            return
         # handle add: add/append item(s) to the remaining queue items
-        if option == QueueOption.ADD:
+        elif option == QueueOption.ADD:
             await self.load(
                 queue_id=queue_id,
                 queue_items=queue_items,
@@ -587,6 +647,13 @@ class PlayerQueuesController(CoreController):
                 queue.items = len(queue_items)
                 self.signal_update(queue_id)
 
+        if remaining_tracks:
+            # add the remaining tracks of the playlist after the (last of the) first track(s)
+            anchor = max(queue_items, key=lambda x: x.sort_index)
+            self.mass.create_task(
+                self._enqueue_remaining_tracks(queue_id, remaining_tracks, anchor.queue_item_id)
+            )
+
     @api_command("player_queues/move_item")
     def move_item(self, queue_id: str, queue_item_id: str, pos_shift: int = 1) -> None:
         """
@@ -606,8 +673,7 @@ class PlayerQueuesController(CoreController):
             msg = f"{item_index} is already played/buffered"
             raise IndexError(msg)
 
-        queue_items = self._queue_items[queue_id]
-        queue_items = queue_items.copy()
+        queue_items = self._queue_items[queue_id].copy()
 
         if pos_shift == 0 and queue.state == PlaybackState.PLAYING:
             new_index = (queue.current_index or 0) + 1
@@ -944,6 +1010,7 @@ class PlayerQueuesController(CoreController):
                             queue_item.uri,
                         )
                         queue_item.available = False
+                        self._persist_changed_items(queue_id, [queue_item])
                     next_index = self._get_next_index(queue_id, index, allow_repeat=False)
                     if next_index is None:
                         raise MediaNotFoundError("No next item available")
@@ -1033,9 +1100,9 @@ class PlayerQueuesController(CoreController):
             target_queue.current_item.queue_id = target_queue_id
         self.clear(source_queue_id)
 
-        await self.load(target_queue_id, source_items, keep_remaining=False, keep_played=False)
         for item in source_items:
             item.queue_id = target_queue_id
+        await self.load(target_queue_id, source_items, keep_remaining=False, keep_played=False)
         self.update_items(target_queue_id, source_items)
         if auto_play:
             await self.resume(target_queue_id)
@@ -1047,6 +1114,7 @@ class PlayerQueuesController(CoreController):
         queue_id = player.player_id
         queue: PlayerQueue | None = None
         queue_items: list[QueueItem] = []
+        migrate_items = False
         # try to restore previous state
         if prev_state := await self.mass.cache.get(
             key=queue_id,
@@ -1055,12 +1123,15 @@ class PlayerQueuesController(CoreController):
         ):
             try:
                 queue = PlayerQueue.from_dict(prev_state)
-                prev_items = await self.mass.cache.get(
-                    key=queue_id,
-                    provider=self.domain,
-                    category=CACHE_CATEGORY_PLAYER_QUEUE_ITEMS,
-                    default=[],
-                )
+                prev_items = await self._items_store.load(queue_id)
+                if migrate_items := prev_items is None:
+                    # items stored (as a whole) in the cache by a previous version
+                    prev_items = await self.mass.cache.get(
+                        key=queue_id,
+                        provider=self.domain,
+                        category=CACHE_CATEGORY_PLAYER_QUEUE_ITEMS,
+                        default=[],
+                    )
                 queue_items = []
                 for idx, item_data in enumerate(prev_items):
                     qi = QueueItem.from_cache(item_data)
@@ -1109,7 +1180,18 @@ class PlayerQueuesController(CoreController):
             )
 
         self._queues[queue_id] = queue
-        self._queue_items[queue_id] = queue_items
+        self._queue_items[queue_id] = QueueItems(queue_items)
+        self._items_history[queue_id] = QueueItemsHistory()
+        if migrate_items:
+            # move the items from the cache to the (incremental) queue items store
+            self._items_store.reset(queue_id, queue_items)
+            self.mass.create_task(
+                self.mass.cache.delete(
+                    key=queue_id,
+                    provider=self.domain,
+                    category=CACHE_CATEGORY_PLAYER_QUEUE_ITEMS,
+                )
+            )
         # always call update to calculate state etc
         self.on_player_update(player, {})
         self.mass.signal_event(EventType.QUEUE_ADDED, object_id=queue_id, data=queue)
@@ -1163,8 +1245,12 @@ class PlayerQueuesController(CoreController):
                     category=CACHE_CATEGORY_PLAYER_QUEUE_ITEMS,
                 )
             )
+            self._items_store.delete(player_id)
+        else:
+            self._items_store.unload(player_id)
         self._queues.pop(player_id, None)
         self._queue_items.pop(player_id, None)
+        self._items_history.pop(player_id, None)
 
     async def load_next_queue_item(
         self,
@@ -1185,6 +1271,7 @@ class PlayerQueuesController(CoreController):
             # this is just a guard for bad data
             raise QueueEmpty("Invalid item id for queue given.")
         next_item: QueueItem | None = None
+        skipped_items: list[QueueItem] = []
         idx = 0
         while True:
             next_index = self._get_next_index(queue_id, cur_index + idx)
@@ -1207,10 +1294,11 @@ class PlayerQueuesController(CoreController):
                     "Skipping unplayable item %s (%s)", queue_item.name, queue_item.uri
                 )
                 queue_item.available = False
+                skipped_items.append(queue_item)
                 idx += 1
         if idx != 0:
             # we skipped some items, signal a queue items update
-            self.update_items(queue_id, self._queue_items[queue_id])
+            self.update_items(queue_id, self._queue_items[queue_id], skipped_items)
         if next_item is None:
             raise QueueEmpty("No more (playable) tracks left in the queue.")
 
@@ -1312,6 +1400,9 @@ class PlayerQueuesController(CoreController):
                         *org_images,
                     ]
                 )
+            if current_index is not None:
+                # persist the (enriched) media item of the queue item
+                self._persist_changed_items(queue_id, [queue_item])
         # Fetch the streamdetails, which could raise in case of an unplayable item.
         # For example, YT Music returns Radio Items that are not playable.
         queue_item.streamdetails = await get_stream_details(
@@ -1370,9 +1461,23 @@ class PlayerQueuesController(CoreController):
             next_items = await _smart_shuffle(next_items)
         self.update_items(queue_id, prev_items + next_items)
 
-    def update_items(self, queue_id: str, queue_items: list[QueueItem]) -> None:
-        """Update the existing queue items, mostly caused by reordering."""
+    def update_items(
+        self,
+        queue_id: str,
+        queue_items: list[QueueItem],
+        changed_items: list[QueueItem] | None = None,
+    ) -> None:
+        """
+        Update the existing queue items, mostly caused by reordering.
+
+        - changed_items: (existing) items of which the attributes changed
+        """
+        if not isinstance(queue_items, QueueItems):
+            queue_items = QueueItems(queue_items)
         self._queue_items[queue_id] = queue_items
+        # persist the changes (only) and add them to the history
+        changes = self._items_store.update(queue_id, queue_items, changed_items or ())
+        self._items_history[queue_id].add(changes)
         queue = self._queues[queue_id]
         queue.items = len(self._queue_items[queue_id])
         # to track if the queue items changed we set a timestamp
@@ -1392,6 +1497,17 @@ class PlayerQueuesController(CoreController):
             if next_item := self.get_next_item(queue_id, queue.index_in_buffer):
                 self._enqueue_next_item(queue_id, next_item)
 
+    def _persist_changed_items(self, queue_id: str, changed_items: list[QueueItem]) -> None:
+        """
+        Persist the (in-place) changes to existing queue items and add them to the history.
+
+        Unlike update_items, the change is not signaled: the order and number of the
+        items did not change, so the clients don't need to (re)fetch the items for it.
+        """
+        changes = self._items_store.update(queue_id, self._queue_items[queue_id], changed_items)
+        if changes:
+            self._items_history[queue_id].add(changes)
+
     # Helper methods
 
     def get_item(self, queue_id: str, item_id_or_index: int | str | None) -> QueueItem | None:
@@ -1403,25 +1519,25 @@ class PlayerQueuesController(CoreController):
         if isinstance(item_id_or_index, int) and len(queue_items) > item_id_or_index:
             return queue_items[item_id_or_index]
         if isinstance(item_id_or_index, str):
-            return next((x for x in queue_items if x.queue_item_id == item_id_or_index), None)
+            return queue_items.get_by_id(item_id_or_index)
         return None
 
     def signal_update(self, queue_id: str, items_changed: bool = False) -> None:
         """Signal state changed of given queue."""
         queue = self._queues[queue_id]
         if items_changed:
-            self.mass.signal_event(EventType.QUEUE_ITEMS_UPDATED, object_id=queue_id, data=queue)
-            # save items in cache - only cache items with valid media_item
-            cache_data = [
-                x.to_cache() for x in self._queue_items[queue_id] if x.media_item is not None
-            ]
-            self.mass.create_task(
-                self.mass.cache.set(
-                    key=queue_id,
-                    data=cache_data,
-                    provider=self.domain,
-                    category=CACHE_CATEGORY_PLAYER_QUEUE_ITEMS,
-                )
+            # send the (range based) changes along with the queue,
+            # so clients can apply them instead of refetching all items
+            history = self._items_history[queue_id]
+            changes = [x.to_dict(include_items=False) for x in history.latest_changes]
+            self.mass.signal_event(
+                EventType.QUEUE_ITEMS_UPDATED,
+                object_id=queue_id,
+                data={
+                    **queue.to_dict(),
+                    "items_version": history.version,
+                    "items_changes": changes,
+                },
             )
         # always send the base event
         self.mass.signal_event(EventType.QUEUE_UPDATED, object_id=queue_id, data=queue)
@@ -1439,11 +1555,7 @@ class PlayerQueuesController(CoreController):
 
     def index_by_id(self, queue_id: str, queue_item_id: str) -> int | None:
         """Get index by queue_item_id."""
-        queue_items = self._queue_items[queue_id]
-        for index, item in enumerate(queue_items):
-            if item.queue_item_id == queue_item_id:
-                return index
-        return None
+        return self._queue_items[queue_id].index_of(queue_item_id)
 
     async def player_media_from_queue_item(
         self, queue_item: QueueItem, flow_mode: bool
@@ -1553,24 +1665,11 @@ class PlayerQueuesController(CoreController):
 
     async def get_playlist_tracks(self, playlist: Playlist, start_item: str | None) -> list[Track]:
         """Return tracks for given playlist, based on user preference."""
-        result: list[Track] = []
-        start_item_found = False
         self.logger.info(
             "Fetching tracks to play for playlist %s",
             playlist.name,
         )
-        # TODO: Handle other sort options etc.
-        async for playlist_track in self.mass.music.playlists.tracks(
-            playlist.item_id, playlist.provider
-        ):
-            if not playlist_track.available:
-                continue
-            if start_item in (playlist_track.item_id, playlist_track.uri):
-                start_item_found = True
-            if start_item is not None and not start_item_found:
-                continue
-            result.append(playlist_track)
-        return result
+        return [x async for x in self._iter_playlist_tracks(playlist, start_item)]
 
     async def get_audiobook_resume_point(
         self, audio_book: Audiobook, chapter: str | int | None = None, userid: str | None = None
@@ -1817,6 +1916,106 @@ class PlayerQueuesController(CoreController):
             abort_existing=True,
         )
 
+    async def _iter_playlist_tracks(
+        self, playlist: Playlist, start_item: str | None
+    ) -> AsyncGenerator[Track, None]:
+        """Yield the (available) tracks to play for given playlist, from the start item on."""
+        start_item_found = False
+        # TODO: Handle other sort options etc.
+        async for playlist_track in self.mass.music.playlists.tracks(
+            playlist.item_id, playlist.provider
+        ):
+            if start_item in (playlist_track.item_id, playlist_track.uri):
+                start_item_found = True
+            if start_item is not None and not start_item_found:
+                continue
+            if not playlist_track.available:
+                continue
+            yield playlist_track
+
+    async def _get_first_playlist_tracks(
+        self,
+        playlist: Playlist,
+        tracks: AsyncGenerator[Track, None],
+        queue_id: str,
+        shuffle: bool,
+    ) -> list[Track]:
+        """Return the first track(s) to play of a (progressively enqueued) playlist."""
+        self.logger.info(
+            "Fetching tracks to play for playlist %s",
+            playlist.name,
+        )
+        self.mass.create_task(
+            self.mass.music.mark_item_played(playlist, queue_id=queue_id, user_initiated=True)
+        )
+        result: list[Track] = []
+        async for track in tracks:
+            result.append(track)
+            if len(result) >= (PROGRESSIVE_ENQUEUE_SHUFFLE_SIZE if shuffle else 1):
+                break
+        return result
+
+    async def _enqueue_remaining_tracks(
+        self, queue_id: str, tracks: AsyncGenerator[Track, None], anchor_item_id: str
+    ) -> None:
+        """
+        Add the remaining tracks of a (progressively enqueued) playlist to the queue.
+
+        The tracks are added in batches, after the previously added track (the anchor).
+        Stops when the anchor is no longer in the queue (e.g. the queue was cleared).
+        """
+        batch: list[QueueItem] = []
+        count = 0
+        try:
+            async for track in tracks:
+                batch.append(QueueItem.from_media_item(queue_id, track))
+                if len(batch) < PROGRESSIVE_ENQUEUE_BATCH_SIZE:
+                    continue
+                if not (next_anchor := self._add_remaining_tracks(queue_id, batch, anchor_item_id)):
+                    return
+                anchor_item_id = next_anchor
+                count += len(batch)
+                batch = []
+            if batch and self._add_remaining_tracks(queue_id, batch, anchor_item_id):
+                count += len(batch)
+        finally:
+            await tracks.aclose()
+        self.logger.debug("Added %s remaining playlist tracks to queue %s", count, queue_id)
+
+    def _add_remaining_tracks(
+        self, queue_id: str, queue_items: list[QueueItem], anchor_item_id: str
+    ) -> str | None:
+        """
+        Add a batch of (remaining) playlist tracks to the queue, after the anchor item.
+
+        If shuffle is enabled, each item is inserted at a random position in the upcoming
+        part of the queue instead (an 'inside-out' shuffle), which keeps the upcoming items
+        uniformly shuffled without reshuffling the items that are already in the queue.
+        Returns the new anchor item (the last added item), or None if the anchor is gone.
+        """
+        if (queue := self._queues.get(queue_id)) is None:
+            return None
+        if (anchor_index := self.index_by_id(queue_id, anchor_item_id)) is None:
+            return None
+        anchor_sort_index = self._queue_items[queue_id][anchor_index].sort_index
+        for index, item in enumerate(queue_items, 1):
+            # keep the original (playlist) order, to be able to un-shuffle
+            item.sort_index = anchor_sort_index + index
+        items = list(self._queue_items[queue_id])
+        # make room (in the sort order) for the added items after the anchor
+        changed_items = [x for x in items if x.sort_index > anchor_sort_index]
+        for item in changed_items:
+            item.sort_index += len(queue_items)
+        if queue.shuffle_enabled:
+            cur_index = max(queue.index_in_buffer or 0, queue.current_index or 0)
+            first_index = 0 if queue.current_index is None else min(cur_index + 1, len(items))
+            for item in queue_items:
+                items.insert(random.randint(first_index, len(items)), item)
+        else:
+            items[anchor_index + 1 : anchor_index + 1] = queue_items
+        self.update_items(queue_id, items, changed_items)
+        return queue_items[-1].queue_item_id
+
     async def _resolve_media_items(
         self,
         media_item: MediaItemType | ItemMapping | BrowseFolder,
@@ -59,8 +59,8 @@ from music_assistant.constants import (
     ATTR_FAKE_POWER,
     ATTR_FAKE_VOLUME,
     ATTR_GROUP_MEMBERS,
-    ATTR_LAST_POLL,
     ATTR_PREVIOUS_VOLUME,
+    ATTR_SUPPORTED_FEATURES,
     CONF_AUTO_PLAY,
     CONF_ENTRY_ANNOUNCE_VOLUME,
     CONF_ENTRY_ANNOUNCE_VOLUME_MAX,
@@ -82,6 +82,7 @@ from music_assistant.models.player import Player, PlayerMedia, PlayerState
 from music_assistant.models.player_provider import PlayerProvider
 from music_assistant.models.plugin import PluginProvider, PluginSource
 
+from .poll_scheduler import PlayerPollScheduler
 from .sync_groups import SyncGroupController, SyncGroupPlayer
 
 if TYPE_CHECKING:
@@ -215,15 +216,18 @@ class PlayerController(CoreController):
         self._player_throttlers: dict[str, Throttler] = {}
         self._player_command_locks: dict[str, asyncio.Lock] = {}
         self._sync_groups: SyncGroupController = SyncGroupController(self)
+        self._poll_scheduler = PlayerPollScheduler(self.get, self.logger)
 
     async def setup(self, config: CoreConfig) -> None:
         """Async initialize of module."""
+        self._poll_scheduler.start()
         self._poll_task = self.mass.create_task(self._poll_players())
 
     async def close(self) -> None:
         """Cleanup on exit."""
         if self._poll_task and not self._poll_task.done():
             self._poll_task.cancel()
+        await self._poll_scheduler.stop()
 
     async def on_provider_loaded(self, provider: PlayerProvider) -> None:
         """Handle logic when a provider is loaded."""
@@ -381,6 +385,11 @@ class PlayerController(CoreController):
             return player.state
         return None
 
+    @api_command("players/poll_stats", required_role="admin")
+    def get_poll_stats(self) -> dict[str, Any]:
+        """Return the (latency) statistics of the polling of players, per provider."""
+        return self._poll_scheduler.stats()
+
     @api_command("players/player_controls")
     def player_controls(
         self,
@@ -1348,6 +1357,8 @@ class PlayerController(CoreController):
 
         # finally actually register it
         self._players[player_id] = player
+        # the config entries (and thus the resolved config) may differ for the new player object
+        self.mass.config.invalidate_config_snapshots(player_id)
 
         # ensure we fetch and set the latest/full config for the player
         player_config = await self.mass.config.get_player_config(player_id)
@@ -1377,6 +1388,7 @@ class PlayerController(CoreController):
 
         if player.player_id in self._players:
             self._players[player.player_id] = player
+            self.mass.config.invalidate_config_snapshots(player.player_id)
             player.update_state()
             return
 
@@ -1412,6 +1424,8 @@ class PlayerController(CoreController):
             return
         await self._cleanup_player_memberships(player_id)
         del self._players[player_id]
+        self._poll_scheduler.remove(player_id)
+        self.mass.config.invalidate_config_snapshots(player_id)
         self.mass.player_queues.on_player_remove(player_id, permanent=permanent)
         await player.on_unload()
         if permanent:
@@ -1501,6 +1515,10 @@ class PlayerController(CoreController):
         # always signal update to the playerqueue
         self.mass.player_queues.on_player_update(player, changed_values)
 
+        # the config entries (and thus the resolved config) depend on these attributes
+        if ATTR_SUPPORTED_FEATURES in changed_values or ATTR_GROUP_MEMBERS in changed_values:
+            self.mass.config.invalidate_config_snapshots(player_id)
+
         if changed_values.keys() == {ATTR_ELAPSED_TIME} and not force_update:
             # ignore small changes in elapsed time
             prev_value = changed_values[ATTR_ELAPSED_TIME][0] or 0
@@ -2069,7 +2087,7 @@ class PlayerController(CoreController):
             await self._handle_cmd_resume(player.player_id, prev_source, prev_media)
 
     async def _poll_players(self) -> None:
-        """Background task that polls players for updates."""
+        """Background task that updates the elapsed time of players and schedules player polls."""
         while True:
             for player in list(self._players.values()):
                 # if the player is playing, update elapsed time every tick
@@ -2081,27 +2099,11 @@ class PlayerController(CoreController):
                         player,
                         {"corrected_elapsed_time": (None, player.corrected_elapsed_time)},
                     )
-                # Poll player;
-                if not player.needs_poll:
-                    continue
-                try:
-                    last_poll: float = player.extra_data[ATTR_LAST_POLL]
-                except KeyError:
-                    last_poll = 0.0
-                if (self.mass.loop.time() - last_poll) < player.poll_interval:
-                    continue
-                player.extra_data[ATTR_LAST_POLL] = self.mass.loop.time()
-                try:
-                    await player.poll()
-                except Exception as err:
-                    self.logger.warning(
-                        "Error while requesting latest state from player %s: %s",
-                        player.display_name,
-                        str(err),
-                        exc_info=err if self.logger.isEnabledFor(10) else None,
-                    )
-                # Yield to event loop to prevent blocking
-                await asyncio.sleep(0)
+                # the actual polls run (concurrently) in the poll scheduler,
+                # if the player is already scheduled, this only moves its deadline forward
+                # (if the poll interval of the player was lowered)
+                if player.needs_poll:
+                    self._poll_scheduler.schedule(player.player_id)
             await asyncio.sleep(1)
 
     async def _handle_select_plugin_source(
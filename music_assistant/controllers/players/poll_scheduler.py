@@ -0,0 +1,224 @@
+"""
+Scheduler for the polling of players.
+
+Players that need polling (e.g. players without push updates) are polled at their
+poll interval. The polls run concurrently (with bounded parallelism) and with a
+timeout, so a single unreachable player can not delay the polling of the other players.
+Players that fail to respond are polled less often (with an exponential backoff)
+until they respond again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+
+from music_assistant.constants import ATTR_LAST_POLL
+
+if TYPE_CHECKING:
+    from music_assistant.models.player import Player
+
+# maximum number of players that are polled at the same time
+POLL_MAX_CONCURRENCY: Final[int] = 10
+# maximum duration (in seconds) of a single poll
+POLL_TIMEOUT: Final[float] = 10.0
+# maximum interval (in seconds) between the polls of an unhealthy player
+POLL_MAX_BACKOFF: Final[float] = 300.0
+# number of (recent) poll latencies kept per provider
+POLL_LATENCY_SAMPLES: Final[int] = 100
+
+
+@dataclass
+class ProviderPollStats:
+    """Poll statistics of a (player) provider."""
+
+    polls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=POLL_LATENCY_SAMPLES))
+
+    def add(self, latency: float, failed: bool, timed_out: bool) -> None:
+        """Add the result of a poll."""
+        self.polls += 1
+        self.failures += failed
+        self.timeouts += timed_out
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.latencies.append(latency)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics (with latencies in milliseconds) as dict."""
+        recent = sorted(self.latencies)
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "avg_latency_ms": round(self.total_latency / self.polls * 1000, 1)
+            if self.polls
+            else 0.0,
+            "p95_latency_ms": round(recent[int(len(recent) * 0.95)] * 1000, 1) if recent else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class PlayerPollScheduler:
+    """Poll players at their (per player) deadline, concurrently and with a timeout."""
+
+    def __init__(
+        self,
+        get_player: Callable[[str], Player | None],
+        logger: logging.Logger,
+        max_concurrency: int = POLL_MAX_CONCURRENCY,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._get_player = get_player
+        self.logger = logger
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # priority queue of (deadline, player_id), the current deadline of each
+        # scheduled player is kept in _deadlines (outdated queue entries are skipped)
+        self._queue: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._polling: dict[str, asyncio.Task[None]] = {}
+        self._failures: dict[str, int] = {}
+        self._stats: dict[str, ProviderPollStats] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the scheduler."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler (and cancel all running polls)."""
+        tasks = [task for task in (self._task, *self._polling.values()) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def schedule(self, player_id: str, delay: float = 0.0) -> None:
+        """
+        Schedule the (next) poll of a player, unless it is already scheduled or polling.
+
+        If the player is already scheduled, its deadline is moved forward if the
+        poll interval of the player was lowered since its last poll.
+        """
+        if player_id in self._polling:
+            return
+        now = asyncio.get_running_loop().time()
+        if (current_deadline := self._deadlines.get(player_id)) is None:
+            self._failures.setdefault(player_id, 0)
+            self._add(player_id, now + delay)
+            return
+        if self._failures.get(player_id):
+            return  # keep backing off while the player fails to respond
+        if not (player := self._get_player(player_id)):
+            return
+        if (last_poll := player.extra_data.get(ATTR_LAST_POLL)) is None:
+            return
+        deadline = max(now, last_poll + float(player.poll_interval))
+        if deadline < current_deadline:
+            self._add(player_id, deadline)
+
+    def remove(self, player_id: str) -> None:
+        """Stop polling a player."""
+        self._deadlines.pop(player_id, None)
+        self._failures.pop(player_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the poll statistics (per provider) and the currently unhealthy players."""
+        return {
+            "providers": {
+                provider: stats.to_dict() for provider, stats in sorted(self._stats.items())
+            },
+            "polling": len(self._polling),
+            "scheduled": len(self._deadlines),
+            "unhealthy_players": {
+                player_id: failures for player_id, failures in self._failures.items() if failures
+            },
+        }
+
+    def _add(self, player_id: str, deadline: float) -> None:
+        """Add a player to the priority queue."""
+        self._deadlines[player_id] = deadline
+        heapq.heappush(self._queue, (deadline, player_id))
+        if self._queue[0][1] == player_id:
+            # the new deadline is the first one: wake up the scheduler
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Start the polls of the players whose deadline has passed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._queue and self._queue[0][0] <= now:
+                deadline, player_id = heapq.heappop(self._queue)
+                if self._deadlines.get(player_id) != deadline:
+                    continue  # outdated entry (player removed or rescheduled)
+                del self._deadlines[player_id]
+                self._polling[player_id] = asyncio.create_task(self._poll(player_id))
+            self._wakeup.clear()
+            timeout = self._queue[0][0] - now if self._queue else None
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _poll(self, player_id: str) -> None:
+        """Poll a single player and schedule its next poll."""
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                player = self._get_player(player_id)
+                if not player or not player.needs_poll:
+                    # the player will be scheduled again if it (once again) needs polling
+                    self.remove(player_id)
+                    return
+                failed = await self._poll_player(player)
+        finally:
+            self._polling.pop(player_id, None)
+        if player_id not in self._failures:
+            return  # removed while polling
+        # schedule the next poll, back off (exponentially) while the player fails to respond
+        failures = self._failures[player_id] = self._failures[player_id] + 1 if failed else 0
+        interval = float(player.poll_interval)
+        if failures:
+            interval = max(interval, min(interval * 2 ** min(failures, 10), POLL_MAX_BACKOFF))
+        self._add(player_id, loop.time() + interval)
+
+    async def _poll_player(self, player: Player) -> bool:
+        """Poll a player (with a timeout), return True if the poll failed."""
+        player.extra_data[ATTR_LAST_POLL] = asyncio.get_running_loop().time()
+        failed = timed_out = False
+        # only log (as warning) the first failure of a series, the player is backing off anyway
+        log_level = logging.DEBUG if self._failures.get(player.player_id) else logging.WARNING
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(POLL_TIMEOUT):
+                await player.poll()
+        except TimeoutError:
+            failed = timed_out = True
+            self.logger.log(
+                log_level,
+                "Timeout while requesting latest state from player %s",
+                player.display_name,
+            )
+        except Exception as err:
+            failed = True
+            self.logger.log(
+                log_level,
+                "Error while requesting latest state from player %s: %s",
+                player.display_name,
+                str(err),
+                exc_info=err if self.logger.isEnabledFor(logging.DEBUG) else None,
+            )
+        stats = self._stats.setdefault(player.provider.instance_id, ProviderPollStats())
+        stats.add(time.monotonic() - start, failed, timed_out)
+        return failed
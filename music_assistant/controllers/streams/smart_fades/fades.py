@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
@@ -19,6 +20,7 @@ from music_assistant.controllers.streams.smart_fades.filters import (
     TimeStretchFilter,
     TrimFilter,
 )
+from music_assistant.helpers import pcm
 from music_assistant.helpers.process import communicate
 from music_assistant.helpers.util import remove_file
 from music_assistant.models.smart_fades import (
@@ -496,9 +498,15 @@ class StandardCrossFade(SmartFade):
             len(adjusted_fade_out_part) / pcm_format.pcm_sample_size,
         )
         # Crossfaded portion: user's configured duration
-        crossfaded_section = await super().apply(
-            adjusted_fade_out_part, adjusted_fade_in_part, pcm_format
-        )
+        if pcm.is_supported_format(pcm_format):
+            # a plain crossfade is mixed in-process (with the linear curves of ffmpeg's acrossfade)
+            crossfaded_section = await asyncio.to_thread(
+                pcm.crossfade, adjusted_fade_out_part, adjusted_fade_in_part, pcm_format
+            )
+        else:
+            crossfaded_section = await super().apply(
+                adjusted_fade_out_part, adjusted_fade_in_part, pcm_format
+            )
         # Full result: everything concatenated
         return pre_crossfade + crossfaded_section + post_crossfade
 
@@ -15,7 +15,7 @@ import os
 import urllib.parse
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Final, cast
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from aiofiles.os import wrap
 from aiohttp import web
@@ -39,6 +39,7 @@ from music_assistant_models.player_queue import PlayLogEntry
 
 from music_assistant.constants import (
     ANNOUNCE_ALERT_FILE,
+    CONF_ALLOW_AUDIO_CACHE,
     CONF_BIND_IP,
     CONF_BIND_PORT,
     CONF_CROSSFADE_DURATION,
@@ -66,6 +67,7 @@ from music_assistant.controllers.players.player_controller import AnnounceData
 from music_assistant.controllers.streams.smart_fades import SmartFadesMixer
 from music_assistant.controllers.streams.smart_fades.analyzer import SmartFadesAnalyzer
 from music_assistant.controllers.streams.smart_fades.fades import SMART_CROSSFADE_DURATION
+from music_assistant.helpers.api import api_command
 from music_assistant.helpers.audio import LOGGER as AUDIO_LOGGER
 from music_assistant.helpers.audio import (
     get_buffered_media_stream,
@@ -75,6 +77,8 @@ from music_assistant.helpers.audio import (
     get_stream_details,
     resample_pcm_audio,
 )
+from music_assistant.helpers.audio_buffer import AudioBuffer
+from music_assistant.helpers.audio_cache import AudioCache
 from music_assistant.helpers.buffered_generator import buffered, use_buffer
 from music_assistant.helpers.ffmpeg import LOGGER as FFMPEG_LOGGER
 from music_assistant.helpers.ffmpeg import check_ffmpeg_version, get_ffmpeg_stream
@@ -106,6 +110,8 @@ if TYPE_CHECKING:
 isfile = wrap(os.path.isfile)
 
 CONF_ALLOW_BUFFER: Final[str] = "allow_buffering"
+CONF_BUFFER_MEMORY_LIMIT: Final[str] = "buffer_memory_limit"
+CONF_AUDIO_CACHE_MAX_SIZE: Final[str] = "audio_cache_max_size"
 CONF_ALLOW_CROSSFADE_SAME_ALBUM: Final[str] = "allow_crossfade_same_album"
 CONF_SMART_FADES_LOG_LEVEL: Final[str] = "smart_fades_log_level"
 
@@ -158,6 +164,7 @@ class StreamsController(CoreController):
         self._bind_ip: str = "0.0.0.0"
         self._smart_fades_mixer = SmartFadesMixer(self)
         self._smart_fades_analyzer = SmartFadesAnalyzer(self)
+        self.audio_cache = AudioCache(mass, os.path.join(mass.cache_path, "audio_cache"))
 
     @property
     def base_url(self) -> str:
@@ -205,6 +212,44 @@ class StreamsController(CoreController):
                 required=False,
                 category="audio",
             ),
+            ConfigEntry(
+                key=CONF_BUFFER_MEMORY_LIMIT,
+                type=ConfigEntryType.INTEGER,
+                default_value=0,
+                range=(0, 65536),
+                label="Memory limit for audio buffers (MB)",
+                description="Maximum amount of memory (in megabytes) used by the audio buffers "
+                "of all streams together. When the buffers grow larger, the oldest buffered "
+                "audio is moved to (temporary) files on disk, from which it can still be "
+                "quickly read back when seeking.\n\n"
+                "Set to 0 to keep all buffered audio in memory.",
+                depends_on=CONF_ALLOW_BUFFER,
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_ALLOW_AUDIO_CACHE,
+                type=ConfigEntryType.BOOLEAN,
+                default_value=False,
+                label="Allow caching of (streaming provider) track audio on disk",
+                description="Keep the audio of tracks from streaming providers in a cache on "
+                "disk after they have been played in full, so later plays (and seeks) of the "
+                "same tracks are served from disk instead of being downloaded again. \n\n"
+                "The audio of providers that do not allow caching (e.g. due to DRM "
+                "restrictions) is never cached.",
+                required=False,
+                category="audio",
+            ),
+            ConfigEntry(
+                key=CONF_AUDIO_CACHE_MAX_SIZE,
+                type=ConfigEntryType.INTEGER,
+                default_value=10,
+                range=(1, 1024),
+                label="Maximum size of the audio cache (GB)",
+                description="When the audio cache grows larger, the audio of the least "
+                "recently played tracks is removed from the cache.",
+                depends_on=CONF_ALLOW_AUDIO_CACHE,
+                category="advanced",
+            ),
             ConfigEntry(
                 key=CONF_VOLUME_NORMALIZATION_RADIO,
                 type=ConfigEntryType.STRING,
@@ -304,6 +349,13 @@ class StreamsController(CoreController):
         AUDIO_LOGGER.setLevel(self.logger.level)
         FFMPEG_LOGGER.setLevel(self.logger.level)
         self._setup_smart_fades_logger(config)
+        buffer_memory_limit = int(str(config.get_value(CONF_BUFFER_MEMORY_LIMIT) or 0))
+        AudioBuffer.memory_limit = buffer_memory_limit * 1024 * 1024
+        audio_cache_max_size = int(str(config.get_value(CONF_AUDIO_CACHE_MAX_SIZE) or 0))
+        await self.audio_cache.setup(
+            enabled=bool(config.get_value(CONF_ALLOW_AUDIO_CACHE)),
+            max_size=audio_cache_max_size * 1024 * 1024 * 1024,
+        )
         # perform check for ffmpeg version
         await check_ffmpeg_version()
         # start the webserver
@@ -364,6 +416,11 @@ class StreamsController(CoreController):
         """Cleanup on exit."""
         await self._server.close()
 
+    @api_command("streams/audio_cache_stats", required_role="admin")
+    async def get_audio_cache_stats(self) -> dict[str, Any]:
+        """Return statistics (hit rate, disk usage) of the (on-disk) audio cache."""
+        return await self.audio_cache.stats()
+
     async def resolve_stream_url(
         self,
         session_id: str,
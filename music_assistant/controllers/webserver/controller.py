@@ -39,7 +39,7 @@ from music_assistant.controllers.webserver.helpers.ssl import (
     format_certificate_info,
     verify_ssl_certificate,
 )
-from music_assistant.helpers.api import parse_arguments
+from music_assistant.helpers.api import api_command, parse_arguments
 from music_assistant.helpers.audio import get_preview_stream
 from music_assistant.helpers.json import json_dumps, json_loads
 from music_assistant.helpers.redirect_validation import is_allowed_redirect_url
@@ -49,6 +49,7 @@ from music_assistant.models.core_controller import CoreController
 
 from .api_docs import generate_commands_json, generate_openapi_spec, generate_schemas_json
 from .auth import AuthenticationManager
+from .event_broadcast import EventBroadcaster
 from .helpers.auth_middleware import (
     get_authenticated_user,
     is_request_from_ingress,
@@ -87,6 +88,7 @@ class WebserverController(CoreController):
         self.register_dynamic_route = self._server.register_dynamic_route
         self.unregister_dynamic_route = self._server.unregister_dynamic_route
         self.clients: set[WebsocketClientHandler] = set()
+        self.event_broadcaster = EventBroadcaster(mass)
         self.manifest.name = "Web Server (frontend and api)"
         self.manifest.description = (
             "The built-in webserver that hosts the Music Assistant Websockets API and frontend"
@@ -378,6 +380,11 @@ class WebserverController(CoreController):
         await self._server.close()
         await self.auth.close()
 
+    @api_command("webserver/event_stats", required_role="admin")
+    def get_event_stats(self) -> dict[str, Any]:
+        """Return (fan-out) statistics of the events broadcasted to the websocket clients."""
+        return self.event_broadcaster.get_stats()
+
     def register_websocket_client(self, client: WebsocketClientHandler) -> None:
         """Register a WebSocket client for tracking."""
         self.clients.add(client)
@@ -0,0 +1,83 @@
+"""Broadcast (Mass) events to all connected WebSocket clients."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from music_assistant_models.event import MassEvent
+
+    from music_assistant import MusicAssistant
+
+    from .websocket_client import WebsocketClientHandler
+
+
+class EventBroadcaster:
+    """
+    Broadcast (Mass) events to all connected WebSocket clients.
+
+    Each event is serialized (at most) once and the same message is sent to
+    all clients which are allowed to receive it.
+    """
+
+    def __init__(self, mass: MusicAssistant) -> None:
+        """Initialize EventBroadcaster."""
+        self.mass = mass
+        self._clients: set[WebsocketClientHandler] = set()
+        self._unsub_callback: Callable[[], None] | None = None
+        # per event type: count, recipients, serialize and fan-out time (in seconds)
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def add_client(self, client: WebsocketClientHandler) -> Callable[[], None]:
+        """Add client to the receivers of events, returns function to remove it."""
+        if self._unsub_callback is None:
+            self._unsub_callback = self.mass.subscribe(self._handle_event)
+        self._clients.add(client)
+
+        def remove_client() -> None:
+            self._clients.discard(client)
+            if not self._clients and self._unsub_callback is not None:
+                self._unsub_callback()
+                self._unsub_callback = None
+
+        return remove_client
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return (per event type) statistics of the broadcasted events."""
+        return {
+            "clients": len(self._clients),
+            "events": {
+                event_type: {
+                    **stats,
+                    "avg_recipients": stats["recipients"] / stats["count"],
+                    "avg_serialize_ms": stats["serialize_time"] * 1000 / stats["count"],
+                    "avg_fan_out_ms": stats["fan_out_time"] * 1000 / stats["count"],
+                }
+                for event_type, stats in self._stats.items()
+            },
+        }
+
+    def _handle_event(self, event: MassEvent) -> None:
+        """Handle (and broadcast) a Mass event."""
+        start = time.perf_counter()
+        message: str | None = None
+        serialize_time = 0.0
+        recipients = 0
+        for client in list(self._clients):
+            if not client.accepts_event(event):
+                continue
+            if message is None:
+                message = event.to_json()
+                serialize_time = time.perf_counter() - start
+            client.send_serialized(message)
+            recipients += 1
+        stats = self._stats.setdefault(
+            event.event.value,
+            {"count": 0, "recipients": 0, "serialize_time": 0.0, "fan_out_time": 0.0},
+        )
+        stats["count"] += 1
+        stats["recipients"] += recipients
+        stats["serialize_time"] += serialize_time
+        stats["fan_out_time"] += time.perf_counter() - start - serialize_time
@@ -281,10 +281,12 @@ class WebsocketClientHandler:
 
         Serializes inline without executor overhead since events are typically small.
         """
-        _message = message.to_json()
+        self.send_serialized(message.to_json())
 
+    def send_serialized(self, message: str) -> None:
+        """Send an (already serialized) message to the client."""
         try:
-            self._to_write.put_nowait(_message)
+            self._to_write.put_nowait(message)
         except asyncio.QueueFull:
             self._logger.error("Client exceeded max pending messages: %s", MAX_PENDING_MSG)
 
@@ -414,32 +416,30 @@ class WebsocketClientHandler:
         if self._events_unsub_callback is not None:
             # Already subscribed
             return
-
-        def handle_event(event: MassEvent) -> None:
-            # filter events for objects the user has no access to
-            if (
-                self._authenticated_user
-                and self._authenticated_user.player_filter
-                and event.event
-                in (
-                    EventType.PLAYER_ADDED,
-                    EventType.PLAYER_REMOVED,
-                    EventType.PLAYER_UPDATED,
-                    EventType.QUEUE_ADDED,
-                    EventType.QUEUE_ITEMS_UPDATED,
-                    EventType.QUEUE_TIME_UPDATED,
-                    EventType.QUEUE_UPDATED,
-                )
-                and event.object_id
-                and event.object_id not in self._authenticated_user.player_filter
-            ):
-                return
-
-            self._send_message_sync(event)
-
-        self._events_unsub_callback = self.mass.subscribe(handle_event)
+        # events are serialized once and broadcasted to all clients by the webserver
+        self._events_unsub_callback = self.webserver.event_broadcaster.add_client(self)
         self._logger.debug("Subscribed to events")
 
+    def accepts_event(self, event: MassEvent) -> bool:
+        """Return if the event may be sent to this client."""
+        # filter events for objects the user has no access to
+        return not (
+            self._authenticated_user
+            and self._authenticated_user.player_filter
+            and event.event
+            in (
+                EventType.PLAYER_ADDED,
+                EventType.PLAYER_REMOVED,
+                EventType.PLAYER_UPDATED,
+                EventType.QUEUE_ADDED,
+                EventType.QUEUE_ITEMS_UPDATED,
+                EventType.QUEUE_TIME_UPDATED,
+                EventType.QUEUE_UPDATED,
+            )
+            and event.object_id
+            and event.object_id not in self._authenticated_user.player_filter
+        )
+
     def _cancel(self) -> None:
         """Cancel the connection."""
         if self._handle_task is not None:
@@ -9,6 +9,7 @@ import re
 import struct
 import time
 from collections.abc import AsyncGenerator
+from dataclasses import replace
 from io import BytesIO
 from typing import TYPE_CHECKING, Final, cast
 
@@ -49,7 +50,9 @@ from music_assistant.helpers.json import JSON_DECODE_EXCEPTIONS, json_loads
 from music_assistant.helpers.throttle_retry import BYPASS_THROTTLER
 from music_assistant.helpers.util import clean_stream_title, remove_file
 
+from . import pcm
 from .audio_buffer import AudioBuffer
+from .audio_cache import COMPLETE_DURATION_TOLERANCE
 from .dsp import filter_to_ffmpeg_params
 from .ffmpeg import FFMpeg, get_ffmpeg_args, get_ffmpeg_stream
 from .playlists import IsHLSPlaylist, PlaylistItem, fetch_playlist, parse_m3u
@@ -101,6 +104,34 @@ async def strip_silence(
     audio_data: bytes,
     pcm_format: AudioFormat,
     reverse: bool = False,
+) -> bytes:
+    """Strip silence from begin or end of pcm audio."""
+    if pcm.is_supported_format(pcm_format):
+        stripped_data = await asyncio.to_thread(
+            pcm.strip_silence, audio_data, pcm_format, reverse=reverse
+        )
+    else:
+        stripped_data = await _strip_silence_ffmpeg(audio_data, pcm_format, reverse)
+
+    # return stripped audio
+    bytes_stripped = len(audio_data) - len(stripped_data)
+    if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
+        seconds_stripped = round(bytes_stripped / pcm_format.pcm_sample_size, 2)
+        location = "end" if reverse else "begin"
+        LOGGER.log(
+            VERBOSE_LOG_LEVEL,
+            "stripped %s seconds of silence from %s of pcm audio. bytes stripped: %s",
+            seconds_stripped,
+            location,
+            bytes_stripped,
+        )
+    return stripped_data
+
+
+async def _strip_silence_ffmpeg(
+    audio_data: bytes,
+    pcm_format: AudioFormat,
+    reverse: bool = False,
 ) -> bytes:
     """Strip silence from begin or end of pcm audio using ffmpeg."""
     args = ["ffmpeg", "-hide_banner", "-loglevel", "quiet"]
@@ -130,19 +161,6 @@ async def strip_silence(
     # output args
     args += ["-f", pcm_format.content_type.value, "-"]
     _returncode, stripped_data, _stderr = await communicate(args, audio_data)
-
-    # return stripped audio
-    bytes_stripped = len(audio_data) - len(stripped_data)
-    if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
-        seconds_stripped = round(bytes_stripped / pcm_format.pcm_sample_size, 2)
-        location = "end" if reverse else "begin"
-        LOGGER.log(
-            VERBOSE_LOG_LEVEL,
-            "stripped %s seconds of silence from %s of pcm audio. bytes stripped: %s",
-            seconds_stripped,
-            location,
-            bytes_stripped,
-        )
     return stripped_data
 
 
@@ -339,8 +357,8 @@ async def get_stream_details(
     if not streamdetails.duration:
         streamdetails.duration = queue_item.duration
     streamdetails.prefer_album_loudness = prefer_album_loudness
-    player_settings = await mass.config.get_player_config(streamdetails.queue_id)
-    core_config = await mass.config.get_core_config("streams")
+    player_settings = await mass.config.get_player_config_snapshot(streamdetails.queue_id)
+    core_config = await mass.config.get_core_config_snapshot("streams")
     conf_volume_normalization_target = float(
         str(player_settings.get_value(CONF_VOLUME_NORMALIZATION_TARGET, -17))
     )
@@ -515,10 +533,25 @@ async def get_media_stream(
     logger.log(VERBOSE_LOG_LEVEL, "Starting media stream for %s", streamdetails.uri)
     extra_input_args = streamdetails.extra_input_args or []
 
+    # look up the audio in the (on-disk) audio cache, or cache the audio of this (full) play
+    audio_cache = mass.streams.audio_cache
+    cache_path: str | None = None
+    cache_temp_path: str | None = None
+    if audio_cache.is_cacheable(streamdetails):
+        if not (cache_path := await audio_cache.get(streamdetails)) and not seek_position:
+            cache_temp_path = await audio_cache.start_write(streamdetails)
+
     # work out audio source for these streamdetails
     audio_source: str | AsyncGenerator[bytes, None]
+    input_format = streamdetails.audio_format
     stream_type = streamdetails.stream_type
-    if stream_type == StreamType.CUSTOM:
+    if cache_path:
+        logger.debug("Streaming %s from the audio cache", streamdetails.uri)
+        audio_source = cache_path
+        input_format = replace(streamdetails.audio_format, content_type=ContentType.NUT)
+        # the provider specific (input) args do not apply to the cached file
+        extra_input_args = []
+    elif stream_type == StreamType.CUSTOM:
         music_prov = mass.get_provider(streamdetails.provider)
         if TYPE_CHECKING:  # avoid circular import
             assert isinstance(music_prov, MusicProvider)
@@ -555,7 +588,7 @@ async def get_media_stream(
             audio_source = streamdetails.path
 
     # handle seek support
-    if seek_position and streamdetails.duration and streamdetails.allow_seek:
+    if seek_position and streamdetails.duration and (streamdetails.allow_seek or cache_path):
         extra_input_args += ["-ss", str(int(seek_position))]
 
     bytes_sent = 0
@@ -564,10 +597,11 @@ async def get_media_stream(
     first_chunk_received = False
     ffmpeg_proc = FFMpeg(
         audio_input=audio_source,
-        input_format=streamdetails.audio_format,
+        input_format=input_format,
         output_format=pcm_format,
         filter_params=filter_params,
         extra_input_args=extra_input_args,
+        passthrough_output=cache_temp_path,
         collect_log_history=True,
         loglevel="debug" if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL) else "info",
     )
@@ -624,6 +658,14 @@ async def get_media_stream(
         # determine how many seconds we've received
         # for pcm output we can calculate this easily
         seconds_received = bytes_sent / pcm_format.pcm_sample_size if bytes_sent else 0
+        if cache_temp_path:
+            # only cache the audio of a complete play of the track
+            complete = (
+                finished
+                and ffmpeg_proc.returncode == 0
+                and seconds_received >= (streamdetails.duration or 0) - COMPLETE_DURATION_TOLERANCE
+            )
+            mass.create_task(audio_cache.finish_write(streamdetails, cache_temp_path, complete))
         # store accurate duration
         if finished and not seek_position and seconds_received:
             streamdetails.duration = int(seconds_received)
@@ -1159,7 +1201,10 @@ async def resample_pcm_audio(
     output_format: AudioFormat,
 ) -> bytes:
     """
-    Resample (a chunk of) PCM audio from input_format to output_format using ffmpeg.
+    Resample (a chunk of) PCM audio from input_format to output_format.
+
+    Conversions which do not change the sample rate are handled in-process,
+    actual resampling is done using ffmpeg.
 
     :param input_audio: Raw PCM audio data to resample.
     :param input_format: AudioFormat of the input audio.
@@ -1171,6 +1216,14 @@ async def resample_pcm_audio(
         return input_audio
     LOGGER.log(VERBOSE_LOG_LEVEL, f"Resampling audio from {input_format} to {output_format}")
     try:
+        if (
+            input_format.sample_rate == output_format.sample_rate
+            and pcm.is_supported_format(input_format)
+            and pcm.is_supported_format(output_format)
+        ):
+            return await asyncio.to_thread(
+                pcm.convert_format, input_audio, input_format, output_format
+            )
         ffmpeg_args = get_ffmpeg_args(
             input_format=input_format, output_format=output_format, filter_params=[]
         )
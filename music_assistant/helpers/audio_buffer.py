@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import mmap
+import tempfile
 import time
+import weakref
 from collections import deque
 from collections.abc import AsyncGenerator
 from contextlib import suppress
-from typing import TYPE_CHECKING, Any
+from typing import IO, TYPE_CHECKING, Any, ClassVar
 
 from music_assistant_models.errors import AudioError
 
@@ -20,6 +23,8 @@ if TYPE_CHECKING:
 LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.audio_buffer")
 
 DEFAULT_MAX_BUFFER_SIZE_SECONDS: int = 60 * 8  # 8 minutes
+# number of most recent seconds which are always kept in memory (when spilling to disk)
+MIN_IN_MEMORY_SECONDS: int = 10
 
 
 class AudioBufferEOF(Exception):
@@ -31,8 +36,17 @@ class AudioBuffer:
 
     Each chunk represents exactly 1 second of audio.
     Chunks are stored in a deque for efficient O(1) append and popleft operations.
+
+    If a memory limit is set (shared by all buffers), the oldest chunks are spilled
+    to a memory-mapped temporary file once all buffers together exceed the limit.
+    The file is used as a ring buffer with one slot per second, so (seeking to)
+    spilled chunks stays cheap. Spilled chunks are kept in the deque as their length.
     """
 
+    # max total size (in bytes) of the in-memory chunks of all buffers, 0 = unlimited
+    memory_limit: ClassVar[int] = 0
+    _instances: ClassVar[weakref.WeakSet[AudioBuffer]] = weakref.WeakSet()
+
     def __init__(
         self,
         pcm_format: AudioFormat,
@@ -51,9 +65,15 @@ class AudioBuffer:
         self.checksum = checksum
         self.max_size_seconds = max_size_seconds
         # Store chunks in a deque for O(1) append and popleft operations
-        self._chunks: deque[bytes] = deque()
+        self._chunks: deque[bytes | int] = deque()
         # Track how many chunks have been discarded from the start
         self._discarded_chunks = 0
+        # Spilled chunks are always the oldest chunks (at the start of the deque)
+        self._spilled_chunks = 0
+        self._memory_bytes = 0
+        self._spill_file: IO[bytes] | None = None
+        self._spill_map: mmap.mmap | None = None
+        AudioBuffer._instances.add(self)
         self._lock = asyncio.Lock()
         self._data_available = asyncio.Condition(self._lock)
         self._space_available = asyncio.Condition(self._lock)
@@ -76,6 +96,11 @@ class AudioBuffer:
         """Return the size in bytes of one second of PCM audio."""
         return self.pcm_format.pcm_sample_size
 
+    @property
+    def memory_bytes(self) -> int:
+        """Return the size in bytes of the chunks which are held in memory."""
+        return self._memory_bytes
+
     @property
     def size_seconds(self) -> int:
         """Return current size of the buffer in seconds."""
@@ -149,6 +174,9 @@ class AudioBuffer:
 
             # Add chunk to the list (index = second position)
             self._chunks.append(chunk)
+            self._memory_bytes += len(chunk)
+            if self.memory_limit:
+                await self._spill()
             if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
                 LOGGER.log(
                     VERBOSE_LOG_LEVEL,
@@ -207,15 +235,20 @@ class AudioBuffer:
                 buffer_index = chunk_number - self._discarded_chunks
 
             # If buffer is at max size, discard the oldest chunk to make room
-            if len(self._chunks) >= self.max_size_seconds:
+            # (unless that is the chunk being requested)
+            if len(self._chunks) >= self.max_size_seconds and buffer_index > 0:
                 discarded = self._chunks.popleft()  # O(1) operation with deque
                 self._discarded_chunks += 1
+                if isinstance(discarded, int):
+                    self._spilled_chunks -= 1
+                else:
+                    self._memory_bytes -= len(discarded)
                 if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
                     LOGGER.log(
                         VERBOSE_LOG_LEVEL,
                         "AudioBuffer.get: Discarded chunk %s (size: %s bytes) to free space",
                         self._discarded_chunks - 1,
-                        len(discarded),
+                        discarded if isinstance(discarded, int) else len(discarded),
                     )
                 # Notify producers waiting for space
                 self._space_available.notify_all()
@@ -223,7 +256,11 @@ class AudioBuffer:
                 buffer_index = chunk_number - self._discarded_chunks
 
             # Return the chunk at the requested index
-            return self._chunks[buffer_index]
+            chunk = self._chunks[buffer_index]
+            if isinstance(chunk, int):
+                # chunk was spilled to disk, read it back from its slot
+                return await asyncio.to_thread(self._read_spilled, chunk_number, chunk)
+            return chunk
 
     async def iter(self, seek_position: int = 0) -> AsyncGenerator[bytes, None]:
         """
@@ -270,6 +307,9 @@ class AudioBuffer:
             # Clearing a large deque can take >100ms
             self._chunks = deque()
             self._discarded_chunks = 0
+            self._spilled_chunks = 0
+            self._memory_bytes = 0
+            self._close_spill_file()
             self._eof_received = False
             self._cancelled = True  # Mark buffer as cancelled
             self._producer_error = None  # Clear any producer error
@@ -290,6 +330,60 @@ class AudioBuffer:
             self._data_available.notify_all()
             self._space_available.notify_all()
 
+    async def _spill(self) -> None:
+        """Spill the oldest in-memory chunks to disk while over the (global) memory limit."""
+        total_memory = sum(x.memory_bytes for x in AudioBuffer._instances)
+        slot_size = self.chunk_size_bytes
+        to_spill: list[tuple[int, bytes]] = []
+        while (
+            total_memory > self.memory_limit
+            and len(self._chunks) - self._spilled_chunks - len(to_spill) > MIN_IN_MEMORY_SECONDS
+        ):
+            buffer_index = self._spilled_chunks + len(to_spill)
+            chunk = self._chunks[buffer_index]
+            if isinstance(chunk, int) or len(chunk) > slot_size:
+                # (unexpected) oversized chunk, keep it (and all newer chunks) in memory
+                break
+            to_spill.append((self._discarded_chunks + buffer_index, chunk))
+            total_memory -= len(chunk)
+        if not to_spill:
+            return
+        await asyncio.to_thread(self._write_spilled, to_spill)
+        for _, chunk in to_spill:
+            # replace the chunk by its length, the data can be found in its slot
+            self._chunks[self._spilled_chunks] = len(chunk)
+            self._spilled_chunks += 1
+            self._memory_bytes -= len(chunk)
+
+    def _write_spilled(self, chunks: list[tuple[int, bytes]]) -> None:
+        """Write chunks to their slot in the spill file (called in executor)."""
+        slot_size = self.chunk_size_bytes
+        if self._spill_map is None:
+            # the file is sparse, disk space is only used for the slots actually written
+            self._spill_file = tempfile.TemporaryFile(prefix="mass_audio_buffer_")  # noqa: SIM115
+            self._spill_file.truncate(slot_size * self.max_size_seconds)
+            self._spill_map = mmap.mmap(
+                self._spill_file.fileno(), slot_size * self.max_size_seconds
+            )
+        for chunk_number, chunk in chunks:
+            offset = (chunk_number % self.max_size_seconds) * slot_size
+            self._spill_map[offset : offset + len(chunk)] = chunk
+
+    def _read_spilled(self, chunk_number: int, length: int) -> bytes:
+        """Read a chunk from its slot in the spill file (called in executor)."""
+        assert self._spill_map is not None
+        offset = (chunk_number % self.max_size_seconds) * self.chunk_size_bytes
+        return self._spill_map[offset : offset + length]
+
+    def _close_spill_file(self) -> None:
+        """Close (and thereby remove) the spill file."""
+        if self._spill_map is not None:
+            self._spill_map.close()
+            self._spill_map = None
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
     async def _monitor_inactivity(self) -> None:
         """Monitor buffer for inactivity and clear if inactive for 5 minutes."""
         inactivity_timeout = 60 * 5  # 5 minutes
@@ -0,0 +1,259 @@
+"""Persistent (on-disk) cache of the audio of provider tracks."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+
+from music_assistant_models.enums import MediaType, StreamType
+
+from music_assistant.constants import DB_TABLE_AUDIO_CACHE, MASS_LOGGER_NAME
+from music_assistant.helpers.util import remove_file
+
+if TYPE_CHECKING:
+    from music_assistant_models.streamdetails import StreamDetails
+
+    from music_assistant.mass import MusicAssistant
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.audio_cache")
+
+# extension of the (complete) cached audio files: the original audio in a NUT container
+CACHE_FILE_EXT: Final[str] = ".nut"
+# extension of the audio files that are being written
+TEMP_FILE_EXT: Final[str] = ".part"
+# free disk space (in bytes) to keep, no new files are written to the cache below this
+MIN_FREE_DISK_SPACE: Final[int] = 1024 * 1024 * 1024
+# a (first) play is considered complete if it is at most this number of seconds shorter
+# than the (expected) duration of the track
+COMPLETE_DURATION_TOLERANCE: Final[int] = 10
+# the media types of which the audio can be cached (single files of a known duration)
+CACHEABLE_MEDIA_TYPES: Final[tuple[MediaType, ...]] = (
+    MediaType.TRACK,
+    MediaType.PODCAST_EPISODE,
+    MediaType.AUDIOBOOK,
+)
+
+
+@dataclass
+class AudioCacheEntry:
+    """An audio file in the audio cache."""
+
+    key: str
+    uri: str
+    size: int
+    last_access: int
+    expires: int
+
+
+class AudioCache:
+    """
+    Size-bounded (LRU by bytes) on-disk cache of the audio of provider tracks.
+
+    The first full play of a (cacheable) track is copied as-is (without transcoding) into
+    a file by the same ffmpeg process that decodes the stream, so the audio is downloaded
+    only once. Later plays, seeks and (crossfade) analysis of the track are served from
+    that file. The index of the cached files is kept in the cache database and the least
+    recently used files are removed when the cache grows beyond its maximum size.
+
+    Only full length (single file) tracks, podcast episodes and audiobooks are cached and
+    only for providers that allow it (see MusicProvider.audio_cache_expiration),
+    encrypted (DRM) streams are never cached.
+    """
+
+    def __init__(self, mass: MusicAssistant, cache_dir: str) -> None:
+        """Initialize AudioCache."""
+        self.mass = mass
+        self.cache_dir = cache_dir
+        self.enabled = False
+        self.max_size = 0
+        self._entries: OrderedDict[str, AudioCacheEntry] = OrderedDict()
+        self._size = 0
+        self._writing: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached audio files in bytes."""
+        return self._size
+
+    async def setup(self, enabled: bool, max_size: int) -> None:
+        """Load the index of the cached audio files (and cleanup stale files)."""
+        assert self.mass.cache.database is not None
+        self.enabled = enabled
+        self.max_size = max_size
+        self._entries.clear()
+        self._size = 0
+        await asyncio.to_thread(os.makedirs, self.cache_dir, exist_ok=True)
+        files = set(await asyncio.to_thread(os.listdir, self.cache_dir))
+        for db_row in await self.mass.cache.database.get_rows(
+            DB_TABLE_AUDIO_CACHE, order_by="last_access", limit=0
+        ):
+            entry = AudioCacheEntry(**db_row)
+            if self._get_file_name(entry.key) not in files:
+                await self.mass.cache.database.delete(DB_TABLE_AUDIO_CACHE, {"key": entry.key})
+                continue
+            self._entries[entry.key] = entry
+            self._size += entry.size
+        # remove the files which are not (or no longer) in the index,
+        # such as the partially written files of an unclean shutdown
+        for file_name in files - {self._get_file_name(key) for key in self._entries}:
+            await remove_file(os.path.join(self.cache_dir, file_name))
+        if not enabled:
+            # free the disk space of a disabled cache
+            self.max_size = 0
+        await self._evict()
+        LOGGER.debug(
+            "Audio cache loaded: %s files, %.1f MB",
+            len(self._entries),
+            self._size / 1024 / 1024,
+        )
+
+    def is_cacheable(self, streamdetails: StreamDetails) -> bool:
+        """Return if the audio of the stream can be (or is) cached."""
+        return (
+            self.enabled
+            and streamdetails.media_type in CACHEABLE_MEDIA_TYPES
+            and bool(streamdetails.duration)
+            and streamdetails.stream_type != StreamType.ENCRYPTED_HTTP
+            and not streamdetails.decryption_key
+            and not isinstance(streamdetails.path, list)
+            and self._get_expiration(streamdetails) > 0
+        )
+
+    async def get(self, streamdetails: StreamDetails) -> str | None:
+        """Return the path of the cached audio file of the stream (None if not cached)."""
+        key = self._get_key(streamdetails)
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+        now = int(time.time())
+        if entry.expires < now:
+            await self._remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.last_access = now
+        self._entries.move_to_end(key)
+        assert self.mass.cache.database is not None
+        await self.mass.cache.database.update(
+            DB_TABLE_AUDIO_CACHE, {"key": key}, {"last_access": now}
+        )
+        return os.path.join(self.cache_dir, self._get_file_name(key))
+
+    async def start_write(self, streamdetails: StreamDetails) -> str | None:
+        """
+        Start writing the audio of the stream to the cache.
+
+        Returns the (temporary) path to write the audio to, or None if the audio of the
+        stream is already cached (or being written) or there is not enough free disk space.
+        """
+        key = self._get_key(streamdetails)
+        if key in self._entries or key in self._writing:
+            return None
+        disk_usage = await asyncio.to_thread(shutil.disk_usage, self.cache_dir)
+        if disk_usage.free < MIN_FREE_DISK_SPACE:
+            LOGGER.debug("Not enough free disk space to cache %s", streamdetails.uri)
+            return None
+        self._writing.add(key)
+        return os.path.join(self.cache_dir, f"{key}{TEMP_FILE_EXT}")
+
+    async def finish_write(
+        self, streamdetails: StreamDetails, temp_path: str, complete: bool
+    ) -> None:
+        """Add the written audio file to the cache (or remove it if it is not complete)."""
+        key = self._get_key(streamdetails)
+        self._writing.discard(key)
+        if not complete or not self.enabled:
+            await remove_file(temp_path)
+            return
+        file_path = os.path.join(self.cache_dir, self._get_file_name(key))
+        try:
+            size = await asyncio.to_thread(os.path.getsize, temp_path)
+            await asyncio.to_thread(os.replace, temp_path, file_path)
+        except OSError as err:
+            LOGGER.warning("Unable to cache the audio of %s: %s", streamdetails.uri, str(err))
+            await remove_file(temp_path)
+            return
+        now = int(time.time())
+        entry = AudioCacheEntry(
+            key=key,
+            uri=streamdetails.uri,
+            size=size,
+            last_access=now,
+            expires=now + self._get_expiration(streamdetails),
+        )
+        assert self.mass.cache.database is not None
+        await self.mass.cache.database.insert_or_replace(DB_TABLE_AUDIO_CACHE, vars(entry))
+        self._entries[key] = entry
+        self._size += size
+        self.stores += 1
+        LOGGER.debug("Cached the audio of %s (%.1f MB)", streamdetails.uri, size / 1024 / 1024)
+        await self._evict()
+
+    async def clear(self) -> None:
+        """Remove all audio files from the cache."""
+        for key in list(self._entries):
+            await self._remove(key)
+
+    async def stats(self) -> dict[str, Any]:
+        """Return statistics (hit rate, disk usage) of the cache."""
+        requests = self.hits + self.misses
+        disk_usage = (
+            await asyncio.to_thread(shutil.disk_usage, self.cache_dir) if self.enabled else None
+        )
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_size,
+            "disk_free_bytes": disk_usage.free if disk_usage else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "writing": len(self._writing),
+        }
+
+    async def _evict(self) -> None:
+        """Remove the expired and (if needed) the least recently used audio files."""
+        now = int(time.time())
+        for key in [key for key, entry in self._entries.items() if entry.expires < now]:
+            await self._remove(key)
+        while self._entries and self._size > self.max_size:
+            await self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def _remove(self, key: str) -> None:
+        """Remove an audio file from the cache."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        await remove_file(os.path.join(self.cache_dir, self._get_file_name(key)))
+        assert self.mass.cache.database is not None
+        await self.mass.cache.database.delete(DB_TABLE_AUDIO_CACHE, {"key": key})
+
+    def _get_expiration(self, streamdetails: StreamDetails) -> int:
+        """Return the number of seconds the audio of the stream may be cached."""
+        if not (provider := self.mass.get_provider(streamdetails.provider)):
+            return 0
+        return int(getattr(provider, "audio_cache_expiration", 0))
+
+    @staticmethod
+    def _get_key(streamdetails: StreamDetails) -> str:
+        """Return the cache key for the audio of the stream."""
+        return hashlib.sha1(streamdetails.uri.encode(), usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def _get_file_name(key: str) -> str:
+        """Return the file name of a cached audio file."""
+        return f"{key}{CACHE_FILE_EXT}"
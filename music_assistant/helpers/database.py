@@ -5,9 +5,11 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import re
 import time
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from sqlite3 import OperationalError
 from typing import TYPE_CHECKING, Any, cast
 
@@ -45,6 +47,11 @@ UNSET: _UnsetType = _UnsetType()
 
 ENABLE_DEBUG = os.environ.get("PYTHONDEVMODE") == "1"
 
+# writes within a batch are committed in transactions of (at most) this many rows
+BATCH_COMMIT_SIZE = 1000
+# or at the latest this number of seconds after the first (uncommitted) write
+BATCH_COMMIT_INTERVAL = 5.0
+
 
 @asynccontextmanager
 async def debug_query(
@@ -93,14 +100,50 @@ def query_params(query: str, params: dict[str, Any] | None) -> tuple[str, dict[s
     return (result_query, result_params)
 
 
+def fts_match_query(search: str, columns: Iterable[str] | None = None) -> str | None:
+    """
+    Build a (prefix matching) FTS5 MATCH expression from a free text search string.
+
+    Every word in the search string is quoted (so it can never be interpreted as FTS5
+    query syntax) and suffixed with a prefix wildcard. All words must match.
+    Returns None if the search string does not contain any searchable words.
+
+    :param search: The (raw) search string as entered by the user.
+    :param columns: Optionally restrict the match to these FTS columns.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    match_expr = " ".join(f'"{word}"*' for word in words)
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({match_expr})"
+    return match_expr
+
+
 class DatabaseConnection:
     """Class that holds the (connection to the) database with some convenience helper functions."""
 
     _db: aiosqlite.Connection
 
-    def __init__(self, db_path: str) -> None:
-        """Initialize class."""
+    def __init__(self, db_path: str, read_pool_size: int = 0) -> None:
+        """
+        Initialize class.
+
+        :param db_path: Path to the database file.
+        :param read_pool_size: Number of (extra) read-only connections to use for read queries,
+            so reads do not have to wait for the writes. If 0, all queries use a single
+            (exclusive) connection.
+        """
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._read_connections: list[aiosqlite.Connection] = []
+        # the batches are scoped to the context (task) which opened them,
+        # writes of other tasks are not deferred by a (long running) batch
+        self._batch_depth: ContextVar[int] = ContextVar(f"batch_{db_path}", default=0)
+        self._pending_writes = 0
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
 
     async def setup(self) -> None:
         """Perform async initialization."""
@@ -108,7 +151,9 @@ class DatabaseConnection:
         self._db.row_factory = aiosqlite.Row
         # setup some default settings for more performance
         await self.execute("PRAGMA analysis_limit=10000;")
-        await self.execute("PRAGMA locking_mode=exclusive;")
+        if not self.read_pool_size:
+            # exclusive locking is only possible when this is the only connection
+            await self.execute("PRAGMA locking_mode=exclusive;")
         await self.execute("PRAGMA journal_mode=WAL;")
         await self.execute("PRAGMA journal_size_limit = 6144000;")
         await self.execute("PRAGMA synchronous=normal;")
@@ -116,9 +161,26 @@ class DatabaseConnection:
         await self.execute("PRAGMA mmap_size = 30000000000;")
         await self.execute("PRAGMA cache_size = -64000;")
         await self.commit()
+        if self.read_pool_size:
+            # in WAL mode, readers do not block the writer (and vice versa)
+            self._read_pool = asyncio.Queue()
+            for _ in range(self.read_pool_size):
+                read_db = await aiosqlite.connect(f"file:{self.db_path}?mode=ro", uri=True)
+                read_db.row_factory = aiosqlite.Row
+                await read_db.execute("PRAGMA temp_store=memory;")
+                await read_db.execute("PRAGMA mmap_size = 30000000000;")
+                await read_db.execute("PRAGMA cache_size = -16000;")
+                self._read_connections.append(read_db)
+                self._read_pool.put_nowait(read_db)
 
     async def close(self) -> None:
         """Close db connection on exit."""
+        if self._flush_task:
+            await self._flush_task
+        for read_db in self._read_connections:
+            await read_db.close()
+        self._read_connections.clear()
+        self._read_pool = None
         await self.execute("PRAGMA optimize;")
         await self.commit()
         await self._db.close()
@@ -139,10 +201,8 @@ class DatabaseConnection:
             sql_query += f" ORDER BY {order_by}"
         if limit:
             sql_query += f" LIMIT {limit} OFFSET {offset}"
-        async with debug_query(sql_query):
-            return cast(
-                "list[Mapping[str, Any]]", await self._db.execute_fetchall(sql_query, match)
-            )
+        async with debug_query(sql_query), self._read_connection() as db:
+            return cast("list[Mapping[str, Any]]", await db.execute_fetchall(sql_query, match))
 
     async def get_rows_from_query(
         self,
@@ -155,8 +215,8 @@ class DatabaseConnection:
         if limit:
             query += f" LIMIT {limit} OFFSET {offset}"
         _query, _params = query_params(query, params)
-        async with debug_query(_query, _params):
-            return cast("list[Mapping[str, Any]]", await self._db.execute_fetchall(_query, _params))
+        async with debug_query(_query, _params), self._read_connection() as db:
+            return cast("list[Mapping[str, Any]]", await db.execute_fetchall(_query, _params))
 
     async def get_count_from_query(
         self,
@@ -166,8 +226,8 @@ class DatabaseConnection:
         """Get row count for given custom query."""
         query = f"SELECT count() FROM ({query})"
         _query, _params = query_params(query, params)
-        async with debug_query(_query):
-            async with self._db.execute(_query, _params) as cursor:
+        async with debug_query(_query), self._read_connection() as db:
+            async with db.execute(_query, _params) as cursor:
                 if result := await cursor.fetchone():
                     assert isinstance(result[0], int)  # for type checking
                     return result[0]
@@ -179,8 +239,8 @@ class DatabaseConnection:
     ) -> int:
         """Get row count for given table."""
         query = f"SELECT count(*) FROM {table}"
-        async with debug_query(query):
-            async with self._db.execute(query) as cursor:
+        async with debug_query(query), self._read_connection() as db:
+            async with db.execute(query) as cursor:
                 if result := await cursor.fetchone():
                     assert isinstance(result[0], int)  # for type checking
                     return result[0]
@@ -192,16 +252,18 @@ class DatabaseConnection:
         """Search table by column."""
         sql_query = f"SELECT * FROM {table} WHERE {table}.{column} LIKE :search"
         params = {"search": f"%{search}%"}
-        async with debug_query(sql_query, params):
-            return cast(
-                "list[Mapping[str, Any]]", await self._db.execute_fetchall(sql_query, params)
-            )
+        async with debug_query(sql_query, params), self._read_connection() as db:
+            return cast("list[Mapping[str, Any]]", await db.execute_fetchall(sql_query, params))
 
     async def get_row(self, table: str, match: dict[str, Any]) -> Mapping[str, Any] | None:
         """Get single row for given table where column matches keys/values."""
         sql_query = f"SELECT * FROM {table} WHERE "
         sql_query += " AND ".join(f"{table}.{x} = :{x}" for x in match)
-        async with debug_query(sql_query, match), self._db.execute(sql_query, match) as cursor:
+        async with (
+            debug_query(sql_query, match),
+            self._read_connection() as db,
+            db.execute(sql_query, match) as cursor,
+        ):
             return cast("Mapping[str, Any] | None", await cursor.fetchone())
 
     async def insert(
@@ -220,7 +282,7 @@ class DatabaseConnection:
             sql_query = f"INSERT INTO {table}({','.join(keys)})"
         sql_query += f" VALUES ({','.join(f':{x}' for x in keys)})"
         row_id = await self._db.execute_insert(sql_query, values)
-        await self._db.commit()
+        await self._commit_writes()
         assert row_id is not None  # for type checking
         assert isinstance(row_id[0], int)  # for type checking
         return row_id[0]
@@ -229,17 +291,35 @@ class DatabaseConnection:
         """Insert or replace data in given table."""
         return await self.insert(table=table, values=values, allow_replace=True)
 
+    async def insert_many(
+        self,
+        table: str,
+        rows: Iterable[dict[str, Any]],
+        allow_replace: bool = False,
+    ) -> None:
+        """Insert multiple rows in given table (using a single statement per set of columns)."""
+        for keys, values in self._group_rows(rows).items():
+            if allow_replace:
+                sql_query = f"INSERT OR REPLACE INTO {table}({','.join(keys)})"
+            else:
+                sql_query = f"INSERT INTO {table}({','.join(keys)})"
+            sql_query += f" VALUES ({','.join(f':{x}' for x in keys)})"
+            await self._db.executemany(sql_query, values)
+            await self._commit_writes(len(values))
+
     async def upsert(self, table: str, values: dict[str, Any]) -> None:
         """Upsert data in given table."""
-        # Filter out UNSET values so database defaults are used
-        values = {k: v for k, v in values.items() if v is not UNSET}
-        keys = tuple(values.keys())
-        sql_query = (
-            f"INSERT INTO {table}({','.join(keys)}) VALUES ({','.join(f':{x}' for x in keys)})"
-        )
-        sql_query += f" ON CONFLICT DO UPDATE SET {','.join(f'{x}=:{x}' for x in keys)}"
-        await self._db.execute(sql_query, values)
-        await self._db.commit()
+        await self.upsert_many(table, (values,))
+
+    async def upsert_many(self, table: str, rows: Iterable[dict[str, Any]]) -> None:
+        """Upsert multiple rows in given table (using a single statement per set of columns)."""
+        for keys, values in self._group_rows(rows).items():
+            sql_query = (
+                f"INSERT INTO {table}({','.join(keys)}) VALUES ({','.join(f':{x}' for x in keys)})"
+            )
+            sql_query += f" ON CONFLICT DO UPDATE SET {','.join(f'{x}=:{x}' for x in keys)}"
+            await self._db.executemany(sql_query, values)
+            await self._commit_writes(len(values))
 
     async def update(
         self,
@@ -253,12 +333,13 @@ class DatabaseConnection:
         keys = tuple(values.keys())
         sql_query = f"UPDATE {table} SET {','.join(f'{x}=:{x}' for x in keys)} WHERE "
         sql_query += " AND ".join(f"{x} = :{x}" for x in match)
-        await self.execute(sql_query, {**match, **values})
-        await self._db.commit()
         # return updated item
-        updated_item = await self.get_row(table, match)
+        sql_query += " RETURNING *"
+        async with self._db.execute(sql_query, {**match, **values}) as cursor:
+            updated_item = await cursor.fetchone()
+        await self._commit_writes()
         assert updated_item is not None  # for type checking
-        return updated_item
+        return cast("Mapping[str, Any]", updated_item)
 
     async def delete(
         self, table: str, match: dict[str, Any] | None = None, query: str | None = None
@@ -273,13 +354,13 @@ class DatabaseConnection:
         elif query:
             sql_query += query
         await self.execute(sql_query, match)
-        await self._db.commit()
+        await self._commit_writes()
 
     async def delete_where_query(self, table: str, query: str | None = None) -> None:
         """Delete data in given table using given where clausule."""
         sql_query = f"DELETE FROM {table} WHERE {query}"
         await self.execute(sql_query)
-        await self._db.commit()
+        await self._commit_writes()
 
     async def execute(self, query: str, values: dict[str, Any] | None = None) -> Any:
         """Execute command on the database."""
@@ -287,8 +368,82 @@ class DatabaseConnection:
 
     async def commit(self) -> None:
         """Commit the current transaction."""
+        self._pending_writes = 0
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
         return await self._db.commit()
 
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[None]:
+        """
+        Batch all writes within the context in (large) transactions.
+
+        Instead of committing every single write, writes are committed once
+        BATCH_COMMIT_SIZE rows have been written (or BATCH_COMMIT_INTERVAL has passed)
+        and when the (outermost) batch exits. Batches may be nested/used concurrently.
+        Only the writes of the task which opened the batch (and the tasks it starts) are
+        deferred, other writes are committed immediately (along with the pending writes).
+        Note that a batch is not atomic: pending writes are also committed on error.
+        """
+        token = self._batch_depth.set(self._batch_depth.get() + 1)
+        try:
+            yield
+        finally:
+            self._batch_depth.reset(token)
+            if not self._batch_depth.get() and self._pending_writes:
+                await self.commit()
+
+    @asynccontextmanager
+    async def _read_connection(self) -> AsyncGenerator[aiosqlite.Connection]:
+        """Return the connection to use for a read query."""
+        if (
+            self._read_pool is None
+            # reads within a batch must see the (uncommitted) writes of the batch
+            or self._batch_depth.get()
+            # writes outside of a batch are committed immediately, so an open transaction
+            # without pending (batch) writes is a (raw) sequence of statements which is
+            # not yet committed, e.g. a migration, so use the writer as well
+            or (self._db.in_transaction and not self._pending_writes)
+        ):
+            yield self._db
+            return
+        read_db = await self._read_pool.get()
+        try:
+            yield read_db
+        finally:
+            self._read_pool.put_nowait(read_db)
+
+    async def _commit_writes(self, count: int = 1) -> None:
+        """Commit written row(s), unless the write is part of a batch."""
+        if not self._batch_depth.get():
+            await self.commit()
+            return
+        self._pending_writes += count
+        if self._pending_writes >= BATCH_COMMIT_SIZE:
+            await self.commit()
+        elif self._flush_timer is None:
+            # commit the pending writes in time, even if no more writes follow
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                BATCH_COMMIT_INTERVAL, self._flush_pending_writes
+            )
+
+    def _flush_pending_writes(self) -> None:
+        """Commit the pending writes of the batch(es) (called by the flush timer)."""
+        self._flush_timer = None
+        if self._pending_writes and not (self._flush_task and not self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.commit())
+
+    @staticmethod
+    def _group_rows(rows: Iterable[dict[str, Any]]) -> dict[tuple[str, ...], list[dict[str, Any]]]:
+        """Group rows by their (set) columns, leaving out UNSET values."""
+        grouped_rows: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows:
+            # Filter out UNSET values so database defaults are used
+            values = {k: v for k, v in row.items() if v is not UNSET}
+            grouped_rows.setdefault(tuple(values.keys()), []).append(values)
+        return grouped_rows
+
     async def iter_items(
         self,
         table: str,
@@ -296,20 +451,25 @@ class DatabaseConnection:
     ) -> AsyncGenerator[Mapping[str, Any], None]:
         """Iterate all items within a table."""
         limit: int = 500
-        offset: int = 0
+        # seek on rowid (instead of using an offset) so each batch is a cheap index lookup
+        sql_query = f"SELECT rowid AS _rowid, * FROM {table} WHERE rowid > :_last_rowid"
+        if match is not None:
+            sql_query += " AND " + " AND ".join(f"{x} = :{x}" for x in match)
+        sql_query += f" ORDER BY rowid LIMIT {limit}"
+        params: dict[str, Any] = {**(match or {}), "_last_rowid": -1}
         while True:
-            next_items = await self.get_rows(
-                table=table,
-                match=match,
-                offset=offset,
-                limit=limit,
-            )
+            async with debug_query(sql_query, params), self._read_connection() as db:
+                next_items = cast(
+                    "list[Mapping[str, Any]]", await db.execute_fetchall(sql_query, params)
+                )
             for item in next_items:
-                yield item
+                row = dict(item)
+                del row["_rowid"]
+                yield row
             if len(next_items) < limit:
                 break
             await asyncio.sleep(0)  # yield to eventloop
-            offset += limit
+            params["_last_rowid"] = next_items[-1]["_rowid"]
 
     async def vacuum(self) -> None:
         """Run vacuum command on database."""
@@ -0,0 +1,189 @@
+"""Share (ffmpeg) encoders between the clients of a multi-client stream."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing, suppress
+from typing import TYPE_CHECKING
+
+from music_assistant_models.enums import ContentType
+
+from music_assistant.constants import MASS_LOGGER_NAME
+from music_assistant.helpers.ffmpeg import get_ffmpeg_stream
+from music_assistant.helpers.util import empty_queue
+
+if TYPE_CHECKING:
+    from music_assistant_models.media_items import AudioFormat
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.encoder_fanout")
+
+# formats which a client can start decoding from any (frame) in the stream,
+# after receiving the first chunk (with the stream header) of the encoder.
+# raw PCM is not included, as the chunks are not aligned to frame boundaries.
+LATE_JOIN_CONTENT_TYPES = (ContentType.FLAC, ContentType.MP3, ContentType.AAC)
+
+EncoderKey = tuple[ContentType, int, int, int, int | None, tuple[str, ...]]
+
+
+class EncoderFanOut:
+    """
+    Share (ffmpeg) encoders between the clients of a multi-client stream.
+
+    Clients which request the same output format with the same filter params are fed
+    by a single encoder. Each client has its own (bounded) queue and the encoder waits
+    for the slowest client, so backpressure is propagated to the source.
+    """
+
+    def __init__(
+        self,
+        subscribe_raw: Callable[[], AsyncGenerator[bytes, None]],
+        input_format: AudioFormat,
+    ) -> None:
+        """Initialize EncoderFanOut."""
+        self.subscribe_raw = subscribe_raw
+        self.input_format = input_format
+        self._encoders: dict[EncoderKey, SharedEncoder] = {}
+        self.encoders_started = 0
+        self.subscriptions = 0
+
+    @property
+    def encoders_saved(self) -> int:
+        """Return the number of encoder (processes) saved by sharing them."""
+        return self.subscriptions - self.encoders_started
+
+    @property
+    def encoder_count(self) -> int:
+        """Return the number of running encoders."""
+        return len(self._encoders)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of clients subscribed to the (running) encoders."""
+        return sum(len(x.subscribers) for x in self._encoders.values())
+
+    async def get_stream(
+        self, output_format: AudioFormat, filter_params: list[str] | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        """Get the (shared) encoded stream for the given output format and filter params."""
+        key: EncoderKey = (
+            output_format.content_type,
+            output_format.sample_rate,
+            output_format.bit_depth,
+            output_format.channels,
+            output_format.bit_rate,
+            tuple(filter_params or ()),
+        )
+        encoder = self._encoders.get(key)
+        if encoder is None or not encoder.joinable:
+            encoder = SharedEncoder(
+                self.subscribe_raw(), self.input_format, output_format, filter_params
+            )
+            self._encoders[key] = encoder
+            self.encoders_started += 1
+        self.subscriptions += 1
+        try:
+            # close the subscription (and remove its queue) before checking the subscribers
+            async with aclosing(encoder.subscribe()) as stream:
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            if not encoder.subscribers:
+                await encoder.stop()
+                if self._encoders.get(key) is encoder:
+                    del self._encoders[key]
+
+    def log_stats(self, name: str) -> None:
+        """Log the number of encoders that were saved (at debug level)."""
+        LOGGER.debug(
+            "%s: %s client stream(s) served by %s encoder(s), %s encoder process(es) saved",
+            name,
+            self.subscriptions,
+            self.encoders_started,
+            self.encoders_saved,
+        )
+
+
+class SharedEncoder:
+    """Single (ffmpeg) encoder which feeds one or more subscribers."""
+
+    def __init__(
+        self,
+        audio_source: AsyncGenerator[bytes, None],
+        input_format: AudioFormat,
+        output_format: AudioFormat,
+        filter_params: list[str] | None = None,
+    ) -> None:
+        """Initialize SharedEncoder."""
+        self.audio_source = audio_source
+        self.input_format = input_format
+        self.output_format = output_format
+        self.filter_params = filter_params
+        self.subscribers: list[asyncio.Queue[bytes]] = []
+        self._first_chunk: bytes | None = None
+        self._error: Exception | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def done(self) -> bool:
+        """Return if the encoder has finished."""
+        return self._task is not None and self._task.done()
+
+    @property
+    def joinable(self) -> bool:
+        """Return if a (new) subscriber can still join this encoder."""
+        if self.done:
+            return False
+        if self._first_chunk is None:
+            return True
+        return self.output_format.content_type in LATE_JOIN_CONTENT_TYPES
+
+    async def subscribe(self) -> AsyncGenerator[bytes, None]:
+        """Subscribe to the encoded stream."""
+        queue: asyncio.Queue[bytes] = asyncio.Queue(10)
+        if self._first_chunk is not None:
+            # late joiner: start with the first chunk, which contains the stream header
+            queue.put_nowait(self._first_chunk)
+        self.subscribers.append(queue)
+        # start the encoder as soon as the (first) client subscribes
+        if self._task is None:
+            self._task = asyncio.create_task(self._runner())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk == b"":
+                    break
+                yield chunk
+            if self._error:
+                raise self._error
+        finally:
+            with suppress(ValueError):
+                self.subscribers.remove(queue)
+            empty_queue(queue)
+
+    async def stop(self) -> None:
+        """Stop/cancel the encoder."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _runner(self) -> None:
+        """Run the encoder and feed the subscribers."""
+        try:
+            async for chunk in get_ffmpeg_stream(
+                audio_input=self.audio_source,
+                input_format=self.input_format,
+                output_format=self.output_format,
+                filter_params=self.filter_params,
+            ):
+                if self._first_chunk is None:
+                    self._first_chunk = chunk
+                await asyncio.gather(
+                    *[sub.put(chunk) for sub in self.subscribers], return_exceptions=True
+                )
+        except Exception as err:
+            self._error = err
+        # EOF: send empty chunk
+        await asyncio.gather(*[sub.put(b"") for sub in self.subscribers], return_exceptions=True)
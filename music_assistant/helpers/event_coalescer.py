@@ -0,0 +1,103 @@
+"""Coalescing of (bursts of) events before they are dispatched to the subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from music_assistant_models.enums import EventType
+
+if TYPE_CHECKING:
+    from music_assistant_models.event import MassEvent
+
+# window (in seconds) in which events of the given type are coalesced
+DEFAULT_COALESCE_WINDOWS: dict[EventType, float] = {
+    # players which are polled or report their state frequently
+    EventType.PLAYER_UPDATED: 0.2,
+    # (library) syncs add/update many items in a short time
+    EventType.MEDIA_ITEM_ADDED: 1.0,
+    EventType.MEDIA_ITEM_UPDATED: 1.0,
+}
+
+
+class EventCoalescer:
+    """
+    Coalesce (bursts of) events before they are dispatched to the subscribers.
+
+    The first event of a (coalesced) type is dispatched right away, which opens a window
+    for that type. Events of that type which are signaled within the window are collected,
+    where the last event for an object_id wins, and dispatched together (as one batch)
+    when the window closes. As long as events keep coming in, a new window is opened.
+
+    Before an event is dispatched, pending (coalesced) events for the same object are
+    dispatched first, so the order of the events for an object is preserved.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        dispatch: Callable[[list[MassEvent]], None],
+        windows: dict[EventType, float] | None = None,
+    ) -> None:
+        """Initialize EventCoalescer."""
+        self.loop = loop
+        self.dispatch = dispatch
+        self.windows = DEFAULT_COALESCE_WINDOWS if windows is None else windows
+        self._pending: dict[EventType, dict[str | None, MassEvent]] = {}
+        self._timers: dict[EventType, asyncio.TimerHandle] = {}
+
+    def signal(self, event: MassEvent) -> None:
+        """Signal an event, which is either dispatched directly or coalesced."""
+        window = self.windows.get(event.event)
+        if window is None:
+            if event.event == EventType.SHUTDOWN:
+                self.flush()
+            else:
+                self._flush_object(event.object_id, exclude=event.event)
+            self.dispatch([event])
+            return
+        if event.event not in self._timers:
+            # no (open) window: dispatch right away and open a window
+            self._flush_object(event.object_id, exclude=event.event)
+            self.dispatch([event])
+            self._timers[event.event] = self.loop.call_later(
+                window, self._on_window_closed, event.event
+            )
+            return
+        self._flush_object(event.object_id, exclude=event.event)
+        pending = self._pending.setdefault(event.event, {})
+        # last write wins (while keeping the position of the first event for the object)
+        pending[event.object_id] = event
+
+    def flush(self) -> None:
+        """Dispatch all pending events and close all windows."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        while self._pending:
+            _, pending = self._pending.popitem()
+            self.dispatch(list(pending.values()))
+
+    def _flush_object(self, object_id: str | None, exclude: EventType) -> None:
+        """Dispatch the pending events (of other types) for the given object."""
+        if object_id is None:
+            return
+        for event_type, pending in list(self._pending.items()):
+            if event_type == exclude or object_id not in pending:
+                continue
+            self.dispatch([pending.pop(object_id)])
+            if not pending:
+                del self._pending[event_type]
+
+    def _on_window_closed(self, event_type: EventType) -> None:
+        """Handle the end of a coalescing window."""
+        if not (pending := self._pending.pop(event_type, None)):
+            # no more events came in: close the window
+            self._timers.pop(event_type, None)
+            return
+        self.dispatch(list(pending.values()))
+        # keep the window open as long as events keep coming in
+        self._timers[event_type] = self.loop.call_later(
+            self.windows[event_type], self._on_window_closed, event_type
+        )
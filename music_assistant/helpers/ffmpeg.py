@@ -25,12 +25,22 @@ if TYPE_CHECKING:
 LOGGER = logging.getLogger("ffmpeg")
 MINIMAL_FFMPEG_VERSION = 6
 CACHE_ATTR_LIBSOXR_PRESENT: Final[str] = "libsoxr_present"
+# passthrough-mode (e.g. for the audio cache): copy the (undecoded) audio in a NUT container
+NUT_PASSTHROUGH_ARGS: Final[tuple[str, ...]] = (
+    "-vn",
+    "-dn",
+    "-sn",
+    "-acodec",
+    "copy",
+    "-f",
+    "nut",
+)
 
 
 class FFMpeg(AsyncProcess):
     """FFMpeg wrapped as AsyncProcess."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         audio_input: AsyncGenerator[bytes, None] | str | int,
         input_format: AudioFormat,
@@ -40,6 +50,7 @@ class FFMpeg(AsyncProcess):
         extra_input_args: list[str] | None = None,
         extra_output_args: list[str] | None = None,
         audio_output: str | int = "-",
+        passthrough_output: str | None = None,
         collect_log_history: bool = False,
         loglevel: str = "info",
     ) -> None:
@@ -53,6 +64,7 @@ class FFMpeg(AsyncProcess):
             output_path=audio_output if isinstance(audio_output, str) else "-",
             extra_input_args=extra_input_args or [],
             extra_output_args=extra_output_args or [],
+            passthrough_output=passthrough_output,
             loglevel=loglevel,
         )
         self.audio_input = audio_input
@@ -238,9 +250,15 @@ def get_ffmpeg_args(  # noqa: PLR0915
     output_path: str = "-",
     extra_input_args: list[str] | None = None,
     extra_output_args: list[str] | None = None,
+    passthrough_output: str | None = None,
     loglevel: str = "error",
 ) -> list[str]:
-    """Collect all args to send to the ffmpeg process."""
+    """
+    Collect all args to send to the ffmpeg process.
+
+    If a passthrough_output path is given, the (undecoded) input audio is also copied
+    to that path (as a second output), in a NUT container.
+    """
     if extra_args is None:
         extra_args = []
     if extra_input_args is None:
@@ -330,15 +348,7 @@ def get_ffmpeg_args(  # noqa: PLR0915
         ]
     elif output_format.content_type == ContentType.NUT:
         # passthrough-mode (for creating the cache) using NUT container
-        output_args = [
-            "-vn",
-            "-dn",
-            "-sn",
-            "-acodec",
-            "copy",
-            "-f",
-            "nut",
-        ]
+        output_args = list(NUT_PASSTHROUGH_ARGS)
     elif output_format.content_type == ContentType.AAC:
         output_args = ["-f", "adts", "-c:a", "aac", "-b:a", "256k"]
     elif output_format.content_type == ContentType.MP3:
@@ -372,6 +382,9 @@ def get_ffmpeg_args(  # noqa: PLR0915
     output_args += extra_output_args  # append the extra output args
     # append (final) output path at the end of the args
     output_args.append(output_path)
+    if passthrough_output:
+        # the (optional) second output with a copy of the first audio stream of the input
+        output_args += ["-map", "0:a:0", *NUT_PASSTHROUGH_ARGS, "-y", passthrough_output]
 
     # edge case: source file is not stereo - downmix to stereo
     if input_format.channels > 2 and output_format.channels == 2:
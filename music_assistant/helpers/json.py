@@ -45,8 +45,8 @@ def serialize_to_json(obj: Any) -> Any:
     return json_dumps(get_serializable_value(obj))
 
 
-def json_dumps(data: Any, indent: bool = False) -> str:
-    """Dump json string."""
+def json_dumpb(data: Any, indent: bool = False) -> bytes:
+    """Dump json as (utf-8 encoded) bytes."""
     # we use the passthrough dataclass option because we use mashumaro for that
     option = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_PASSTHROUGH_DATACLASS
     if indent:
@@ -55,7 +55,12 @@ def json_dumps(data: Any, indent: bool = False) -> str:
         data,
         default=get_serializable_value,
         option=option,
-    ).decode("utf-8")
+    )
+
+
+def json_dumps(data: Any, indent: bool = False) -> str:
+    """Dump json string."""
+    return json_dumpb(data, indent).decode("utf-8")
 
 
 async def async_json_dumps(data: Any, indent: bool = False) -> str:
@@ -0,0 +1,190 @@
+"""In-process processing of (bounded size) chunks of PCM audio using numpy.
+
+Spawning an ffmpeg process for simple operations on a few seconds of PCM audio (such as
+stripping silence or a crossfade between two tracks) costs more than the operation itself,
+especially on low-end (ARM) devices. The helpers in this module handle these operations
+in-process. Complex filters (e.g. time stretching or frequency sweeps) are still handled by ffmpeg.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from music_assistant_models.media_items import AudioFormat
+
+# numpy sample types for the supported (raw) PCM formats, keyed by the ffmpeg format name
+PCM_SAMPLE_TYPES: dict[str, str] = {
+    "s16le": "<i2",
+    "s16be": ">i2",
+    "s32le": "<i4",
+    "s32be": ">i4",
+    "f32le": "<f4",
+    "f32be": ">f4",
+    "f64le": "<f8",
+    "f64be": ">f8",
+}
+# 24 bits samples have no numpy equivalent and are handled separately
+PCM_24BIT_FORMATS = ("s24le", "s24be")
+
+
+def is_supported_format(pcm_format: AudioFormat) -> bool:
+    """Return if the (PCM) audio format can be processed in-process."""
+    fmt = pcm_format.content_type.value
+    return fmt in PCM_SAMPLE_TYPES or fmt in PCM_24BIT_FORMATS
+
+
+def pcm_to_array(audio_data: bytes, pcm_format: AudioFormat) -> npt.NDArray[np.float32]:
+    """
+    Convert raw PCM audio to a (frames, channels) array of float samples in the range -1..1.
+
+    Incomplete frames at the end of the audio are ignored.
+    """
+    fmt = pcm_format.content_type.value
+    channels = pcm_format.channels
+    if fmt in PCM_24BIT_FORMATS:
+        frame_count = len(audio_data) // (3 * channels)
+        raw = np.frombuffer(audio_data, dtype=np.uint8, count=frame_count * channels * 3)
+        raw = raw.reshape(-1, 3).astype(np.int32)
+        if fmt == "s24le":
+            samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        else:
+            samples = raw[:, 2] | (raw[:, 1] << 8) | (raw[:, 0] << 16)
+        # sign extend from 24 to 32 bits
+        samples = (samples << 8) >> 8
+        array = samples.astype(np.float32) / np.float32(2**23)
+    elif sample_type := PCM_SAMPLE_TYPES.get(fmt):
+        dtype = np.dtype(sample_type)
+        frame_count = len(audio_data) // (dtype.itemsize * channels)
+        samples = np.frombuffer(audio_data, dtype=dtype, count=frame_count * channels)
+        if dtype.kind == "f":
+            array = samples.astype(np.float32)
+        else:
+            array = samples.astype(np.float32) / np.float32(2 ** (dtype.itemsize * 8 - 1))
+    else:
+        msg = f"Unsupported PCM format: {fmt}"
+        raise ValueError(msg)
+    return array.reshape(-1, channels)
+
+
+def array_to_pcm(array: npt.NDArray[np.float32], pcm_format: AudioFormat) -> bytes:
+    """Convert a (frames, channels) array of float samples to raw PCM audio."""
+    fmt = pcm_format.content_type.value
+    if fmt in PCM_24BIT_FORMATS:
+        samples = np.round(np.clip(array, -1.0, 1.0 - 2**-23) * 2**23).astype("<i4").ravel()
+        # drop the most significant byte of each (little endian) 32 bits sample
+        raw = samples.view(np.uint8).reshape(-1, 4)[:, :3]
+        if fmt == "s24be":
+            raw = raw[:, ::-1]
+        return raw.tobytes()
+    if not (sample_type := PCM_SAMPLE_TYPES.get(fmt)):
+        msg = f"Unsupported PCM format: {fmt}"
+        raise ValueError(msg)
+    dtype = np.dtype(sample_type)
+    if dtype.kind == "f":
+        return array.astype(dtype).tobytes()
+    scale = 2 ** (dtype.itemsize * 8 - 1)
+    # clip to the valid range to prevent (integer) overflow
+    scaled: npt.NDArray[np.float32] = np.round(np.clip(array, -1.0, 1.0 - 1 / scale) * scale)
+    return scaled.astype(dtype).tobytes()
+
+
+def find_sound_start(
+    array: npt.NDArray[np.float32],
+    sample_rate: int,
+    threshold: float = 0.02,
+    window: float = 0.02,
+) -> int:
+    """
+    Return the index of the first frame of the (first) window which is not silent.
+
+    A window is silent if its RMS level (of the loudest channel) is below the threshold.
+    Returns the number of frames if the audio is silent.
+    """
+    window_size = max(1, int(sample_rate * window))
+    window_count = len(array) // window_size
+    if window_count:
+        windows = array[: window_count * window_size].reshape(window_count, window_size, -1)
+        levels = np.sqrt(np.mean(np.square(windows), axis=1)).max(axis=1)
+        if (loud := np.flatnonzero(levels >= threshold)).size:
+            return int(loud[0]) * window_size
+    # check the remaining (partial) window
+    remainder = array[window_count * window_size :]
+    if remainder.size and np.sqrt(np.mean(np.square(remainder), axis=0)).max() >= threshold:
+        return window_count * window_size
+    return len(array)
+
+
+def strip_silence(
+    audio_data: bytes,
+    pcm_format: AudioFormat,
+    reverse: bool = False,
+    skip: float = 0.2,
+    keep_silence: float = 0.1,
+    threshold: float = 0.02,
+) -> bytes:
+    """
+    Strip silence from the begin (or end if reverse is set) of PCM audio.
+
+    - skip: seconds of audio that are always removed first
+    - keep_silence: max seconds of silence that are kept before the sound starts
+    - threshold: (RMS) level below which audio is considered silent
+    """
+    array = pcm_to_array(audio_data, pcm_format)
+    if reverse:
+        array = array[::-1]
+    array = array[int(skip * pcm_format.sample_rate) :]
+    start = find_sound_start(array, pcm_format.sample_rate, threshold)
+    array = array[max(0, start - int(keep_silence * pcm_format.sample_rate)) :]
+    if reverse:
+        array = array[::-1]
+    return array_to_pcm(array, pcm_format)
+
+
+def crossfade(fade_out_part: bytes, fade_in_part: bytes, pcm_format: AudioFormat) -> bytes:
+    """
+    Mix (crossfade) two parts of PCM audio.
+
+    Like ffmpeg's acrossfade (with its default linear curves), the tail of the fade out
+    part overlaps the head of the fade in part (by the length of the shortest part)
+    and the rest of both parts is kept.
+    """
+    fade_out = pcm_to_array(fade_out_part, pcm_format)
+    fade_in = pcm_to_array(fade_in_part, pcm_format)
+    length = min(len(fade_out), len(fade_in))
+    fade_in_gain = np.linspace(0.0, 1.0, length, dtype=np.float32)[:, np.newaxis]
+    mixed = (
+        fade_out[len(fade_out) - length :] * fade_in_gain[::-1] + fade_in[:length] * fade_in_gain
+    )
+    return array_to_pcm(
+        np.concatenate([fade_out[: len(fade_out) - length], mixed, fade_in[length:]]),
+        pcm_format,
+    )
+
+
+def convert_format(
+    audio_data: bytes, input_format: AudioFormat, output_format: AudioFormat
+) -> bytes:
+    """
+    Convert PCM audio to another sample type and/or channel count.
+
+    The sample rate can not be changed (use ffmpeg to resample the audio).
+    Mono audio is duplicated to all channels, multichannel audio is downmixed to mono
+    by averaging the channels.
+    """
+    if input_format.sample_rate != output_format.sample_rate:
+        msg = "Sample rate conversion is not supported"
+        raise ValueError(msg)
+    array = pcm_to_array(audio_data, input_format)
+    if input_format.channels != output_format.channels:
+        if input_format.channels == 1:
+            array = np.repeat(array, output_format.channels, axis=1)
+        elif output_format.channels == 1:
+            array = array.mean(axis=1, keepdims=True)
+        else:
+            msg = "Conversion between multichannel layouts is not supported"
+            raise ValueError(msg)
+    return array_to_pcm(array, output_format)
@@ -0,0 +1,486 @@
+"""Helpers to store, diff and persist the items of a PlayerQueue."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, SupportsIndex, cast, overload
+
+from music_assistant.constants import DB_TABLE_QUEUE_ITEMS_LOG, MASS_LOGGER_NAME
+from music_assistant.helpers.json import json_dumps, json_loads
+
+if TYPE_CHECKING:
+    from music_assistant_models.queue_item import QueueItem
+
+    from music_assistant import MusicAssistant
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.queue_items")
+
+# the (minimum) number of logged items (and changes) after which the log of a queue is compacted
+COMPACT_MIN_SIZE = 500
+FORCE_COMPACT_SIZE = 2**62
+# the max number of versions (and inserted/replaced items) kept in the history of a queue
+HISTORY_MAX_VERSIONS = 100
+HISTORY_MAX_ITEMS = 10000
+
+
+class QueueItems(list["QueueItem"]):
+    """
+    List of QueueItems with O(1) lookup of the index of a queue_item_id.
+
+    The id to index map is kept in sync with the list by all (in-place) list operations.
+    Appending to (and popping from) the end of the list updates the map directly,
+    other mutations (insert, delete, move or reorder) only mark the map as stale from the
+    (lowest) affected position, which is (re)indexed at the next lookup. This keeps both
+    the mutations and the (many) lookups in between cheap.
+
+    Note that slicing, copying and concatenating return a plain list.
+    """
+
+    def __init__(self, items: Iterable[QueueItem] = ()) -> None:
+        """Initialize QueueItems."""
+        super().__init__(items)
+        self._index: dict[str, int] = {}
+        # the positions below this index are (known to be) correctly indexed
+        self._indexed_until = 0
+
+    def index_of(self, queue_item_id: str) -> int | None:
+        """Return the index of the item with the given queue_item_id (or None if not found)."""
+        if (index := self._lookup(queue_item_id)) is not None:
+            return index
+        if self._indexed_until < len(self):
+            # (re)index the stale part of the list
+            start = self._indexed_until
+            self._index.update(
+                zip([x.queue_item_id for x in self[start:]], range(start, len(self)), strict=True)
+            )
+            self._indexed_until = len(self)
+            return self._lookup(queue_item_id)
+        return None
+
+    def get_by_id(self, queue_item_id: str) -> QueueItem | None:
+        """Return the item with the given queue_item_id (or None if not found)."""
+        if (index := self.index_of(queue_item_id)) is None:
+            return None
+        return list.__getitem__(self, index)
+
+    def append(self, item: QueueItem) -> None:
+        """Append item to the end of the list."""
+        if self._indexed_until == len(self):
+            self._index[item.queue_item_id] = len(self)
+            self._indexed_until += 1
+        super().append(item)
+
+    def extend(self, items: Iterable[QueueItem]) -> None:
+        """Extend the list with the given items."""
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items: Iterable[QueueItem]) -> QueueItems:  # type: ignore[override,misc]
+        """Extend the list with the given items."""
+        self.extend(items)
+        return self
+
+    def insert(self, index: SupportsIndex, item: QueueItem) -> None:
+        """Insert item before index."""
+        super().insert(index, item)
+        self._invalidate_from(max(0, min(self._position(index, len(self) - 1), len(self) - 1)))
+
+    def pop(self, index: SupportsIndex = -1) -> QueueItem:
+        """Remove and return item at index (default last)."""
+        position = self._position(index, len(self))
+        item = super().pop(index)
+        self._forget(item, position)
+        return item
+
+    def remove(self, item: QueueItem) -> None:
+        """Remove the first occurrence of item."""
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        """Remove all items from the list."""
+        super().clear()
+        self._invalidate_from(0)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort the list in place."""
+        super().sort(*args, **kwargs)
+        self._invalidate_from(0)
+
+    def reverse(self) -> None:
+        """Reverse the list in place."""
+        super().reverse()
+        self._invalidate_from(0)
+
+    def __imul__(self, value: SupportsIndex) -> QueueItems:
+        """Repeat the list in place."""
+        super().__imul__(value)
+        self._invalidate_from(0)
+        return self
+
+    @overload
+    def __setitem__(self, key: SupportsIndex, value: QueueItem) -> None: ...
+
+    @overload
+    def __setitem__(self, key: slice, value: Iterable[QueueItem]) -> None: ...
+
+    def __setitem__(self, key: SupportsIndex | slice, value: Any) -> None:
+        """Replace item(s) at index or slice."""
+        if isinstance(key, slice):
+            super().__setitem__(key, value)
+            self._invalidate_from(0)
+            return
+        position = self._position(key, len(self))
+        old_item = list.__getitem__(self, key)
+        super().__setitem__(key, cast("QueueItem", value))
+        # replacing an item does not shift the other items
+        if self._index.get(old_item.queue_item_id) == position:
+            del self._index[old_item.queue_item_id]
+        if position < self._indexed_until:
+            self._index[value.queue_item_id] = position
+
+    def __delitem__(self, key: SupportsIndex | slice) -> None:
+        """Delete item(s) at index or slice."""
+        if isinstance(key, slice):
+            super().__delitem__(key)
+            self._invalidate_from(0)
+            return
+        self.pop(key)
+
+    def _lookup(self, queue_item_id: str) -> int | None:
+        """Return the (verified) index of queue_item_id from the index map."""
+        index = self._index.get(queue_item_id)
+        if (
+            index is not None
+            and index < len(self)
+            and list.__getitem__(self, index).queue_item_id == queue_item_id
+        ):
+            return index
+        return None
+
+    def _forget(self, item: QueueItem, index: int) -> None:
+        """Handle removal of item from position index."""
+        if self._index.get(item.queue_item_id) == index:
+            del self._index[item.queue_item_id]
+        self._invalidate_from(index)
+
+    def _invalidate_from(self, index: int) -> None:
+        """Mark the index map as stale from the given position."""
+        if index == 0:
+            self._index.clear()
+        self._indexed_until = min(self._indexed_until, index)
+
+    @staticmethod
+    def _position(index: SupportsIndex, length: int) -> int:
+        """Return the position for a (possibly negative) index."""
+        position = index.__index__()
+        return position + length if position < 0 else position
+
+
+@dataclass
+class QueueItemsChange:
+    """
+    A (range based) change to a list of queue items.
+
+    - insert: count items are inserted at index
+    - remove: count items are removed at index
+    - move: count items at index are moved, so they start at index 'to' in the result
+    - replace: count (changed) items at index are replaced
+
+    The items are set for insert and replace changes (when known).
+    """
+
+    op: str
+    index: int
+    count: int
+    to: int | None = None
+    items: list[QueueItem] | None = None
+
+    def to_dict(self, include_items: bool = True) -> dict[str, Any]:
+        """Return the dict representation of the change."""
+        result: dict[str, Any] = {"op": self.op, "index": self.index, "count": self.count}
+        if self.to is not None:
+            result["to"] = self.to
+        if include_items and self.items is not None:
+            result["items"] = [x.to_dict() for x in self.items]
+        return result
+
+
+def diff_queue_items(old_ids: Sequence[str], new_ids: Sequence[str]) -> list[QueueItemsChange]:
+    """
+    Return the changes which turn the old list of queue_item_ids into the new one.
+
+    The changes are minimal for the typical queue edits (add, insert, delete or move of
+    a range of items), any other edit results in a remove and insert of the changed range.
+    """
+    max_prefix = min(len(old_ids), len(new_ids))
+    start = 0
+    while start < max_prefix and old_ids[start] == new_ids[start]:
+        start += 1
+    end = 0
+    while end < max_prefix - start and old_ids[-1 - end] == new_ids[-1 - end]:
+        end += 1
+    old_mid = old_ids[start : len(old_ids) - end]
+    new_mid = new_ids[start : len(new_ids) - end]
+    if not old_mid and not new_mid:
+        return []
+    if not old_mid:
+        return [QueueItemsChange("insert", start, len(new_mid))]
+    if not new_mid:
+        return [QueueItemsChange("remove", start, len(old_mid))]
+    if len(old_mid) == len(new_mid) and new_mid[0] in old_mid:
+        # a moved range of items is a rotation of the changed range
+        split = list(old_mid).index(new_mid[0])
+        if list(old_mid[split:]) + list(old_mid[:split]) == list(new_mid):
+            length = len(old_mid)
+            if split <= length - split:
+                # move the (shortest) head of the range to the end
+                return [QueueItemsChange("move", start, split, start + length - split)]
+            return [QueueItemsChange("move", start + split, length - split, start)]
+    return [
+        QueueItemsChange("remove", start, len(old_mid)),
+        QueueItemsChange("insert", start, len(new_mid)),
+    ]
+
+
+def apply_queue_items_change(items: list[Any], change: dict[str, Any]) -> list[Any]:
+    """Apply a (serialized) change to a list of (serialized) queue items."""
+    op = change["op"]
+    index = change.get("index", 0)
+    if op == "reset":
+        return list(change["items"])
+    if op == "insert":
+        items[index:index] = change["items"]
+    elif op == "replace":
+        items[index : index + len(change["items"])] = change["items"]
+    elif op == "remove":
+        del items[index : index + change["count"]]
+    elif op == "move":
+        moved = items[index : index + change["count"]]
+        del items[index : index + change["count"]]
+        items[change["to"] : change["to"]] = moved
+    else:
+        msg = f"Unknown queue items change: {op}"
+        raise ValueError(msg)
+    return items
+
+
+class QueueItemsHistory:
+    """
+    Versioned history of the (recent) changes to the items of a queue.
+
+    Every change (set) increases the version, so clients which know the items
+    of a version only need to fetch the changes since that version.
+    The version starts at the (epoch) time in milliseconds, which keeps
+    it increasing across restarts of the server.
+    """
+
+    def __init__(self) -> None:
+        """Initialize QueueItemsHistory."""
+        self.version = int(time.time() * 1000)
+        self._history: deque[tuple[int, list[QueueItemsChange]]] = deque()
+        self._item_count = 0
+
+    @property
+    def latest_changes(self) -> list[QueueItemsChange]:
+        """Return the changes of the current version."""
+        if self._history and self._history[-1][0] == self.version:
+            return self._history[-1][1]
+        return []
+
+    def add(self, changes: list[QueueItemsChange]) -> int:
+        """Add the changes (as a new version) to the history, returns the new version."""
+        self.version += 1
+        self._history.append((self.version, changes))
+        self._item_count += sum(len(x.items or ()) for x in changes)
+        while len(self._history) > 1 and (
+            len(self._history) > HISTORY_MAX_VERSIONS or self._item_count > HISTORY_MAX_ITEMS
+        ):
+            _, dropped = self._history.popleft()
+            self._item_count -= sum(len(x.items or ()) for x in dropped)
+        return self.version
+
+    def get_changes(self, since_version: int) -> list[QueueItemsChange] | None:
+        """
+        Return the changes since the given version (in order).
+
+        Returns None if the changes since that version are no longer (or not) available.
+        """
+        if since_version == self.version:
+            return []
+        if not self._history or not self._history[0][0] - 1 <= since_version < self.version:
+            return None
+        return [
+            change
+            for version, changes in self._history
+            if version > since_version
+            for change in changes
+        ]
+
+
+class QueueItemsStore:
+    """
+    Incremental persistence of the items of the PlayerQueues.
+
+    Instead of (re)writing all items of a queue on every change, the changes are
+    appended to a log (table in the cache database), so the cost of a change is
+    proportional to the size of the change. The log of a queue is compacted into a
+    single reset entry (with all items) once it grows larger than the queue itself.
+    The items are restored by replaying the log from the last reset entry.
+    """
+
+    def __init__(self, mass: MusicAssistant) -> None:
+        """Initialize QueueItemsStore."""
+        self.mass = mass
+        # the (persisted) queue_item_ids per queue, to diff the changes against
+        self._persisted_ids: dict[str, list[str]] = {}
+        # the number of (logged) items and changes since the last reset, per queue
+        self._log_size: dict[str, int] = {}
+        self._pending: deque[tuple[str, list[str] | None]] = deque()
+        self._writer: asyncio.Task[None] | None = None
+
+    async def load(self, queue_id: str) -> list[dict[str, Any]] | None:
+        """Restore the (serialized) items of a queue, returns None if nothing was stored."""
+        await self.flush()
+        assert self.mass.cache.database is not None
+        rows = await self.mass.cache.database.get_rows(
+            DB_TABLE_QUEUE_ITEMS_LOG, {"queue_id": queue_id}, order_by="id", limit=0
+        )
+        if not rows:
+            return None
+        items: list[Any] = []
+        log_size = 0
+        for row in rows:
+            change = json_loads(row["data"])
+            items = apply_queue_items_change(items, change)
+            log_size = 0 if change["op"] == "reset" else log_size + 1
+            log_size += len(change.get("items", ()))
+        self._persisted_ids[queue_id] = [x["queue_item_id"] for x in items]
+        self._log_size[queue_id] = log_size
+        return cast("list[dict[str, Any]]", items)
+
+    def update(
+        self,
+        queue_id: str,
+        queue_items: Sequence[QueueItem],
+        changed_items: Iterable[QueueItem] = (),
+    ) -> list[QueueItemsChange]:
+        """
+        Persist the changes to the items of a queue and return them.
+
+        Changes to (the attributes of) existing items are not detected,
+        these items must be passed explicitly as changed_items.
+        """
+        new_ids = [x.queue_item_id for x in queue_items]
+        changes = diff_queue_items(self._persisted_ids.get(queue_id, []), new_ids)
+        self._persisted_ids[queue_id] = new_ids
+        for change in changes:
+            if change.op == "insert":
+                change.items = list(queue_items[change.index : change.index + change.count])
+        for item in changed_items:
+            if isinstance(queue_items, QueueItems):
+                index = queue_items.index_of(item.queue_item_id)
+            else:
+                index = next((i for i, x in enumerate(queue_items) if x is item), None)
+            if index is not None:
+                changes.append(QueueItemsChange("replace", index, 1, items=[item]))
+        if not changes:
+            return changes
+        entries: list[dict[str, Any]] = []
+        for change in changes:
+            entry: dict[str, Any] = {"op": change.op, "index": change.index}
+            if change.items is not None:
+                entry["items"] = [x.to_cache() for x in change.items]
+            else:
+                entry["count"] = change.count
+            if change.to is not None:
+                entry["to"] = change.to
+            entries.append(entry)
+        log_size = self._log_size.get(queue_id, 0)
+        log_size += sum(1 + len(x.get("items", ())) for x in entries)
+        if log_size > max(COMPACT_MIN_SIZE, len(queue_items)):
+            # compact the log: replace it by a single reset entry
+            entries = [{"op": "reset", "items": [x.to_cache() for x in queue_items]}]
+            log_size = len(queue_items)
+            self._pending.append((queue_id, None))
+        self._log_size[queue_id] = log_size
+        self._pending.extend((queue_id, [json_dumps(x)]) for x in entries)
+        self._start_writer()
+        return changes
+
+    def reset(self, queue_id: str, queue_items: Sequence[QueueItem]) -> None:
+        """(Re)write all items of a queue, e.g. after a migration."""
+        self._persisted_ids[queue_id] = [x.queue_item_id for x in queue_items]
+        self._log_size[queue_id] = len(queue_items)
+        self._pending.append((queue_id, None))
+        entry = {"op": "reset", "items": [x.to_cache() for x in queue_items]}
+        self._pending.append((queue_id, [json_dumps(entry)]))
+        self._start_writer()
+
+    def delete(self, queue_id: str) -> None:
+        """Delete the stored items of a queue."""
+        self.unload(queue_id)
+        self._pending.append((queue_id, None))
+        self._pending.append((queue_id, []))
+        self._start_writer()
+
+    def unload(self, queue_id: str) -> None:
+        """Forget the (in memory) state of a queue, e.g. when its player is unloaded."""
+        self._persisted_ids.pop(queue_id, None)
+        self._log_size.pop(queue_id, None)
+
+    async def flush(self) -> None:
+        """Wait until all pending changes are written."""
+        if self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    def _start_writer(self) -> None:
+        """Start the writer task (if not already running)."""
+        if self._writer is None:
+            self._writer = self.mass.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        """Write the pending changes (in order) to the database."""
+        database = self.mass.cache.database
+        assert database is not None
+        # a pending entry without data marks the start of a new log for the queue:
+        # the previous entries are deleted once the first entry of the new log is written
+        truncate: set[str] = set()
+        try:
+            while self._pending:
+                queue_id, data = self._pending.popleft()
+                if data is None:
+                    truncate.add(queue_id)
+                    continue
+                try:
+                    async with database.batch():
+                        for entry in data:
+                            row_id = await database.insert(
+                                DB_TABLE_QUEUE_ITEMS_LOG, {"queue_id": queue_id, "data": entry}
+                            )
+                            if queue_id in truncate:
+                                await database.execute(
+                                    f"DELETE FROM {DB_TABLE_QUEUE_ITEMS_LOG} "
+                                    "WHERE queue_id = :queue_id AND id < :row_id",
+                                    {"queue_id": queue_id, "row_id": row_id},
+                                )
+                                truncate.discard(queue_id)
+                        if not data and queue_id in truncate:
+                            await database.delete(DB_TABLE_QUEUE_ITEMS_LOG, {"queue_id": queue_id})
+                            truncate.discard(queue_id)
+                except Exception as err:
+                    # the log is incomplete: force a reset (compaction) at the next update
+                    if queue_id in self._log_size:
+                        self._log_size[queue_id] = FORCE_COMPACT_SIZE
+                    LOGGER.warning(
+                        "Failed to persist the items of queue %s: %s",
+                        queue_id,
+                        str(err),
+                        exc_info=err if LOGGER.isEnabledFor(logging.DEBUG) else None,
+                    )
+        finally:
+            self._writer = None
@@ -52,6 +52,7 @@ from music_assistant.controllers.webserver import WebserverController
 from music_assistant.controllers.webserver.helpers.auth_middleware import get_current_user
 from music_assistant.helpers.aiohttp_client import create_clientsession
 from music_assistant.helpers.api import APICommandHandler, api_command
+from music_assistant.helpers.event_coalescer import EventCoalescer
 from music_assistant.helpers.images import get_icon_string
 from music_assistant.helpers.util import (
     TaskManager,
@@ -127,6 +128,7 @@ class MusicAssistant:
         # we dynamically register command handlers which can be consumed by the apis
         self.command_handlers: dict[str, APICommandHandler] = {}
         self._subscribers: set[EventSubscriptionType] = set()
+        self._event_coalescer: EventCoalescer | None = None
         self._provider_manifests: dict[str, ProviderManifest] = {}
         self._providers: dict[str, ProviderInstanceType] = {}
         self._tracked_tasks: dict[str, asyncio.Task[Any]] = {}
@@ -145,6 +147,7 @@ class MusicAssistant:
         """Start running the Music Assistant server."""
         self.loop = asyncio.get_running_loop()
         self.loop_thread_id = getattr(self.loop, "_thread_id")  # noqa: B009
+        self._event_coalescer = EventCoalescer(self.loop, self._dispatch_events)
         self.running_as_hass_addon = await is_hass_supervisor()
         self.version = await get_package_version("music_assistant") or "0.0.0"
         # setup config controller first and fetch important config values
@@ -427,19 +430,53 @@ class MusicAssistant:
             LOGGER.getChild("event").log(VERBOSE_LOG_LEVEL, "%s %s", event.value, object_id or "")
 
         event_obj = MassEvent(event=event, object_id=object_id, data=data)
-        for cb_func, event_filter, id_filter in self._subscribers:
-            if not (event_filter is None or event in event_filter):
-                continue
-            if not (id_filter is None or object_id in id_filter):
+        if self._event_coalescer is None:
+            self._dispatch_events([event_obj])
+        else:
+            # bursts of (some types of) events are coalesced before they are dispatched
+            self._event_coalescer.signal(event_obj)
+
+    def _dispatch_events(self, events: list[MassEvent]) -> None:
+        """Dispatch (a batch of) events to the subscribers."""
+        for cb_func, event_filter, id_filter in list(self._subscribers):
+            sub_events = [
+                x
+                for x in events
+                if (event_filter is None or x.event in event_filter)
+                and (id_filter is None or x.object_id in id_filter)
+            ]
+            if not sub_events:
                 continue
             if asyncio.iscoroutinefunction(cb_func):
                 if TYPE_CHECKING:
                     cb_func = cast("Callable[[MassEvent], Coroutine[Any, Any, None]]", cb_func)
-                self.create_task(cb_func, event_obj)
+                if len(sub_events) == 1:
+                    self.create_task(cb_func, sub_events[0])
+                else:
+                    # a single task per subscriber for the whole batch
+                    self.create_task(self._handle_events_async, cb_func, sub_events)
             else:
                 if TYPE_CHECKING:
                     cb_func = cast("Callable[[MassEvent], None]", cb_func)
-                self.loop.call_soon_threadsafe(cb_func, event_obj)
+                for event_obj in sub_events:
+                    self.loop.call_soon_threadsafe(cb_func, event_obj)
+
+    async def _handle_events_async(
+        self,
+        cb_func: Callable[[MassEvent], Coroutine[Any, Any, None]],
+        events: list[MassEvent],
+    ) -> None:
+        """Handle a batch of events with a coroutine subscriber (one by one)."""
+        for event_obj in events:
+            try:
+                await cb_func(event_obj)
+            except Exception as err:
+                LOGGER.warning(
+                    "Error in event handler %s: %s",
+                    cb_func,
+                    str(err),
+                    exc_info=err if LOGGER.isEnabledFor(logging.DEBUG) else None,
+                )
 
     def subscribe(
         self,
@@ -716,6 +753,8 @@ class MusicAssistant:
                 )
             finally:
                 self._providers.pop(instance_id, None)
+                # the config entries of the provider (and its players) may change on reload
+                self.config.invalidate_config_snapshots()
                 await self._update_available_providers_cache()
                 self.signal_event(EventType.PROVIDERS_UPDATED, data=self.get_providers())
 
@@ -736,6 +775,7 @@ class MusicAssistant:
         for cls in (
             self,
             self.config,
+            self.cache,
             self.metadata,
             self.music,
             self.players,
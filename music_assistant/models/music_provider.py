@@ -65,6 +65,16 @@ class MusicProvider(Provider):
         """
         return True
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """
+        Return the number of seconds the audio of this provider may be kept in the audio cache.
+
+        Return 0 if the audio of this provider may not be cached at all (e.g. due to DRM or
+        licensing restrictions). Caching is opt-in: by default, the audio is not cached.
+        """
+        return 0
+
     async def loaded_in_mass(self) -> None:
         """Call after the provider has been loaded."""
 
@@ -681,62 +691,67 @@ class MusicProvider(Provider):
         if not self.library_supported(media_type):
             raise UnsupportedFeaturedException("Library sync not supported for this media type")
 
-        if media_type == MediaType.ARTIST:
-            cur_db_ids = await self._sync_library_artists()
-        elif media_type == MediaType.ALBUM:
-            cur_db_ids = await self._sync_library_albums()
-        elif media_type == MediaType.TRACK:
-            cur_db_ids = await self._sync_library_tracks()
-        elif media_type == MediaType.PLAYLIST:
-            cur_db_ids = await self._sync_library_playlists()
-        elif media_type == MediaType.PODCAST:
-            cur_db_ids = await self._sync_library_podcasts()
-        elif media_type == MediaType.RADIO:
-            cur_db_ids = await self._sync_library_radios()
-        elif media_type == MediaType.AUDIOBOOK:
-            cur_db_ids = await self._sync_library_audiobooks()
-        else:
-            # this should not happen but catch it anyways
-            raise UnsupportedFeaturedException(f"Unexpected media type to sync: {media_type}")
-
-        # process deletions (= no longer in library)
-        prev_library_items: list[int] | None
-        controller = self.mass.music.get_controller(media_type)
-        if prev_library_items := await self.mass.cache.get(
-            key=media_type.value,
-            provider=self.instance_id,
-            category=CACHE_CATEGORY_PREV_LIBRARY_IDS,
-        ):
-            for db_id in prev_library_items:
-                if db_id not in cur_db_ids:
-                    try:
-                        library_item = await controller.get_library_item(db_id)
-                    except MediaNotFoundError:
-                        # edge case: the item is (already) removed from MA library as well
-                        continue
-                    # check if we have other provider-mappings (marked as in-library)
-                    remaining_providers_in_library = {
-                        x.provider_instance
-                        for x in library_item.provider_mappings
-                        if x.provider_instance != self.instance_id and x.in_library
-                    }
-                    if not remaining_providers_in_library and library_item.favorite:
-                        # unmark as favorite since no providers have it in library anymore
-                        await controller.set_favorite(db_id, False)
-                    # unmark this provider mapping as in_library = False
-                    # we keep it in the library database so we can keep the metadata for future use
-                    for prov_map in library_item.provider_mappings:
-                        if prov_map.provider_instance == self.instance_id:
-                            prov_map.in_library = False
-                    await controller.set_provider_mappings(db_id, library_item.provider_mappings)
-                    await asyncio.sleep(0)  # yield to eventloop
-        # store current list of id's in cache so we can track changes
-        await self.mass.cache.set(
-            key=media_type.value,
-            data=list(cur_db_ids),
-            provider=self.instance_id,
-            category=CACHE_CATEGORY_PREV_LIBRARY_IDS,
-        )
+        # commit the (many) library writes of the sync in large batches
+        async with self.mass.music.database.batch():
+            if media_type == MediaType.ARTIST:
+                cur_db_ids = await self._sync_library_artists()
+            elif media_type == MediaType.ALBUM:
+                cur_db_ids = await self._sync_library_albums()
+            elif media_type == MediaType.TRACK:
+                cur_db_ids = await self._sync_library_tracks()
+            elif media_type == MediaType.PLAYLIST:
+                cur_db_ids = await self._sync_library_playlists()
+            elif media_type == MediaType.PODCAST:
+                cur_db_ids = await self._sync_library_podcasts()
+            elif media_type == MediaType.RADIO:
+                cur_db_ids = await self._sync_library_radios()
+            elif media_type == MediaType.AUDIOBOOK:
+                cur_db_ids = await self._sync_library_audiobooks()
+            else:
+                # this should not happen but catch it anyways
+                raise UnsupportedFeaturedException(f"Unexpected media type to sync: {media_type}")
+
+            # process deletions (= no longer in library)
+            prev_library_items: list[int] | None
+            controller = self.mass.music.get_controller(media_type)
+            if prev_library_items := await self.mass.cache.get(
+                key=media_type.value,
+                provider=self.instance_id,
+                category=CACHE_CATEGORY_PREV_LIBRARY_IDS,
+            ):
+                for db_id in prev_library_items:
+                    if db_id not in cur_db_ids:
+                        try:
+                            library_item = await controller.get_library_item(db_id)
+                        except MediaNotFoundError:
+                            # edge case: the item is (already) removed from MA library as well
+                            continue
+                        # check if we have other provider-mappings (marked as in-library)
+                        remaining_providers_in_library = {
+                            x.provider_instance
+                            for x in library_item.provider_mappings
+                            if x.provider_instance != self.instance_id and x.in_library
+                        }
+                        if not remaining_providers_in_library and library_item.favorite:
+                            # unmark as favorite since no providers have it in library anymore
+                            await controller.set_favorite(db_id, False)
+                        # unmark this provider mapping as in_library = False
+                        # we keep it in the library database
+                        # so we can keep the metadata for future use
+                        for prov_map in library_item.provider_mappings:
+                            if prov_map.provider_instance == self.instance_id:
+                                prov_map.in_library = False
+                        await controller.set_provider_mappings(
+                            db_id, library_item.provider_mappings
+                        )
+                        await asyncio.sleep(0)  # yield to eventloop
+            # store current list of id's in cache so we can track changes
+            await self.mass.cache.set(
+                key=media_type.value,
+                data=list(cur_db_ids),
+                provider=self.instance_id,
+                category=CACHE_CATEGORY_PREV_LIBRARY_IDS,
+            )
 
     async def _sync_library_artists(self) -> set[int]:
         """Sync Library Artists to Music Assistant library."""
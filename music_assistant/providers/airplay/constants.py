@@ -43,6 +43,12 @@ AIRPLAY_PROCESS_SPAWN_TIME_MS: Final[int] = (
 AIRPLAY_OUTPUT_BUFFER_DURATION_MS: Final[int] = (
     2000  # Read ahead buffer for cliraop. Output buffer duration for cliap2.
 )
+AIRPLAY_CLIENT_BUFFER_SECONDS: Final[int] = (
+    8  # Max seconds a client may fall behind the others (must exceed the preload seconds)
+)
+AIRPLAY_CLIENT_MAX_RESYNCS: Final[int] = (
+    2  # Max number of resyncs of a lagging client before it is removed from the session
+)
 AIRPLAY2_MIN_LOG_LEVEL: Final[int] = 3  # Min loglevel to ensure stderr output contains what we need
 AIRPLAY2_CONNECT_TIME_MS: Final[int] = 2500  # Time in ms to allow AirPlay2 device to connect
 CONF_AP_CREDENTIALS: Final[str] = "ap_credentials"
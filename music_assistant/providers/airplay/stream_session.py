@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import time
+from collections import deque
 from collections.abc import AsyncGenerator
 from contextlib import suppress
 from typing import TYPE_CHECKING
@@ -16,6 +17,8 @@ from music_assistant.providers.airplay.helpers import ntp_to_unix_time, unix_tim
 
 from .constants import (
     AIRPLAY2_CONNECT_TIME_MS,
+    AIRPLAY_CLIENT_BUFFER_SECONDS,
+    AIRPLAY_CLIENT_MAX_RESYNCS,
     AIRPLAY_OUTPUT_BUFFER_DURATION_MS,
     AIRPLAY_PRELOAD_SECONDS,
     AIRPLAY_PROCESS_SPAWN_TIME_MS,
@@ -33,6 +36,55 @@ if TYPE_CHECKING:
     from .provider import AirPlayProvider
 
 
+class ClientAudioBuffer:
+    """Bounded buffer of (timestamped) audio chunks for a single client of a stream session."""
+
+    def __init__(self, max_seconds: float) -> None:
+        """Initialize ClientAudioBuffer."""
+        self.max_seconds = max_seconds
+        # (position in the session stream in seconds, duration in seconds, chunk or None for EOF)
+        self._chunks: deque[tuple[float, float, bytes | None]] = deque()
+        self._seconds = 0.0
+        self._data_available = asyncio.Event()
+
+    @property
+    def seconds(self) -> float:
+        """Return the number of seconds of audio in the buffer."""
+        return self._seconds
+
+    @property
+    def position(self) -> float | None:
+        """Return the (session stream) position of the oldest chunk in the buffer."""
+        return self._chunks[0][0] if self._chunks else None
+
+    @property
+    def full(self) -> bool:
+        """Return if the buffer holds its maximum amount of audio."""
+        return self._seconds >= self.max_seconds
+
+    def put(self, position: float, seconds: float, chunk: bytes | None) -> None:
+        """Add a chunk (or EOF if chunk is None) to the buffer."""
+        self._chunks.append((position, seconds, chunk))
+        self._seconds += seconds
+        self._data_available.set()
+
+    def clear(self) -> float:
+        """Drop all chunks from the buffer, return the number of seconds dropped."""
+        seconds = self._seconds
+        self._chunks.clear()
+        self._seconds = 0.0
+        return seconds
+
+    async def get(self) -> bytes | None:
+        """Get the next chunk from the buffer (None for EOF)."""
+        while not self._chunks:
+            self._data_available.clear()
+            await self._data_available.wait()
+        _, seconds, chunk = self._chunks.popleft()
+        self._seconds -= seconds
+        return chunk
+
+
 class AirPlayStreamSession:
     """Stream session (RAOP or AirPlay2) to one or more players."""
 
@@ -57,6 +109,13 @@ class AirPlayStreamSession:
         self.sync_clients = sync_clients
         self._audio_source_task: asyncio.Task[None] | None = None
         self._player_ffmpeg: dict[str, FFMpeg] = {}
+        # each client has its own buffer and writer task, so a slow client can not stall
+        # the (shared) audio source and the other clients
+        self._client_buffers: dict[str, ClientAudioBuffer] = {}
+        self._client_writers: dict[str, asyncio.Task[None]] = {}
+        self._client_resyncs: dict[str, int] = {}
+        self._resyncing: set[str] = set()
+        self._buffer_drained = asyncio.Event()
         self._lock = asyncio.Lock()
         self.start_ntp: int = 0
         self.start_time: float = 0.0
@@ -135,6 +194,7 @@ class AirPlayStreamSession:
             if airplay_player not in self.sync_clients:
                 return
             self.sync_clients.remove(airplay_player)
+        self._stop_client_writer(airplay_player.player_id)
         if airplay_player.stream and airplay_player.stream.session == self:
             await airplay_player.stream.stop()
         if ffmpeg := self._player_ffmpeg.pop(airplay_player.player_id, None):
@@ -197,14 +257,15 @@ class AirPlayStreamSession:
     async def replace_stream(self, audio_source: AsyncGenerator[bytes, None]) -> None:
         """Replace the audio source of the stream."""
         self._first_chunk_received.clear()
-        new_audio_source_task = asyncio.create_task(self._audio_streamer(audio_source))
+        assert self._audio_source_task  # for type checker
+        old_audio_source_task = self._audio_source_task
+        # the new audio source task cancels the current audio source task
+        # (and drops its buffered audio) as soon as it has received its first chunk
+        new_audio_source_task = asyncio.create_task(
+            self._audio_streamer(audio_source, replace=old_audio_source_task)
+        )
         await self._first_chunk_received.wait()
-        async with self._lock:
-            # Cancel the current audio source task
-            assert self._audio_source_task  # for type checker
-            old_audio_source_task = self._audio_source_task
-            old_audio_source_task.cancel()
-            self._audio_source_task = new_audio_source_task
+        self._audio_source_task = new_audio_source_task
         self.last_stream_started = time.time() + self.wait_start
         for sync_client in self.sync_clients:
             sync_client.set_state_from_stream(state=None, elapsed_time=0)
@@ -212,8 +273,12 @@ class AirPlayStreamSession:
         with suppress(asyncio.CancelledError):
             await old_audio_source_task
 
-    async def _audio_streamer(self, audio_source: AsyncGenerator[bytes, None]) -> None:
-        """Stream audio to all players."""
+    async def _audio_streamer(
+        self,
+        audio_source: AsyncGenerator[bytes, None],
+        replace: asyncio.Task[None] | None = None,
+    ) -> None:
+        """Stream audio to (the buffers of) all players."""
         pcm_sample_size = self.pcm_format.pcm_sample_size
         stream_start_time = time.time()
         first_chunk_received = False
@@ -225,10 +290,15 @@ class AirPlayStreamSession:
                     "First audio chunk received after %.3fs",
                     time.time() - stream_start_time,
                 )
+                if replace:
+                    await self._replace_audio_source(replace)
                 self._first_chunk_received.set()
             # Wait until all clients are ready
             await self._clients_ready.wait()
-            # Send chunk to all players
+            # Advance at the pace of the session clock (and the fastest client)
+            await self._wait_for_clients()
+            chunk_seconds = len(chunk) / pcm_sample_size
+            # Send chunk to (the buffers of) all players
             async with self._lock:
                 sync_clients = [x for x in self.sync_clients if x.stream and x.stream.running]
                 if not sync_clients:
@@ -236,53 +306,147 @@ class AirPlayStreamSession:
                         "Audio streamer exiting: No running clients left in session"
                     )
                     return
-
-                # Write chunk to all players
-                write_tasks = [
-                    self._write_chunk_to_player(x, chunk) for x in sync_clients if x.stream
-                ]
-                results = await asyncio.gather(*write_tasks, return_exceptions=True)
-
-                # Check for write errors or timeouts
-                players_to_remove: list[AirPlayPlayer] = []
-                for i, result in enumerate(results):
-                    if i >= len(sync_clients):
+                buffers = {
+                    x.player_id: buffer
+                    for x in sync_clients
+                    if x.player_id not in self._resyncing
+                    and (buffer := self._client_buffers.get(x.player_id))
+                }
+                # position of the most advanced client: the oldest chunk it did not consume
+                lead_position = max(
+                    (self._get_buffer_position(buffer) for buffer in buffers.values()),
+                    default=self.seconds_streamed,
+                )
+                for sync_client in sync_clients:
+                    if not (buffer := buffers.get(sync_client.player_id)):
                         continue
-                    player = sync_clients[i]
-
-                    if isinstance(result, asyncio.TimeoutError):
-                        self.prov.logger.warning(
-                            "Removing player %s from session: stopped reading data (write timeout)",
-                            player.player_id,
-                        )
-                        players_to_remove.append(player)
-                    elif isinstance(result, Exception):
-                        self.prov.logger.warning(
-                            "Removing player %s from session due to write error: %s",
-                            player.player_id,
-                            result,
-                        )
-                        players_to_remove.append(player)
-
-                # Remove failed/timed-out players from sync group
-                for player in players_to_remove:
-                    self.mass.create_task(self.remove_client(player))
-
+                    lag = lead_position - self._get_buffer_position(buffer)
+                    if lag >= AIRPLAY_CLIENT_BUFFER_SECONDS:
+                        # the client fell too far behind the other clients
+                        self._resyncing.add(sync_client.player_id)
+                        self.mass.create_task(self._resync_client(sync_client, lag))
+                        continue
+                    buffer.put(self.seconds_streamed, chunk_seconds, chunk)
                 # Update chunk counter (each chunk is exactly one second of audio)
-                chunk_seconds = len(chunk) / pcm_sample_size
                 self.seconds_streamed += chunk_seconds
 
         # Entire stream consumed: send EOF
         self.prov.logger.debug("Audio source stream exhausted")
         async with self._lock:
-            await asyncio.gather(
-                *[
-                    self._write_eof_to_player(x)
-                    for x in self.sync_clients
-                    if x.stream and x.stream.running
-                ],
-                return_exceptions=True,
+            for sync_client in self.sync_clients:
+                if not sync_client.stream or not sync_client.stream.running:
+                    continue
+                if buffer := self._client_buffers.get(sync_client.player_id):
+                    buffer.put(self.seconds_streamed, 0, None)
+
+    async def _wait_for_clients(self) -> None:
+        """
+        Wait until the next chunk of the audio source may be sent to the clients.
+
+        The audio source runs (at most) AIRPLAY_PRELOAD_SECONDS ahead of the session clock,
+        limited by the fastest client: it waits while the buffers of all (running) clients
+        are full, e.g. when the (single) player of the session is paused.
+        """
+        while True:
+            ahead = self.seconds_streamed - (time.time() - self.start_time)
+            if ahead > AIRPLAY_PRELOAD_SECONDS:
+                await asyncio.sleep(ahead - AIRPLAY_PRELOAD_SECONDS)
+                continue
+            buffers = [
+                buffer
+                for x in self.sync_clients
+                if x.stream
+                and x.stream.running
+                and x.player_id not in self._resyncing
+                and (buffer := self._client_buffers.get(x.player_id))
+            ]
+            if not buffers or not all(buffer.full for buffer in buffers):
+                return
+            self._buffer_drained.clear()
+            await self._buffer_drained.wait()
+
+    async def _replace_audio_source(self, old_audio_source_task: asyncio.Task[None]) -> None:
+        """Stop the previous audio source (task) when the new audio source starts."""
+        async with self._lock:
+            old_audio_source_task.cancel()
+            # drop the buffered audio of the previous source, so the new audio starts
+            # right after the audio the (most advanced) clients already received
+            dropped = [buffer.clear() for buffer in self._client_buffers.values()]
+            self.seconds_streamed -= min(dropped, default=0.0)
+
+    def _get_buffer_position(self, buffer: ClientAudioBuffer) -> float:
+        """Return the position of the oldest chunk a client did not yet consume."""
+        return self.seconds_streamed if buffer.position is None else buffer.position
+
+    async def _resync_client(self, airplay_player: AirPlayPlayer, lag: float) -> None:
+        """Resync (or remove) a client that fell too far behind the other clients."""
+        player_id = airplay_player.player_id
+        try:
+            resyncs = self._client_resyncs.get(player_id, 0)
+            allow_late_join = self.prov.config.get_value(
+                CONF_ENABLE_LATE_JOIN, ENABLE_LATE_JOIN_DEFAULT
+            )
+            if not allow_late_join or resyncs >= AIRPLAY_CLIENT_MAX_RESYNCS:
+                self.prov.logger.warning(
+                    "Removing player %s from session: fell %.1fs behind the other players",
+                    player_id,
+                    lag,
+                )
+                await self.remove_client(airplay_player)
+                return
+            self.prov.logger.warning(
+                "Resyncing player %s: fell %.1fs behind the other players", player_id, lag
             )
+            self._client_resyncs[player_id] = resyncs + 1
+            await self.remove_client(airplay_player)
+            if self.sync_clients:
+                # (re)join the session as late joiner, in sync with the other players
+                await self.add_client(airplay_player)
+        finally:
+            self._resyncing.discard(player_id)
+
+    async def _client_writer(
+        self, airplay_player: AirPlayPlayer, buffer: ClientAudioBuffer
+    ) -> None:
+        """Write the (buffered) audio chunks to a specific player."""
+        try:
+            while True:
+                chunk = await buffer.get()
+                self._buffer_drained.set()
+                if chunk is None:
+                    await self._write_eof_to_player(airplay_player)
+                    return
+                await self._write_chunk_to_player(airplay_player, chunk)
+        except TimeoutError:
+            self.prov.logger.warning(
+                "Removing player %s from session: stopped reading data (write timeout)",
+                airplay_player.player_id,
+            )
+        except Exception as err:
+            self.prov.logger.warning(
+                "Removing player %s from session due to write error: %s",
+                airplay_player.player_id,
+                err,
+            )
+        self.mass.create_task(self.remove_client(airplay_player))
+
+    def _start_client_writer(self, airplay_player: AirPlayPlayer) -> None:
+        """Create the audio buffer and writer task of a client."""
+        self._stop_client_writer(airplay_player.player_id)
+        buffer = ClientAudioBuffer(AIRPLAY_CLIENT_BUFFER_SECONDS)
+        self._client_buffers[airplay_player.player_id] = buffer
+        self._client_writers[airplay_player.player_id] = asyncio.create_task(
+            self._client_writer(airplay_player, buffer)
+        )
+
+    def _stop_client_writer(self, player_id: str) -> None:
+        """Remove the audio buffer (and cancel the writer task) of a client."""
+        self._client_buffers.pop(player_id, None)
+        task = self._client_writers.pop(player_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        # the source may be waiting for (only) this client
+        self._buffer_drained.set()
 
     async def _write_chunk_to_player(self, airplay_player: AirPlayPlayer, chunk: bytes) -> None:
         """
@@ -331,6 +495,7 @@ class AirPlayStreamSession:
         # start the (player-specific) ffmpeg process
         # note that ffmpeg will open the named pipe for writing
         await self._start_client_ffmpeg(airplay_player)
+        self._start_client_writer(airplay_player)
         await asyncio.sleep(0.05)  # allow ffmpeg to open the pipe properly
 
     async def _start_client(self, airplay_player: AirPlayPlayer, start_ntp: int) -> None:
@@ -606,7 +606,7 @@ class DigitallyIncorporatedProvider(MusicProvider):
             )
             return {}
 
-    @use_cache(CACHE_STREAM_URL)
+    @use_cache(CACHE_STREAM_URL, stale_while_revalidate=False)
     async def _get_stream_url(self, network_key: str, channel_key: str) -> str:
         """Get the streaming URL for a channel."""
         self.logger.debug("%s: Getting stream URL for %s:%s", self.domain, network_key, channel_key)
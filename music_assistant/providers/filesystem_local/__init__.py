@@ -7,9 +7,11 @@ import contextlib
 import logging
 import os
 import os.path
+import threading
 import time
 import urllib.parse
 from collections.abc import AsyncGenerator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
@@ -89,22 +91,30 @@ from .constants import (
     CONF_ENTRY_LIBRARY_SYNC_TRACKS,
     CONF_ENTRY_MISSING_ALBUM_ARTIST,
     CONF_ENTRY_PATH,
+    CONF_ENTRY_SCAN_CONCURRENCY,
+    CONF_ENTRY_WATCH_CHANGES,
+    DB_TABLE_AUDIO_TAGS_CACHE,
     IMAGE_EXTENSIONS,
     PLAYLIST_EXTENSIONS,
     PODCAST_EPISODE_EXTENSIONS,
+    SCAN_BATCH_SIZE,
+    SCAN_PROGRESS_INTERVAL,
     SUPPORTED_EXTENSIONS,
     TRACK_EXTENSIONS,
+    WATCH_DELAY,
     IsChapterFile,
 )
 from .helpers import (
-    IGNORE_DIRS,
+    AudioTagsCache,
     FileSystemItem,
+    LibraryScanProgress,
     get_absolute_path,
     get_album_dir,
     get_artist_dir,
     get_relative_path,
     sorted_scandir,
 )
+from .watcher import ROOT_PATH, FileSystemWatcher, is_ignored_name, start_watcher
 
 if TYPE_CHECKING:
     from music_assistant_models.config_entries import ConfigEntry, ConfigValueType, ProviderConfig
@@ -156,6 +166,8 @@ async def get_config_entries(
         CONF_ENTRY_LIBRARY_SYNC_PLAYLISTS,
         CONF_ENTRY_LIBRARY_SYNC_PODCASTS,
         CONF_ENTRY_LIBRARY_SYNC_AUDIOBOOKS,
+        CONF_ENTRY_SCAN_CONCURRENCY,
+        CONF_ENTRY_WATCH_CHANGES,
     ]
     if instance_id is None or values is None:
         return (CONF_ENTRY_CONTENT_TYPE, *base_entries)
@@ -183,6 +195,8 @@ class LocalFileSystemProvider(MusicProvider):
         self.base_path: str = base_path
         self.write_access: bool = False
         self.sync_running: bool = False
+        self.tags_cache: AudioTagsCache | None = None
+        self.watcher: FileSystemWatcher | None = None
         self.media_content_type = cast("str", config.get_value(CONF_ENTRY_CONTENT_TYPE.key))
 
     @property
@@ -215,6 +229,11 @@ class LocalFileSystemProvider(MusicProvider):
         """Return a (default) instance name postfix for this provider instance."""
         return self.base_path.split(os.sep)[-1]
 
+    @property
+    def supports_inotify(self) -> bool:
+        """Return if the changes in the media folder can be watched with inotify."""
+        return True
+
     async def handle_async_init(self) -> None:
         """Handle async initialization of the provider."""
         if not await isdir(self.base_path):
@@ -222,6 +241,30 @@ class LocalFileSystemProvider(MusicProvider):
             raise SetupFailedError(msg)
         await self.check_write_access()
 
+    async def loaded_in_mass(self) -> None:
+        """Call after the provider has been loaded."""
+        await super().loaded_in_mass()
+        assert self.mass.cache.database is not None
+        self.tags_cache = AudioTagsCache(self.mass.cache.database, DB_TABLE_AUDIO_TAGS_CACHE)
+        await self.tags_cache.setup()
+        if self.config.get_value(CONF_ENTRY_WATCH_CHANGES.key) and self._library_sync_enabled():
+            try:
+                self.watcher = await start_watcher(
+                    self.base_path, self._process_changes, self.logger, self.supports_inotify
+                )
+            except OSError as err:
+                self.logger.warning("Unable to watch %s for changes: %s", self.base_path, err)
+
+    async def unload(self, is_removed: bool = False) -> None:
+        """
+        Handle unload/close of the provider.
+
+        Called when provider is deregistered (e.g. MA exiting or config reloading).
+        """
+        if self.watcher:
+            await self.watcher.stop()
+            self.watcher = None
+
     async def search(
         self,
         search_query: str,
@@ -347,50 +390,16 @@ class LocalFileSystemProvider(MusicProvider):
             file_checksums[db_row["provider_item_id"]] = str(db_row["details"])
         # find all supported files in the base directory and all subfolders
         # we work bottom up, as-in we derive all info from the tracks
-        cur_filenames = set()
+        cur_filenames: set[str] = set()
         prev_filenames = set(file_checksums.keys())
 
-        # NOTE: we do the entire traversing of the directory structure, including parsing tags
-        # in a single executor thread to save the overhead of having to spin up tons of tasks
-        def listdir(path: str) -> Iterator[FileSystemItem]:
-            """Recursively traverse directory entries."""
-            for item in os.scandir(path):
-                # ignore invalid filenames
-                if item.name in IGNORE_DIRS or item.name.startswith((".", "_")):
-                    continue
-                if item.is_dir(follow_symlinks=False):
-                    yield from listdir(item.path)
-                elif item.is_file(follow_symlinks=False):
-                    # skip files without extension
-                    if "." not in item.name:
-                        continue
-                    ext = item.name.rsplit(".", 1)[1].lower()
-                    if ext not in SUPPORTED_EXTENSIONS:
-                        # skip unsupported file extension
-                        continue
-                    try:
-                        yield FileSystemItem.from_dir_entry(item, self.base_path)
-                    except OSError as err:
-                        # Skip files that cannot be stat'd (e.g., invalid encoding on SMB mounts)
-                        # This typically happens with emoji or special unicode characters
-                        self.logger.debug(
-                            "Skipping file %s due to stat error: %s",
-                            item.path,
-                            str(err),
-                        )
-
-        def run_sync() -> None:
-            """Run the actual sync (in an executor job)."""
-            self.sync_running = True
-            try:
-                for item in listdir(self.base_path):
-                    prev_checksum = file_checksums.get(item.relative_path)
-                    if self._process_item(item, prev_checksum):
-                        cur_filenames.add(item.relative_path)
-            finally:
-                self.sync_running = False
-
-        await asyncio.to_thread(run_sync)
+        # NOTE: the traversing of the directory structure runs in a single executor thread,
+        # the (new/changed) files are processed in a pipeline (see _scan_library)
+        self.sync_running = True
+        try:
+            await self._scan_library(self._listdir(self.base_path), file_checksums, cur_filenames)
+        finally:
+            self.sync_running = False
 
         end_time = time.time()
         self.logger.info(
@@ -405,104 +414,380 @@ class LocalFileSystemProvider(MusicProvider):
         # process orphaned albums and artists
         await self._process_orphaned_albums_and_artists()
 
-    def _process_item(self, item: FileSystemItem, prev_checksum: str | None) -> bool:
-        """Process a single item. NOT async friendly."""
-        try:
-            self.logger.log(VERBOSE_LOG_LEVEL, "Processing: %s", item.relative_path)
+    def _listdir(self, path: str) -> Iterator[FileSystemItem]:
+        """Recursively traverse directory entries (of supported files). NOT async friendly."""
+        for item in os.scandir(path):
+            # ignore invalid filenames
+            if is_ignored_name(item.name):
+                continue
+            if item.is_dir(follow_symlinks=False):
+                yield from self._listdir(item.path)
+            elif item.is_file(follow_symlinks=False):
+                # skip files without extension
+                if "." not in item.name:
+                    continue
+                ext = item.name.rsplit(".", 1)[1].lower()
+                if ext not in SUPPORTED_EXTENSIONS:
+                    # skip unsupported file extension
+                    continue
+                try:
+                    yield FileSystemItem.from_dir_entry(item, self.base_path)
+                except OSError as err:
+                    # Skip files that cannot be stat'd (e.g., invalid encoding on SMB mounts)
+                    # This typically happens with emoji or special unicode characters
+                    self.logger.debug(
+                        "Skipping file %s due to stat error: %s",
+                        item.path,
+                        str(err),
+                    )
 
-            # ignore playlists that are in album directories
-            # we need to run this check early because the setting may have changed
-            if (
-                item.ext in PLAYLIST_EXTENSIONS
-                and self.media_content_type == "music"
-                and self.config.get_value(CONF_ENTRY_IGNORE_ALBUM_PLAYLISTS.key)
-            ):
-                # we assume this in a bit of a dumb way by just checking if the playlist
-                # is more than 1 level deep in the directory structure
-                if len(item.relative_path.split("/")) > 2:
-                    return False
+    async def _scan_library(
+        self,
+        files: Iterator[FileSystemItem],
+        file_checksums: dict[str, str],
+        cur_filenames: set[str],
+    ) -> LibraryScanProgress:
+        """
+        Scan (and process) the given files in a (staged) pipeline, return the progress.
 
-            # return early if the item did not change (checksum still the same)
-            if item.checksum == prev_checksum:
-                return True
+        - the directory walk runs in a single thread and hands over the files in batches.
+        - a (bounded) pool of workers skips the unchanged files and reads the tags of the
+          new/changed files, in parallel (threads).
+        - a single writer adds the (parsed) items to the library, committing the writes
+          per SCAN_BATCH_SIZE items.
+        """
+        concurrency = cast("int", self.config.get_value(CONF_ENTRY_SCAN_CONCURRENCY.key))
+        progress = LibraryScanProgress()
+        walk_queue: asyncio.Queue[list[FileSystemItem] | None] = asyncio.Queue(concurrency * 2)
+        write_queue: asyncio.Queue[tuple[FileSystemItem, str | None, AudioTags | None] | None]
+        write_queue = asyncio.Queue(concurrency * 4)
+        executor = ThreadPoolExecutor(concurrency, thread_name_prefix=f"scan_{self.instance_id}")
+        stop_walk = threading.Event()
+        loop = self.mass.loop
+
+        def put_batch(batch: list[FileSystemItem] | None) -> bool:
+            """Hand over a batch of files to the workers (from the walk thread)."""
+            future = asyncio.run_coroutine_threadsafe(walk_queue.put(batch), loop)
+            while True:
+                try:
+                    future.result(1)
+                    return True
+                except TimeoutError:
+                    if stop_walk.is_set():
+                        future.cancel()
+                        return False
+
+        def walk() -> None:
+            """Walk the directory tree (in an executor thread)."""
+            batch: list[FileSystemItem] = []
+            try:
+                for item in files:
+                    batch.append(item)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        if not put_batch(batch):
+                            return
+                        batch = []
+                if batch:
+                    put_batch(batch)
+            finally:
+                # signal the end of the walk to all workers
+                for _ in range(concurrency):
+                    if not put_batch(None):
+                        break
 
-            if item.ext in TRACK_EXTENSIONS and self.media_content_type == "music":
-                # handle track item
-                tags = parse_tags(item.absolute_path, item.file_size)
-
-                async def process_track() -> None:
-                    track = await self._parse_track(item, tags)
-                    # add/update track to db
-                    # note that filesystem items are always overwriting existing info
-                    # when they are detected as changed
-                    track.favorite = False  # TODO: implement favorite status based on rating ?
-                    await self.mass.music.tracks.add_item_to_library(
-                        track, overwrite_existing=prev_checksum is not None
-                    )
+        async def tag_worker() -> None:
+            """Skip the unchanged files and read the tags of the changed files."""
+            assert self.mass.cache.database is not None
+            while (batch := await walk_queue.get()) is not None:
+                # commit the writes to the tags cache per batch of the directory walk
+                async with self.mass.cache.database.batch():
+                    await process_batch(batch)
+                self._log_sync_progress(progress)
+
+        async def process_batch(batch: list[FileSystemItem]) -> None:
+            """Process a batch of files of the directory walk."""
+            for item in batch:
+                progress.scanned += 1
+                prev_checksum = file_checksums.get(item.relative_path)
+                if self._is_ignored_item(item):
+                    continue
+                # skip the item if it did not change (checksum still the same)
+                if item.checksum == prev_checksum:
+                    cur_filenames.add(item.relative_path)
+                    continue
+                progress.changed += 1
+                tags: AudioTags | None = None
+                if self._get_item_media_type(item) not in (None, MediaType.PLAYLIST):
+                    try:
+                        tags = await self._get_tags(item, executor, progress)
+                    except Exception as err:
+                        progress.errors += 1
+                        self._log_process_error(item, err)
+                        continue
+                await write_queue.put((item, prev_checksum, tags))
+
+        async def writer() -> None:
+            """Add the (parsed) items to the library."""
+            assert self.mass.music.database
+            finished = False
+            while not finished:
+                async with self.mass.music.database.batch():
+                    for _ in range(SCAN_BATCH_SIZE):
+                        if (entry := await write_queue.get()) is None:
+                            finished = True
+                            break
+                        item, prev_checksum, tags = entry
+                        if await self._process_item(item, prev_checksum, tags):
+                            cur_filenames.add(item.relative_path)
+                        else:
+                            progress.errors += 1
+                        progress.processed += 1
 
-                asyncio.run_coroutine_threadsafe(process_track(), self.mass.loop).result()
-                return True
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                writer_task = task_group.create_task(writer())
+                task_group.create_task(asyncio.to_thread(walk))
+                workers = [task_group.create_task(tag_worker()) for _ in range(concurrency)]
+                await asyncio.gather(*workers)
+                await write_queue.put(None)
+                await writer_task
+        finally:
+            stop_walk.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._log_sync_progress(progress, final=True)
+        return progress
+
+    async def _get_tags(
+        self,
+        item: FileSystemItem,
+        executor: ThreadPoolExecutor | None = None,
+        progress: LibraryScanProgress | None = None,
+    ) -> AudioTags:
+        """Return the tags of a file, from the tags cache if the file did not change."""
+        if self.tags_cache and (tags := await self.tags_cache.get(item)):
+            if progress:
+                progress.cached += 1
+            return tags
+        tags = await self.mass.loop.run_in_executor(
+            executor, parse_tags, item.absolute_path, item.file_size
+        )
+        if self.tags_cache:
+            await self.tags_cache.set(item, tags)
+        return tags
+
+    def _log_sync_progress(self, progress: LibraryScanProgress, final: bool = False) -> None:
+        """Log the progress (and throughput) of the library sync (at a fixed interval)."""
+        if not final and time.monotonic() - progress.last_report < SCAN_PROGRESS_INTERVAL:
+            return
+        progress.last_report = time.monotonic()
+        self.logger.log(
+            logging.INFO if final else logging.DEBUG,
+            "Library sync for %s %s: %s files scanned (%.1f/s), "
+            "%s new/changed files processed (%.1f/s, %s tags from cache), %s errors",
+            self.name,
+            "finished" if final else "in progress",
+            progress.scanned,
+            progress.files_per_second,
+            progress.processed,
+            progress.processed_per_second,
+            progress.cached,
+            progress.errors,
+        )
 
-            if item.ext in AUDIOBOOK_EXTENSIONS and self.media_content_type == "audiobooks":
-                # handle audiobook item
-                tags = parse_tags(item.absolute_path, item.file_size)
+    def _is_ignored_item(self, item: FileSystemItem) -> bool:
+        """Return if the item should be ignored (not added to the library)."""
+        # ignore playlists that are in album directories
+        # we need to run this check early because the setting may have changed
+        if (
+            item.ext in PLAYLIST_EXTENSIONS
+            and self.media_content_type == "music"
+            and self.config.get_value(CONF_ENTRY_IGNORE_ALBUM_PLAYLISTS.key)
+        ):
+            # we assume this in a bit of a dumb way by just checking if the playlist
+            # is more than 1 level deep in the directory structure
+            return len(item.relative_path.split("/")) > 2
+        return False
 
-                async def process_audiobook() -> None:
-                    try:
-                        audiobook = await self._parse_audiobook(item, tags)
-                    except IsChapterFile:
-                        return
-                    # add/update audiobook to db
-                    # note that filesystem items are always overwriting existing info
-                    # when they are detected as changed
-                    await self.mass.music.audiobooks.add_item_to_library(
-                        audiobook, overwrite_existing=prev_checksum is not None
-                    )
+    def _get_item_media_type(self, item: FileSystemItem) -> MediaType | None:
+        """Return the media type of a file in this provider (None if not supported)."""
+        if item.ext in TRACK_EXTENSIONS and self.media_content_type == "music":
+            return MediaType.TRACK
+        if item.ext in AUDIOBOOK_EXTENSIONS and self.media_content_type == "audiobooks":
+            return MediaType.AUDIOBOOK
+        if item.ext in PODCAST_EPISODE_EXTENSIONS and self.media_content_type == "podcasts":
+            return MediaType.PODCAST_EPISODE
+        if item.ext in PLAYLIST_EXTENSIONS and self.media_content_type == "music":
+            return MediaType.PLAYLIST
+        return None
 
-                asyncio.run_coroutine_threadsafe(process_audiobook(), self.mass.loop).result()
-                return True
+    def _log_process_error(self, item: FileSystemItem, err: Exception) -> None:
+        """Log an error while processing a file."""
+        self.logger.error(
+            "Error processing %s - %s",
+            item.relative_path,
+            str(err),
+            exc_info=err if self.logger.isEnabledFor(logging.DEBUG) else None,
+        )
 
-            if item.ext in PODCAST_EPISODE_EXTENSIONS and self.media_content_type == "podcasts":
-                # handle podcast(episode) item
-                tags = parse_tags(item.absolute_path, item.file_size)
-
-                async def process_episode() -> None:
-                    episode = await self._parse_podcast_episode(item, tags)
-                    assert isinstance(episode.podcast, Podcast)
-                    # add/update episode to db
-                    # note that filesystem items are always overwriting existing info
-                    # when they are detected as changed
-                    await self.mass.music.podcasts.add_item_to_library(
-                        episode.podcast, overwrite_existing=prev_checksum is not None
-                    )
+    async def _process_item(
+        self,
+        item: FileSystemItem,
+        prev_checksum: str | None,
+        tags: AudioTags | None = None,
+    ) -> bool:
+        """
+        Process a single item, returns if the item is a valid (library) item.
 
-                asyncio.run_coroutine_threadsafe(process_episode(), self.mass.loop).result()
+        The tags of the (audio) file are read if not given.
+        """
+        try:
+            self.logger.log(VERBOSE_LOG_LEVEL, "Processing: %s", item.relative_path)
+
+            if self._is_ignored_item(item):
+                return False
+
+            # return early if the item did not change (checksum still the same)
+            if item.checksum == prev_checksum:
                 return True
 
-            if item.ext in PLAYLIST_EXTENSIONS and self.media_content_type == "music":
-                # handle playlist item
+            media_type = self._get_item_media_type(item)
+            if media_type is None:
+                return False
+            if tags is None and media_type != MediaType.PLAYLIST:
+                tags = await self._get_tags(item)
+
+            if media_type == MediaType.TRACK:
+                assert tags is not None
+                track = await self._parse_track(item, tags)
+                # add/update track to db
+                # note that filesystem items are always overwriting existing info
+                # when they are detected as changed
+                track.favorite = False  # TODO: implement favorite status based on rating ?
+                await self.mass.music.tracks.add_item_to_library(
+                    track, overwrite_existing=prev_checksum is not None
+                )
+                return True
 
-                async def process_playlist() -> None:
-                    playlist = await self.get_playlist(item.relative_path)
-                    # add/update playlist to db
-                    await self.mass.music.playlists.add_item_to_library(
-                        playlist,
-                        overwrite_existing=prev_checksum is not None,
-                    )
+            if media_type == MediaType.AUDIOBOOK:
+                assert tags is not None
+                try:
+                    audiobook = await self._parse_audiobook(item, tags)
+                except IsChapterFile:
+                    return True
+                # add/update audiobook to db
+                # note that filesystem items are always overwriting existing info
+                # when they are detected as changed
+                await self.mass.music.audiobooks.add_item_to_library(
+                    audiobook, overwrite_existing=prev_checksum is not None
+                )
+                return True
 
-                asyncio.run_coroutine_threadsafe(process_playlist(), self.mass.loop).result()
+            if media_type == MediaType.PODCAST_EPISODE:
+                assert tags is not None
+                episode = await self._parse_podcast_episode(item, tags)
+                assert isinstance(episode.podcast, Podcast)
+                # add/update episode to db
+                # note that filesystem items are always overwriting existing info
+                # when they are detected as changed
+                await self.mass.music.podcasts.add_item_to_library(
+                    episode.podcast, overwrite_existing=prev_checksum is not None
+                )
                 return True
 
+            # handle playlist item
+            playlist = await self.get_playlist(item.relative_path)
+            # add/update playlist to db
+            await self.mass.music.playlists.add_item_to_library(
+                playlist,
+                overwrite_existing=prev_checksum is not None,
+            )
+            return True
+
         except Exception as err:
             # we don't want the whole sync to crash on one file so we catch all exceptions here
-            self.logger.error(
-                "Error processing %s - %s",
-                item.relative_path,
-                str(err),
-                exc_info=err if self.logger.isEnabledFor(logging.DEBUG) else None,
-            )
+            self._log_process_error(item, err)
         return False
 
+    def _library_sync_enabled(self) -> bool:
+        """Return if (any) media of the content type is imported into the library."""
+        return any(
+            self.config.get_value(entry.key)
+            for entry in (
+                CONF_ENTRY_LIBRARY_SYNC_TRACKS,
+                CONF_ENTRY_LIBRARY_SYNC_PLAYLISTS,
+                CONF_ENTRY_LIBRARY_SYNC_PODCASTS,
+                CONF_ENTRY_LIBRARY_SYNC_AUDIOBOOKS,
+            )
+            if entry.depends_on_value == self.media_content_type
+        )
+
+    async def _process_changes(self, changed: set[str], deleted: set[str]) -> None:
+        """Process the changed and deleted (relative) paths reported by the watcher."""
+        if ROOT_PATH in changed:
+            # the watcher lost track of the changes
+            await self.mass.music.start_sync(providers=[self.instance_id])
+            return
+        while self.sync_running:
+            # the running (full) sync may have missed (some of) these changes
+            await asyncio.sleep(WATCH_DELAY)
+        self.logger.debug(
+            "Processing %s changed and %s deleted path(s) in %s",
+            len(changed),
+            len(deleted),
+            self.name,
+        )
+        # process the deletions first, a deleted path may have been (re)created
+        if deleted:
+            await self._process_deletions(set(await self._get_library_files(deleted)))
+        processed = False
+        for path in sorted(changed):
+            try:
+                item = await self.resolve(path)
+            except FileNotFoundError:
+                # deleted (or moved) in the meantime
+                continue
+            if item.is_dir:
+                items = await asyncio.to_thread(list, self._listdir(item.absolute_path))
+            elif item.ext in SUPPORTED_EXTENSIONS:
+                items = [item]
+            else:
+                continue
+            for file_item in items:
+                prev_checksums = await self._get_library_files({file_item.relative_path})
+                prev_checksum = prev_checksums.get(file_item.relative_path)
+                processed = await self._process_item(file_item, prev_checksum) or processed
+        if processed and self.media_content_type == "music":
+            # changed tracks may have been moved to another album (and/or artist)
+            await self._process_orphaned_albums_and_artists()
+
+    async def _get_library_files(self, paths: set[str]) -> dict[str, str]:
+        """
+        Return the (library) files at (or below) the given relative paths.
+
+        Returns a mapping of the relative path of each file to its (previous) checksum.
+        """
+        assert self.mass.music.database
+        files: dict[str, str] = {}
+        for path in paths:
+            query = (
+                f"SELECT provider_item_id, details FROM {DB_TABLE_PROVIDER_MAPPINGS} "
+                "WHERE provider_instance = :instance_id "
+                "AND media_type in ('track', 'playlist', 'audiobook', 'podcast_episode') "
+                "AND (provider_item_id = :path "
+                "OR substr(provider_item_id, 1, :prefix_length) = :prefix)"
+            )
+            params = {
+                "instance_id": self.instance_id,
+                "path": path,
+                "prefix": f"{path}/",
+                "prefix_length": len(path) + 1,
+            }
+            for db_row in await self.mass.music.database.get_rows_from_query(
+                query, params, limit=0
+            ):
+                files[db_row["provider_item_id"]] = str(db_row["details"])
+        return files
+
     async def _process_orphaned_albums_and_artists(self) -> None:
         """Process deletion of orphaned albums and artists."""
         assert self.mass.music.database
@@ -536,6 +821,8 @@ class LocalFileSystemProvider(MusicProvider):
 
     async def _process_deletions(self, deleted_files: set[str]) -> None:
         """Process all deletions."""
+        if self.tags_cache:
+            await self.tags_cache.delete(self.get_absolute_path(x) for x in deleted_files)
         # process deleted tracks/playlists
         album_ids = set()
         artist_ids = set()
@@ -1634,6 +1921,8 @@ class LocalFileSystemProvider(MusicProvider):
                 is_dir=False,
                 checksum=str(int(stat.st_mtime)),
                 file_size=stat.st_size,
+                created_at=int(getattr(stat, "st_birthtime", stat.st_ctime)),
+                inode=stat.st_ino,
             )
 
         # run in thread because strictly taken this may be blocking IO
@@ -117,6 +117,31 @@ CONF_ENTRY_IGNORE_ALBUM_PLAYLISTS = ConfigEntry(
     depends_on_value="music",
 )
 
+CONF_ENTRY_SCAN_CONCURRENCY = ConfigEntry(
+    key="scan_concurrency",
+    type=ConfigEntryType.INTEGER,
+    label="Number of files to process in parallel during library sync",
+    description="The tags of new and changed files are read by this number of parallel workers. "
+    "A higher value speeds up the (initial) sync of large libraries, especially on network "
+    "storage, at the cost of a higher load on the system (and storage).",
+    default_value=4,
+    range=(1, 32),
+    required=False,
+    category="advanced",
+)
+
+CONF_ENTRY_WATCH_CHANGES = ConfigEntry(
+    key="watch_changes",
+    type=ConfigEntryType.BOOLEAN,
+    label="Watch the media folder for changes",
+    description="Add new, changed, moved and deleted files to (or remove them from) the "
+    "Music Assistant library within seconds, without waiting for the next (full) library sync. "
+    "\n\nUses inotify if available, otherwise the folders are checked for changes periodically.",
+    default_value=True,
+    required=False,
+    category="sync_options",
+)
+
 TRACK_EXTENSIONS = {
     "aac",
     "mp3",
@@ -182,3 +207,16 @@ CACHE_CATEGORY_ALBUM_INFO: Final[int] = 2
 CACHE_CATEGORY_FOLDER_IMAGES: Final[int] = 3
 CACHE_CATEGORY_AUDIOBOOK_CHAPTERS: Final[int] = 4
 CACHE_CATEGORY_PODCAST_METADATA: Final[int] = 5
+
+# table (in the cache database) with the parsed tags of the audio files
+DB_TABLE_AUDIO_TAGS_CACHE: Final[str] = "filesystem_audio_tags"
+# number of files the directory walk hands over to the tag workers at once
+SCAN_BATCH_SIZE: Final[int] = 100
+# interval (in seconds) at which the progress of a library sync is logged
+SCAN_PROGRESS_INTERVAL: Final[int] = 30
+# seconds to wait for (a burst of) changes in the media folder to settle before processing
+WATCH_DELAY: Final[float] = 2.0
+# maximum number of seconds changes in the media folder are collected before processing
+WATCH_MAX_DELAY: Final[float] = 10.0
+# interval (in seconds) to check the folders for changes if inotify is not available
+WATCH_POLL_INTERVAL: Final[float] = 30.0
@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
-from dataclasses import dataclass
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING
 
+from music_assistant.controllers.cache import decode_cache_data, encode_cache_data
 from music_assistant.helpers.compare import compare_strings
+from music_assistant.helpers.tags import AudioTags
+
+if TYPE_CHECKING:
+    from music_assistant.helpers.database import DatabaseConnection
 
 IGNORE_DIRS = ("recycle", "Recently-Snaphot", "#recycle", "System Volume Information", "lost+found")
 
@@ -23,6 +32,7 @@ class FileSystemItem:
     - checksum: Checksum for this path (usually last modified time) None for dir.
     - file_size : File size in number of bytes or None if unknown (or not a file).
     - created_at: File creation timestamp (Unix epoch) or None for directories.
+    - inode: Inode number of the file or None if unknown (or not a file).
     """
 
     filename: str
@@ -32,6 +42,7 @@ class FileSystemItem:
     checksum: str | None = None
     file_size: int | None = None
     created_at: int | None = None  # file creation timestamp (Unix epoch)
+    inode: int | None = None
 
     @property
     def ext(self) -> str | None:
@@ -91,9 +102,106 @@ class FileSystemItem:
             checksum=str(int(stat.st_mtime)),
             file_size=stat.st_size,
             created_at=created_at,
+            inode=stat.st_ino,
         )
 
 
+@dataclass
+class LibraryScanProgress:
+    """Progress of a library scan (sync).
+
+    - scanned: Number of (supported) files found by the directory walk.
+    - changed: Number of new or changed files which need to be (re)processed.
+    - processed: Number of (new or changed) files written to the library.
+    - cached: Number of (new or changed) files of which the tags were found in the tags cache.
+    - errors: Number of files which could not be processed.
+    """
+
+    scanned: int = 0
+    changed: int = 0
+    cached: int = 0
+    processed: int = 0
+    errors: int = 0
+    start_time: float = field(default_factory=time.monotonic)
+    last_report: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Return the number of seconds the scan is running."""
+        return time.monotonic() - self.start_time
+
+    @property
+    def files_per_second(self) -> float:
+        """Return the (average) number of files scanned per second."""
+        return self.scanned / max(self.elapsed, 0.001)
+
+    @property
+    def processed_per_second(self) -> float:
+        """Return the (average) number of files processed per second."""
+        return self.processed / max(self.elapsed, 0.001)
+
+
+class AudioTagsCache:
+    """
+    Persistent cache of the (parsed) tags of audio files, keyed by file identity.
+
+    The tags are stored (in the cache database) by absolute path, along with the size,
+    modification time and inode of the file. Cached tags are only used if the file did not
+    change, so unchanged files don't need to be probed (again) when the library database
+    is reset, the provider is (re)added or a scan is interrupted.
+    """
+
+    def __init__(self, database: DatabaseConnection, table: str) -> None:
+        """Initialize AudioTagsCache."""
+        self.database = database
+        self.table = table
+
+    async def setup(self) -> None:
+        """Create the database table (if needed)."""
+        await self.database.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.table}(
+                    [path] TEXT PRIMARY KEY,
+                    [size] INTEGER,
+                    [mtime] TEXT,
+                    [inode] INTEGER,
+                    [data] BLOB NOT NULL
+                    )"""
+        )
+        await self.database.commit()
+
+    async def get(self, item: FileSystemItem) -> AudioTags | None:
+        """Return the cached tags for the (unchanged) file, or None if not cached."""
+        db_row = await self.database.get_row(self.table, {"path": item.absolute_path})
+        if db_row is None or (db_row["size"], db_row["mtime"], db_row["inode"]) != (
+            item.file_size,
+            item.checksum,
+            item.inode,
+        ):
+            return None
+        data, _ = await asyncio.to_thread(decode_cache_data, db_row["data"])
+        return AudioTags(**data)
+
+    async def set(self, item: FileSystemItem, tags: AudioTags) -> None:
+        """Store the tags of a file."""
+        db_data, _ = await asyncio.to_thread(encode_cache_data, asdict(tags))
+        await self.database.insert_or_replace(
+            self.table,
+            {
+                "path": item.absolute_path,
+                "size": item.file_size,
+                "mtime": item.checksum,
+                "inode": item.inode,
+                "data": db_data,
+            },
+        )
+
+    async def delete(self, paths: Iterable[str]) -> None:
+        """Delete the cached tags of the given (absolute) paths."""
+        async with self.database.batch():
+            for path in paths:
+                await self.database.delete(self.table, {"path": path})
+
+
 def get_artist_dir(
     artist_name: str,
     album_dir: str | None,
@@ -0,0 +1,479 @@
+"""Watch the media folder of a filesystem provider for changes."""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import functools
+import logging
+import os
+import struct
+import sys
+from collections.abc import Awaitable, Callable
+
+from .constants import WATCH_DELAY, WATCH_MAX_DELAY, WATCH_POLL_INTERVAL
+from .helpers import IGNORE_DIRS, get_relative_path
+
+# callback for the (relative) paths of the changed and the deleted files/directories
+WatchCallback = Callable[[set[str], set[str]], Awaitable[None]]
+
+# inotify flags and event masks (see inotify(7))
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+INOTIFY_WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+    | IN_EXCL_UNLINK
+)
+# struct inotify_event: int wd, uint32_t mask, uint32_t cookie, uint32_t len, char name[]
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+# the root path is reported as changed when the watcher lost track of the changes
+# (e.g. an overflow of the inotify event queue), which requires a full rescan
+ROOT_PATH = ""
+
+
+def is_ignored_name(name: str) -> bool:
+    """Return if a file or directory (name) is ignored (not part of the library)."""
+    return name in IGNORE_DIRS or name.startswith((".", "_"))
+
+
+@functools.cache
+def _get_libc() -> ctypes.CDLL | None:
+    """Return the C library with the inotify functions (None if not available)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileSystemWatcher:
+    """
+    Base class for a watcher of the changes in a directory tree.
+
+    The (relative) paths of the changed and the deleted files and directories are collected
+    and reported to the callback in batches, once no more changes came in for a short while,
+    so e.g. a file copy or the move of an album folder is reported as a whole.
+    A path may be reported both as deleted and as changed (e.g. when a file is replaced),
+    the deletions should be processed first and the changed paths may no longer exist.
+    """
+
+    def __init__(self, base_path: str, callback: WatchCallback, logger: logging.Logger) -> None:
+        """Initialize FileSystemWatcher."""
+        self.base_path = base_path
+        self.callback = callback
+        self.logger = logger
+        self._changed: set[str] = set()
+        self._deleted: set[str] = set()
+        self._timer: asyncio.TimerHandle | None = None
+        self._first_change = 0.0
+        self._report_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start watching the directory tree."""
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        """Stop watching the directory tree (pending changes are discarded)."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._report_task and not self._report_task.done():
+            self._report_task.cancel()
+        self._changed.clear()
+        self._deleted.clear()
+
+    def _add_change(self, path: str, deleted: bool = False) -> None:
+        """Add a changed (or deleted) path, which is reported after a short delay."""
+        if deleted:
+            self._deleted.add(path)
+        else:
+            self._changed.add(path)
+        self._schedule_report()
+
+    def _schedule_report(self) -> None:
+        """(Re)schedule the report of the collected changes."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._timer is None:
+            self._first_change = now
+        else:
+            self._timer.cancel()
+        # wait for the changes to settle, but report (at least) every WATCH_MAX_DELAY seconds
+        delay = min(WATCH_DELAY, max(0.0, self._first_change + WATCH_MAX_DELAY - now))
+        self._timer = loop.call_later(delay, self._on_report_timer)
+
+    def _on_report_timer(self) -> None:
+        """Handle the end of the report delay."""
+        self._timer = None
+        if self._report_task and not self._report_task.done():
+            # the previous changes are still being processed, the changes that came in
+            # since are reported when that is done
+            return
+        self._report_task = asyncio.create_task(self._report())
+
+    async def _report(self) -> None:
+        """Report the collected changes to the callback."""
+        try:
+            await self._wait_ready()
+            changed, deleted = self._changed, self._deleted
+            self._changed, self._deleted = set(), set()
+            await self.callback(changed, deleted)
+        except Exception as err:
+            self.logger.warning(
+                "Error while processing the changes in %s: %s",
+                self.base_path,
+                str(err),
+                exc_info=err if self.logger.isEnabledFor(logging.DEBUG) else None,
+            )
+        finally:
+            if (self._changed or self._deleted) and self._timer is None:
+                self._schedule_report()
+
+    async def _wait_ready(self) -> None:
+        """Wait until the collected changes can be reported."""
+
+
+class InotifyWatcher(FileSystemWatcher):
+    """
+    Watch a directory tree for changes with inotify (Linux only).
+
+    Every directory in the tree gets its own watch. Note that inotify only reports the
+    changes made by the local system, so it can't be used for network shares.
+    """
+
+    def __init__(self, base_path: str, callback: WatchCallback, logger: logging.Logger) -> None:
+        """Initialize InotifyWatcher."""
+        super().__init__(base_path, callback, logger)
+        self._fd: int | None = None
+        self._watches: dict[int, str] = {}
+        self._watch_tasks: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Return if inotify is available on this system."""
+        return _get_libc() is not None
+
+    async def start(self) -> None:
+        """Start watching the directory tree."""
+        libc = _get_libc()
+        assert libc is not None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        try:
+            self._watches.update(await asyncio.to_thread(self._add_watches, self.base_path))
+        except OSError:
+            await self.stop()
+            raise
+        asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        self.logger.debug("Watching %s directories in %s", len(self._watches), self.base_path)
+
+    async def stop(self) -> None:
+        """Stop watching the directory tree (pending changes are discarded)."""
+        await super().stop()
+        for task in self._watch_tasks:
+            task.cancel()
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+
+    def _add_watches(self, path: str) -> dict[int, str]:
+        """Add a watch for the directory and all its subdirectories. NOT async friendly."""
+        libc = _get_libc()
+        assert libc is not None
+        assert self._fd is not None
+        watches: dict[int, str] = {}
+        dir_paths = [path]
+        while dir_paths:
+            dir_path = dir_paths.pop()
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(dir_path), INOTIFY_WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    msg = "inotify watch limit reached (see fs.inotify.max_user_watches)"
+                    raise OSError(err, msg)
+                # the directory was (re)moved in the meantime
+                continue
+            watches[wd] = dir_path
+            try:
+                with os.scandir(dir_path) as entries:
+                    dir_paths.extend(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False) and not is_ignored_name(entry.name)
+                    )
+            except OSError:
+                continue
+        return watches
+
+    def _remove_watches(self, path: str) -> None:
+        """Remove the watches of the directory and all its subdirectories."""
+        libc = _get_libc()
+        assert libc is not None
+        prefix = path + os.sep
+        for wd, dir_path in list(self._watches.items()):
+            if dir_path == path or dir_path.startswith(prefix):
+                del self._watches[wd]
+                libc.inotify_rm_watch(self._fd, wd)
+
+    async def _watch_directory(self, path: str) -> None:
+        """Watch a new directory (tree)."""
+        try:
+            self._watches.update(await asyncio.to_thread(self._add_watches, path))
+        except OSError as err:
+            self.logger.warning("Unable to watch %s for changes: %s", path, str(err))
+
+    async def _wait_ready(self) -> None:
+        """Wait until the new directories are watched (before these are reported)."""
+        if self._watch_tasks:
+            await asyncio.wait(set(self._watch_tasks))
+
+    def _on_readable(self) -> None:
+        """Read (and handle) the events from the inotify file descriptor."""
+        assert self._fd is not None
+        try:
+            data = os.read(self._fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            self._handle_event(wd, mask, name)
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        """Handle a single inotify event."""
+        if mask & IN_Q_OVERFLOW:
+            self.logger.warning("Too many changes in %s, a full rescan is needed", self.base_path)
+            self._add_change(ROOT_PATH)
+            return
+        if mask & IN_IGNORED:
+            # the watch was removed (e.g. the directory was deleted)
+            self._watches.pop(wd, None)
+            return
+        if (dir_path := self._watches.get(wd)) is None or not name or is_ignored_name(name):
+            return
+        path = os.path.join(dir_path, name)
+        relative_path = get_relative_path(self.base_path, path)
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                task = asyncio.create_task(self._watch_directory(path))
+                self._watch_tasks.add(task)
+                task.add_done_callback(self._watch_tasks.discard)
+                self._add_change(relative_path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove_watches(path)
+                self._add_change(relative_path, deleted=True)
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_ATTRIB):
+            # new files are reported when closed (written), not when created
+            self._add_change(relative_path)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self._add_change(relative_path, deleted=True)
+
+
+# state of a directory for the PollingWatcher: the modification time of the directory and
+# its entries by name, with the (modification time, size) of files and None for directories
+DirectoryState = tuple[int, dict[str, tuple[int, int] | None]]
+
+
+class PollingWatcher(FileSystemWatcher):
+    """
+    Watch a directory tree for changes by polling the modification time of the directories.
+
+    Fallback for when inotify is not available (e.g. non Linux systems or network shares).
+    Only the directories with a changed modification time are listed (again), which covers
+    new, deleted, renamed and replaced files. Note that in-place changes to the content of a
+    file do not change the modification time of its directory, these are still picked up
+    by the (periodic) full library sync.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        callback: WatchCallback,
+        logger: logging.Logger,
+        interval: float = WATCH_POLL_INTERVAL,
+    ) -> None:
+        """Initialize PollingWatcher."""
+        super().__init__(base_path, callback, logger)
+        self.interval = interval
+        self._dirs: dict[str, DirectoryState] = {}
+        self._poll_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start watching the directory tree."""
+        await asyncio.to_thread(self._add_directory, self.base_path)
+        self._poll_task = asyncio.create_task(self._poll_loop())
+        self.logger.debug(
+            "Polling %s directories in %s for changes every %s seconds",
+            len(self._dirs),
+            self.base_path,
+            self.interval,
+        )
+
+    async def stop(self) -> None:
+        """Stop watching the directory tree (pending changes are discarded)."""
+        await super().stop()
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._dirs.clear()
+
+    async def _poll_loop(self) -> None:
+        """Poll the directory tree for changes (at the interval)."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                changed, deleted = await asyncio.to_thread(self.poll)
+            except Exception as err:
+                self.logger.warning(
+                    "Error while polling %s for changes: %s",
+                    self.base_path,
+                    str(err),
+                    exc_info=err if self.logger.isEnabledFor(logging.DEBUG) else None,
+                )
+                continue
+            for path in deleted:
+                self._add_change(path, deleted=True)
+            for path in changed:
+                self._add_change(path)
+
+    def poll(self) -> tuple[list[str], list[str]]:
+        """
+        Return the (relative) paths of the changed and the deleted files/directories.
+
+        Compares the directories with a changed modification time to the previous state.
+        NOT async friendly.
+        """
+        changed: list[str] = []
+        deleted: list[str] = []
+        for dir_path in list(self._dirs):
+            if (state := self._dirs.get(dir_path)) is None:
+                # removed along with its parent
+                continue
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                # the directory was (re)moved, which is handled by its parent
+                continue
+            if mtime == state[0]:
+                continue
+            prev_entries = state[1]
+            entries = self._list_directory(dir_path)
+            self._dirs[dir_path] = (mtime, entries)
+            for name, prev_entry in prev_entries.items():
+                if name in entries and (entries[name] is None) == (prev_entry is None):
+                    continue
+                path = os.path.join(dir_path, name)
+                if prev_entry is None:
+                    self._remove_directory(path)
+                deleted.append(get_relative_path(self.base_path, path))
+            for name, entry in entries.items():
+                if name in prev_entries and prev_entries[name] == entry:
+                    continue
+                path = os.path.join(dir_path, name)
+                if entry is None:
+                    # new directory
+                    self._add_directory(path)
+                changed.append(get_relative_path(self.base_path, path))
+        return changed, deleted
+
+    def _list_directory(self, path: str) -> dict[str, tuple[int, int] | None]:
+        """Return the entries of a directory. NOT async friendly."""
+        entries: dict[str, tuple[int, int] | None] = {}
+        try:
+            with os.scandir(path) as dir_entries:
+                for entry in dir_entries:
+                    if is_ignored_name(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            entries[entry.name] = None
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    def _add_directory(self, path: str) -> None:
+        """Add the (current) state of a directory and all its subdirectories."""
+        dir_paths = [path]
+        while dir_paths:
+            dir_path = dir_paths.pop()
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+            entries = self._list_directory(dir_path)
+            self._dirs[dir_path] = (mtime, entries)
+            dir_paths.extend(
+                os.path.join(dir_path, name) for name, entry in entries.items() if entry is None
+            )
+
+    def _remove_directory(self, path: str) -> None:
+        """Remove the state of a directory and all its subdirectories."""
+        prefix = path + os.sep
+        for dir_path in list(self._dirs):
+            if dir_path == path or dir_path.startswith(prefix):
+                del self._dirs[dir_path]
+
+
+async def start_watcher(
+    base_path: str,
+    callback: WatchCallback,
+    logger: logging.Logger,
+    use_inotify: bool = True,
+) -> FileSystemWatcher:
+    """Start watching a directory tree, with inotify if possible (or by polling)."""
+    if use_inotify and InotifyWatcher.is_available():
+        watcher: FileSystemWatcher = InotifyWatcher(base_path, callback, logger)
+        try:
+            await watcher.start()
+        except OSError as err:
+            logger.info(
+                "Unable to watch %s with inotify (%s), falling back to polling",
+                base_path,
+                str(err),
+            )
+        else:
+            return watcher
+    watcher = PollingWatcher(base_path, callback, logger)
+    await watcher.start()
+    return watcher
@@ -24,6 +24,8 @@ from music_assistant.providers.filesystem_local.constants import (
     CONF_ENTRY_LIBRARY_SYNC_PODCASTS,
     CONF_ENTRY_LIBRARY_SYNC_TRACKS,
     CONF_ENTRY_MISSING_ALBUM_ARTIST,
+    CONF_ENTRY_SCAN_CONCURRENCY,
+    CONF_ENTRY_WATCH_CHANGES,
 )
 
 if TYPE_CHECKING:
@@ -157,6 +159,8 @@ async def get_config_entries(
         CONF_ENTRY_LIBRARY_SYNC_PLAYLISTS,
         CONF_ENTRY_LIBRARY_SYNC_PODCASTS,
         CONF_ENTRY_LIBRARY_SYNC_AUDIOBOOKS,
+        CONF_ENTRY_SCAN_CONCURRENCY,
+        CONF_ENTRY_WATCH_CHANGES,
     )
 
     if instance_id is None or values is None:
@@ -191,6 +195,12 @@ class SMBFileSystemProvider(LocalFileSystemProvider):
             return share
         return None
 
+    @property
+    def supports_inotify(self) -> bool:
+        """Return if the changes in the media folder can be watched with inotify."""
+        # changes made on the share by other clients are not reported by inotify
+        return False
+
     async def handle_async_init(self) -> None:
         """Handle async initialization of the provider."""
         if not await exists(self.base_path):
@@ -210,6 +220,7 @@ class SMBFileSystemProvider(LocalFileSystemProvider):
 
         Called when provider is deregistered (e.g. MA exiting or config reloading).
         """
+        await super().unload(is_removed)
         await self.unmount()
 
     async def mount(self) -> None:
@@ -325,6 +325,12 @@ class GPodder(MusicProvider):
         # While the streams are remote, the user controls what is added.
         return False
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """Return the number of seconds the audio may be kept in the audio cache."""
+        # publicly available podcast episodes, cached for 30 days
+        return 30 * 24 * 3600
+
     async def get_library_podcasts(self) -> AsyncGenerator[Podcast, None]:
         """Retrieve library/subscribed podcasts from the provider."""
         try:
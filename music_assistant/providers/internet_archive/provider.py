@@ -76,6 +76,12 @@ class InternetArchiveProvider(MusicProvider):
         """Return True if provider is a streaming provider."""
         return True
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """Return the number of seconds the audio may be kept in the audio cache."""
+        # freely distributable (public domain/Creative Commons) audio, cached for 30 days
+        return 30 * 24 * 3600
+
     @throttle_with_retries
     async def _get_json(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         """Make a GET request and return JSON response with throttling."""
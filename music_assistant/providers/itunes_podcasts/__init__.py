@@ -128,6 +128,12 @@ class ITunesPodcastsProvider(MusicProvider):
         # For streaming providers return True here but for local file based providers return False.
         return True
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """Return the number of seconds the audio may be kept in the audio cache."""
+        # publicly available podcast episodes, cached for 30 days
+        return 30 * 24 * 3600
+
     async def handle_async_init(self) -> None:
         """Handle async initialization of the provider."""
         self.max_episodes = int(str(self.config.get_value(CONF_NUM_EPISODES)))
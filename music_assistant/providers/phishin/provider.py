@@ -60,6 +60,12 @@ class PhishInProvider(MusicProvider):
         """Return True if the provider is a streaming provider."""
         return True
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """Return the number of seconds the audio may be kept in the audio cache."""
+        # freely distributable (taper friendly) recordings, cached for 30 days
+        return 30 * 24 * 3600
+
     async def search(
         self,
         search_query: str,
@@ -123,6 +123,12 @@ class PodcastMusicprovider(MusicProvider):
         """
         return False
 
+    @property
+    def audio_cache_expiration(self) -> int:
+        """Return the number of seconds the audio may be kept in the audio cache."""
+        # publicly available podcast episodes, cached for 30 days
+        return 30 * 24 * 3600
+
     @property
     def instance_name_postfix(self) -> str | None:
         """Return a (default) instance name postfix for this provider instance."""
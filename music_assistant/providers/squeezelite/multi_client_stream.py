@@ -7,7 +7,7 @@ from contextlib import suppress
 
 from music_assistant_models.media_items import AudioFormat
 
-from music_assistant.helpers.ffmpeg import get_ffmpeg_stream
+from music_assistant.helpers.encoder_fanout import EncoderFanOut
 from music_assistant.helpers.util import empty_queue
 
 LOGGER = logging.getLogger(__name__)
@@ -27,8 +27,17 @@ class MultiClientStream:
         self.audio_format = audio_format
         self.subscribers: list[asyncio.Queue[bytes]] = []
         self.expected_clients = expected_clients
+        # clients with the same output format and filter params share a single encoder
+        self._encoders = EncoderFanOut(self.subscribe_raw, audio_format)
         self.task = asyncio.create_task(self._runner())
 
+    @property
+    def client_count(self) -> int:
+        """Return the number of connected clients."""
+        # each (shared) encoder is a single raw subscriber
+        encoders = self._encoders
+        return len(self.subscribers) - encoders.encoder_count + encoders.subscriber_count
+
     @property
     def done(self) -> bool:
         """Return if this stream is already done."""
@@ -50,12 +59,7 @@ class MultiClientStream:
         filter_params: list[str] | None = None,
     ) -> AsyncGenerator[bytes, None]:
         """Get (client specific encoded) ffmpeg stream."""
-        async for chunk in get_ffmpeg_stream(
-            audio_input=self.subscribe_raw(),
-            input_format=self.audio_format,
-            output_format=output_format,
-            filter_params=filter_params,
-        ):
+        async for chunk in self._encoders.get_stream(output_format, filter_params):
             yield chunk
 
     async def subscribe_raw(self) -> AsyncGenerator[bytes, None]:
@@ -80,11 +84,11 @@ class MultiClientStream:
         while count < 50:
             await asyncio.sleep(0.1)
             count += 1
-            if len(self.subscribers) >= expected_clients:
+            if self.client_count >= expected_clients:
                 break
         LOGGER.debug(
             "Starting multi-client stream with %s/%s clients",
-            len(self.subscribers),
+            self.client_count,
             self.expected_clients,
         )
         async for chunk in self.audio_source:
@@ -100,3 +104,4 @@ class MultiClientStream:
             )
         # EOF: send empty chunk
         await asyncio.gather(*[sub.put(b"") for sub in self.subscribers], return_exceptions=True)
+        self._encoders.log_stats("Multi-client stream")
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from music_assistant_models.media_items import AudioFormat
 
+from music_assistant.helpers.encoder_fanout import EncoderFanOut
 from music_assistant.helpers.ffmpeg import get_ffmpeg_stream
 from music_assistant.helpers.util import empty_queue
 
@@ -26,7 +27,8 @@ class UGPStream:
 
     Stream handler for Universal Groups, managing audio distribution to group members.
     Essentially, it multicasts an audio source to multiple client streams, allowing individual
-    filter_params for each client.
+    filter_params for each client. Clients with the same output format and filter_params
+    share a single encoder.
     """
 
     def __init__(
@@ -42,6 +44,7 @@ class UGPStream:
         self.subscribers: list[Callable[[bytes], Awaitable[None]]] = []
         self._task: asyncio.Task[None] | None = None
         self._done: asyncio.Event = asyncio.Event()
+        self._encoders = EncoderFanOut(self.subscribe_raw, base_pcm_format)
 
     @property
     def done(self) -> bool:
@@ -84,13 +87,7 @@ class UGPStream:
         self, output_format: AudioFormat, filter_params: list[str] | None = None
     ) -> AsyncGenerator[bytes, None]:
         """Subscribe to the client specific audio stream."""
-        # start the runner as soon as the (first) client connects
-        async for chunk in get_ffmpeg_stream(
-            audio_input=self.subscribe_raw(),
-            input_format=self.base_pcm_format,
-            output_format=output_format,
-            filter_params=filter_params,
-        ):
+        async for chunk in self._encoders.get_stream(output_format, filter_params):
             yield chunk
 
     async def _runner(self) -> None:
@@ -110,3 +107,4 @@ class UGPStream:
         # empty chunk when done
         await asyncio.gather(*[sub(b"") for sub in self.subscribers], return_exceptions=True)
         self._done.set()
+        self._encoders.log_stats("UGP stream")
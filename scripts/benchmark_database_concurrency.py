@@ -0,0 +1,105 @@
+"""
+Benchmark concurrent database access: single (exclusive) connection versus a read pool.
+
+Simulates a library sync (batched writes of tracks) while a number of clients browse the
+library (paged listing queries) at the same time and reports the latency of the reads
+and the throughput of the writes, with and without the pool of read-only connections.
+
+Usage: python scripts/benchmark_database_concurrency.py [number of browsing clients]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from music_assistant.helpers.database import DatabaseConnection
+
+# ruff: noqa: D103, T201
+
+INITIAL_TRACKS = 100000
+SYNC_TRACKS = 2000
+READ_POOL_SIZES = (0, 3)
+
+
+async def create_library(db: DatabaseConnection) -> None:
+    await db.execute(
+        "CREATE TABLE tracks([item_id] INTEGER PRIMARY KEY, [name] TEXT, [sort_name] TEXT, "
+        "[duration] INTEGER, [metadata] json)"
+    )
+    await db.execute("CREATE INDEX tracks_sort_name_idx ON tracks(sort_name)")
+    await db.insert_many("tracks", (_random_track() for _ in range(INITIAL_TRACKS)))
+
+
+def _random_track() -> dict[str, object]:
+    name = f"track {random.random()}"
+    return {"name": name, "sort_name": name, "duration": 180, "metadata": '{"images": []}'}
+
+
+async def sync(db: DatabaseConnection) -> float:
+    """Match and write tracks one by one (like a provider sync does), return the duration."""
+    start = time.perf_counter()
+    async with db.batch():
+        for _ in range(SYNC_TRACKS):
+            track = _random_track()
+            # lookup of an existing (matching) library item, which is not always indexed
+            await db.get_rows_from_query(
+                "SELECT item_id FROM tracks WHERE name = :name OR duration = :duration",
+                {"name": track["name"], "duration": 0},
+                limit=1,
+            )
+            await db.insert("tracks", track)
+    return time.perf_counter() - start
+
+
+async def browse(db: DatabaseConnection, stop: asyncio.Event, latencies: list[float]) -> None:
+    """Page through the library (like the frontend does) until the sync is done."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await db.get_rows_from_query(
+            "SELECT * FROM tracks ORDER BY sort_name",
+            limit=50,
+            offset=random.randint(0, INITIAL_TRACKS - 50),
+        )
+        await db.get_count("tracks")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def run(db_path: Path, read_pool_size: int, clients: int) -> None:
+    db = DatabaseConnection(str(db_path), read_pool_size=read_pool_size)
+    await db.setup()
+    await create_library(db)
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    # browse clients are started outside of the batch of the sync
+    browse_tasks = [asyncio.create_task(browse(db, stop, latencies)) for _ in range(clients)]
+    sync_time = await sync(db)
+    stop.set()
+    await asyncio.gather(*browse_tasks)
+    await db.close()
+    latencies.sort()
+    print(
+        f"{read_pool_size:>10}{SYNC_TRACKS / sync_time:>14.0f}{len(latencies):>8}"
+        f"{statistics.median(latencies) * 1000:>10.1f}"
+        f"{latencies[int(len(latencies) * 0.95)] * 1000:>10.1f}{latencies[-1] * 1000:>10.1f}"
+    )
+
+
+async def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"Syncing {SYNC_TRACKS} tracks while {clients} clients browse the library...")
+    print(
+        f"{'read pool':>10}{'writes/s':>14}{'reads':>8}"
+        f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}"
+    )
+    for read_pool_size in READ_POOL_SIZES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            await run(Path(tmp_dir) / "library.db", read_pool_size, clients)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
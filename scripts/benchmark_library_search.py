@@ -0,0 +1,103 @@
+"""
+Benchmark library search: LIKE table scan versus the FTS5 full-text search index.
+
+Creates a synthetic library database with the given number of tracks and compares
+the (old) `search_name LIKE '%term%'` query with the ranked FTS5 prefix match.
+
+Usage: python scripts/benchmark_library_search.py [number of tracks]
+"""
+
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from music_assistant.helpers.compare import create_safe_string
+from music_assistant.helpers.database import fts_match_query
+
+# ruff: noqa: D103, T201
+
+SEARCH_TERMS = ("love", "the be", "night", "dancing queen", "zz", "a")
+RUNS = 5
+
+
+def _random_words(count: int) -> str:
+    return " ".join(
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 9)))
+        for _ in range(count)
+    )
+
+
+def create_library(db: sqlite3.Connection, track_count: int) -> None:
+    db.execute(
+        "CREATE TABLE tracks(item_id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT, "
+        "search_name TEXT, search_sort_name TEXT)"
+    )
+    db.execute("CREATE INDEX tracks_name_nocase_idx ON tracks(search_name)")
+    db.execute(
+        "CREATE VIRTUAL TABLE tracks_fts USING fts5(name, sort_name, artists, album, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    db.execute(
+        "INSERT INTO tracks_fts(tracks_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 1.0)')"
+    )
+    known_names = ("Love Me Do", "The Beatles Medley", "Night Fever", "Dancing Queen")
+    rows = []
+    for item_id in range(1, track_count + 1):
+        name = random.choice(known_names) if item_id % 1000 == 0 else _random_words(3)
+        rows.append((item_id, name, name, create_safe_string(name, True, True)))
+    db.executemany(
+        "INSERT INTO tracks(item_id, name, sort_name, search_name, search_sort_name) "
+        "VALUES (?, ?, ?, ?, ?4)",
+        rows,
+    )
+    db.executemany(
+        "INSERT INTO tracks_fts(rowid, name, sort_name, artists, album) VALUES (?, ?, ?, ?, ?)",
+        ((item_id, name, name, _random_words(2), _random_words(2)) for item_id, name, *_ in rows),
+    )
+    db.commit()
+
+
+def _timed(db: sqlite3.Connection, query: str, params: dict[str, str]) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        count = len(db.execute(query, params).fetchall())
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    track_count = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = sqlite3.connect(Path(tmp_dir) / "library.db")
+        print(f"Creating synthetic library with {track_count} tracks...")
+        create_library(db, track_count)
+        like_query = (
+            "SELECT item_id FROM tracks WHERE search_name LIKE :search "
+            "ORDER BY search_sort_name LIMIT 25"
+        )
+        fts_query = (
+            "SELECT tracks.item_id FROM tracks JOIN (SELECT rowid AS fts_item_id, "
+            "rank AS fts_rank FROM tracks_fts WHERE tracks_fts MATCH :fts_query) AS fts_match "
+            "ON fts_match.fts_item_id = tracks.item_id ORDER BY fts_match.fts_rank LIMIT 25"
+        )
+        print(f"{'search':<16}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'speedup':>10}")
+        for term in SEARCH_TERMS:
+            like_time, _ = _timed(
+                db, like_query, {"search": f"%{create_safe_string(term, True, True)}%"}
+            )
+            fts_time, _ = _timed(db, fts_query, {"fts_query": fts_match_query(term) or ""})
+            print(
+                f"{term:<16}{like_time * 1000:>12.2f}{fts_time * 1000:>12.2f}"
+                f"{like_time / max(fts_time, 1e-9):>9.1f}x"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
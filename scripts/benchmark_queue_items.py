@@ -0,0 +1,78 @@
+"""
+Benchmark queue item lookups: linear scan versus the indexed QueueItems list.
+
+Creates a queue with the given number of items and compares the lookup of items
+by queue_item_id (as done for every progress report, next track and buffer update)
+with a plain list (linear scan) and the QueueItems list (id to index map), both for
+lookups only and for lookups mixed with the typical queue mutations (insert, move, delete).
+
+Usage: python scripts/benchmark_queue_items.py [number of items]
+"""
+
+import random
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from music_assistant.helpers.queue_items import QueueItems
+
+# ruff: noqa: D103, T201
+
+LOOKUPS = 2000
+
+
+@dataclass
+class Item:
+    """Minimal stand-in for a QueueItem."""
+
+    queue_item_id: str
+
+
+def linear_index(items: list[Item], queue_item_id: str) -> int | None:
+    for index, item in enumerate(items):
+        if item.queue_item_id == queue_item_id:
+            return index
+    return None
+
+
+def indexed_index(items: list[Item], queue_item_id: str) -> int | None:
+    assert isinstance(items, QueueItems)
+    return items.index_of(queue_item_id)
+
+
+def _run(
+    items: list[Item], index_func: Callable[[list[Item], str], int | None], mutate: bool
+) -> float:
+    rnd = random.Random(0)
+    start = time.perf_counter()
+    for lookup in range(LOOKUPS):
+        if mutate and lookup % 10 == 0:
+            # one mutation every 10 lookups: insert, move or delete an item
+            action = lookup // 10 % 3
+            if action == 0:
+                items.insert(rnd.randrange(len(items)), Item(uuid.uuid4().hex))
+            elif action == 1:
+                items.insert(rnd.randrange(len(items)), items.pop(rnd.randrange(len(items))))
+            else:
+                items.pop(rnd.randrange(len(items)))
+        # most lookups are for items near the current index, somewhere in the queue
+        item = items[rnd.randrange(len(items))]
+        assert index_func(items, item.queue_item_id) is not None
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    base_items = [Item(uuid.uuid4().hex) for _ in range(item_count)]
+    print(f"{LOOKUPS} lookups in a queue of {item_count} items")
+    print(f"{'scenario':<24}{'list (ms)':>12}{'indexed (ms)':>14}{'speedup':>10}")
+    for scenario, mutate in (("lookups", False), ("lookups + mutations", True)):
+        before = _run(list(base_items), linear_index, mutate)
+        after = _run(QueueItems(base_items), indexed_index, mutate)  # type: ignore[arg-type]
+        print(f"{scenario:<24}{before * 1000:>12.1f}{after * 1000:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
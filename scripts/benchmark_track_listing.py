@@ -0,0 +1,195 @@
+"""
+Benchmark track listing: correlated json subqueries versus the denormalized track_view table.
+
+Creates a synthetic library database with the given number of tracks and compares
+fetching (and json decoding) 500-row pages with the (old) base query, which builds the
+provider mappings, artists and album of every row with correlated subqueries,
+with the base query which looks up the pre-serialized row of the track_view table.
+
+Usage: python scripts/benchmark_track_listing.py [number of tracks]
+"""
+
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from music_assistant.controllers.media.tracks import TRACK_VIEW_QUERY
+from music_assistant.helpers.json import json_loads
+
+# ruff: noqa: D103, E501, T201
+
+PAGE_SIZE = 500
+RUNS = 5
+
+OLD_BASE_QUERY = """
+    SELECT
+        tracks.*,
+        (SELECT JSON_GROUP_ARRAY(
+            json_object(
+            'item_id', track_pm.provider_item_id,
+                'provider_domain', track_pm.provider_domain,
+                    'provider_instance', track_pm.provider_instance,
+                    'available', track_pm.available,
+                    'audio_format', json(track_pm.audio_format),
+                    'url', track_pm.url,
+                    'details', track_pm.details,
+                    'in_library', track_pm.in_library,
+                    'is_unique', track_pm.is_unique
+            )) FROM provider_mappings track_pm WHERE track_pm.item_id = tracks.item_id AND track_pm.media_type = 'track') AS provider_mappings,
+        (SELECT JSON_GROUP_ARRAY(
+            json_object(
+            'item_id', artists.item_id,
+            'provider', 'library',
+                'name', artists.name,
+                'sort_name', artists.sort_name,
+                'media_type', 'artist'
+            )) FROM artists JOIN track_artists on track_artists.track_id = tracks.item_id  WHERE artists.item_id = track_artists.artist_id) AS artists,
+        (SELECT
+            json_object(
+            'item_id', albums.item_id,
+            'provider', 'library',
+                'name', albums.name,
+                'sort_name', albums.sort_name,
+                'media_type', 'album',
+                'disc_number', album_tracks.disc_number,
+                'track_number', album_tracks.track_number,
+                'images', json_extract(albums.metadata, '$.images')
+            ) FROM albums WHERE albums.item_id = album_tracks.album_id) AS track_album
+        FROM tracks
+        LEFT JOIN album_tracks on album_tracks.track_id = tracks.item_id
+"""
+NEW_BASE_QUERY = """
+    SELECT
+        tracks.*,
+        (SELECT track_view.data FROM track_view
+            WHERE track_view.track_id = tracks.item_id
+            AND track_view.album_id = IFNULL(album_tracks.album_id, 0)
+        ) AS track_view
+        FROM tracks
+        LEFT JOIN album_tracks on album_tracks.track_id = tracks.item_id
+"""
+PAGE_QUERIES = {
+    "first page": "GROUP BY tracks.item_id ORDER BY tracks.search_sort_name LIMIT 500",
+    "deep page": "GROUP BY tracks.item_id ORDER BY tracks.search_sort_name LIMIT 500 OFFSET 50000",
+    "recent": "GROUP BY tracks.item_id ORDER BY tracks.timestamp_added DESC LIMIT 500",
+}
+
+
+def create_library(db: sqlite3.Connection, track_count: int) -> None:
+    db.executescript(
+        """
+        CREATE TABLE artists(item_id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT);
+        CREATE TABLE albums(item_id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT, metadata json);
+        CREATE TABLE tracks(item_id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT,
+            metadata json, external_ids json, search_sort_name TEXT, timestamp_added INTEGER);
+        CREATE INDEX tracks_search_sort_name_idx ON tracks(search_sort_name);
+        CREATE INDEX tracks_timestamp_added_idx ON tracks(timestamp_added);
+        CREATE TABLE provider_mappings(media_type TEXT, item_id INTEGER, provider_domain TEXT,
+            provider_instance TEXT, provider_item_id TEXT, available BOOLEAN,
+            in_library BOOLEAN, is_unique BOOLEAN, url TEXT, audio_format json, details TEXT);
+        CREATE INDEX provider_mappings_media_type_item_id_idx
+            ON provider_mappings(media_type, item_id);
+        CREATE TABLE track_artists(track_id INTEGER, artist_id INTEGER);
+        CREATE INDEX track_artists_track_id_idx ON track_artists(track_id);
+        CREATE TABLE album_tracks(id INTEGER PRIMARY KEY, track_id INTEGER, album_id INTEGER,
+            disc_number INTEGER, track_number INTEGER, UNIQUE(track_id, album_id));
+        CREATE TABLE track_view(track_id INTEGER NOT NULL, album_id INTEGER NOT NULL,
+            data json NOT NULL, PRIMARY KEY(track_id, album_id)) WITHOUT ROWID;
+        """
+    )
+    album_count = max(track_count // 12, 1)
+    artist_count = max(track_count // 40, 1)
+    image = {"type": "thumb", "path": "https://example.com/cover.jpg", "provider": "builtin"}
+    db.executemany(
+        "INSERT INTO artists VALUES (?, ?, ?)",
+        ((i, f"Artist {i}", f"artist {i}") for i in range(1, artist_count + 1)),
+    )
+    db.executemany(
+        "INSERT INTO albums VALUES (?, ?, ?, ?)",
+        (
+            (i, f"Album {i}", f"album {i}", json.dumps({"images": [image]}))
+            for i in range(1, album_count + 1)
+        ),
+    )
+    db.executemany(
+        "INSERT INTO tracks VALUES (?, ?, ?, '{}', '[]', ?, ?)",
+        (
+            (i, f"Track {i}", f"track {i}", f"track{random.random()}", random.randint(0, 10**9))
+            for i in range(1, track_count + 1)
+        ),
+    )
+    audio_format = json.dumps({"content_type": "flac", "sample_rate": 44100, "bit_depth": 16})
+    db.executemany(
+        "INSERT INTO provider_mappings VALUES ('track', ?, 'filesystem_local', "
+        "'filesystem_local--1', ?, 1, 1, 0, NULL, ?, NULL)",
+        ((i, f"/music/{i}.flac", audio_format) for i in range(1, track_count + 1)),
+    )
+    db.executemany(
+        "INSERT INTO track_artists VALUES (?, ?)",
+        ((i, random.randint(1, artist_count)) for i in range(1, track_count + 1)),
+    )
+    db.executemany(
+        "INSERT INTO album_tracks(track_id, album_id, disc_number, track_number) "
+        "VALUES (?, ?, 1, ?)",
+        ((i, 1 + i // 12, 1 + i % 12) for i in range(1, track_count + 1)),
+    )
+    start = time.perf_counter()
+    db.execute(f"INSERT INTO track_view(track_id, album_id, data) {TRACK_VIEW_QUERY}")
+    db.commit()
+    print(f"Populated track_view in {time.perf_counter() - start:.2f} seconds")
+
+
+def _decode_old(row: sqlite3.Row) -> dict[str, object]:
+    result = dict(row)
+    for key in ("metadata", "external_ids", "provider_mappings", "artists", "track_album"):
+        if raw_value := result[key]:
+            result[key] = json_loads(raw_value)
+    return result
+
+
+def _decode_new(row: sqlite3.Row) -> dict[str, object]:
+    result = dict(row)
+    for key in ("metadata", "external_ids"):
+        if raw_value := result[key]:
+            result[key] = json_loads(raw_value)
+    if raw_track_view := result.pop("track_view"):
+        result.update(json_loads(raw_track_view))
+    return result
+
+
+def _timed(db: sqlite3.Connection, query: str, decode: object) -> float:
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        rows = db.execute(query).fetchall()
+        assert len(rows) == PAGE_SIZE
+        for row in rows:
+            decode(row)  # type: ignore[operator]
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    track_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = sqlite3.connect(Path(tmp_dir) / "library.db")
+        db.row_factory = sqlite3.Row
+        print(f"Creating synthetic library with {track_count} tracks...")
+        create_library(db, track_count)
+        print(f"{'page':<16}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+        for name, page_query in PAGE_QUERIES.items():
+            old_time = _timed(db, f"{OLD_BASE_QUERY} {page_query}", _decode_old)
+            new_time = _timed(db, f"{NEW_BASE_QUERY} {page_query}", _decode_new)
+            print(
+                f"{name:<16}{old_time * 1000:>14.2f}{new_time * 1000:>14.2f}"
+                f"{old_time / max(new_time, 1e-9):>9.1f}x"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
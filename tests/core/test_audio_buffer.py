@@ -0,0 +1,41 @@
+"""Tests for the (PCM) audio buffer."""
+
+import asyncio
+
+from music_assistant_models.enums import ContentType
+from music_assistant_models.media_items import AudioFormat
+
+from music_assistant.helpers.audio_buffer import AudioBuffer
+
+
+async def test_audio_buffer_spill_to_disk() -> None:
+    """Test that the oldest chunks are spilled to disk when over the memory limit."""
+    pcm_format = AudioFormat(
+        content_type=ContentType.PCM_S16LE, sample_rate=8000, bit_depth=16, channels=1
+    )
+    chunk_size = pcm_format.pcm_sample_size
+    AudioBuffer.memory_limit = chunk_size * 15
+    try:
+        audio_buffer = AudioBuffer(pcm_format, "test", max_size_seconds=20)
+        for idx in range(20):
+            await audio_buffer.put(bytes([idx]) * chunk_size)
+        # the oldest chunks are spilled to disk, the most recent ones are kept in memory
+        assert audio_buffer.seconds_available == 20
+        assert audio_buffer.memory_bytes == chunk_size * 15
+        # spilled chunks can be read back (seek)
+        assert await audio_buffer.get(3) == bytes([3]) * chunk_size
+
+        async def produce() -> None:
+            for idx in range(20, 50):
+                await audio_buffer.put(bytes([idx]) * chunk_size)
+            await audio_buffer.set_eof()
+
+        producer = asyncio.create_task(produce())
+        received = [chunk[0] async for chunk in audio_buffer.iter(seek_position=3)]
+        await producer
+        assert received == list(range(3, 50))
+        assert audio_buffer.memory_bytes <= chunk_size * 15
+        await audio_buffer.clear()
+        assert audio_buffer.memory_bytes == 0
+    finally:
+        AudioBuffer.memory_limit = 0
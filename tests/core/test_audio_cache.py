@@ -0,0 +1,132 @@
+"""Tests for the (on-disk) audio cache."""
+
+import pathlib
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from music_assistant_models.enums import MediaType, StreamType
+
+from music_assistant.constants import DB_TABLE_AUDIO_CACHE
+from music_assistant.helpers.audio_cache import AudioCache
+from music_assistant.helpers.database import DatabaseConnection
+
+
+@dataclass
+class _StreamDetails:
+    """Minimal stand-in for StreamDetails."""
+
+    uri: str
+    provider: str = "streaming"
+    media_type: MediaType = MediaType.TRACK
+    stream_type: StreamType = StreamType.HTTP
+    duration: int | None = 180
+    decryption_key: str | None = None
+    path: Any = field(default="https://example.com/audio")
+
+
+async def _get_audio_cache(tmp_path: pathlib.Path) -> tuple[AudioCache, DatabaseConnection]:
+    db = DatabaseConnection(str(tmp_path / "cache.db"))
+    await db.setup()
+    await db.execute(
+        f"""CREATE TABLE {DB_TABLE_AUDIO_CACHE}(
+                [key] TEXT PRIMARY KEY,
+                [uri] TEXT NOT NULL,
+                [size] INTEGER NOT NULL,
+                [last_access] INTEGER NOT NULL,
+                [expires] INTEGER NOT NULL
+                )"""
+    )
+    providers = {
+        "streaming": SimpleNamespace(audio_cache_expiration=3600),
+        "nocache": SimpleNamespace(audio_cache_expiration=0),
+    }
+    mass = SimpleNamespace(cache=SimpleNamespace(database=db), get_provider=providers.get)
+    return AudioCache(mass, str(tmp_path / "audio_cache")), db  # type: ignore[arg-type]
+
+
+async def _store(cache: AudioCache, streamdetails: _StreamDetails, size: int) -> None:
+    temp_path = await cache.start_write(streamdetails)  # type: ignore[arg-type]
+    assert temp_path is not None
+    pathlib.Path(temp_path).write_bytes(b"x" * size)
+    await cache.finish_write(streamdetails, temp_path, complete=True)  # type: ignore[arg-type]
+
+
+async def test_audio_cache(tmp_path: pathlib.Path) -> None:
+    """Test storing, looking up and evicting cached audio files."""
+    cache, db = await _get_audio_cache(tmp_path)
+    try:
+        await cache.setup(enabled=True, max_size=300)
+        track1, track2, track3 = (_StreamDetails(f"streaming://track/{x}") for x in range(3))
+        assert cache.is_cacheable(track1)  # type: ignore[arg-type]
+        # encrypted streams and providers that do not allow caching are never cached
+        encrypted = _StreamDetails("x", stream_type=StreamType.ENCRYPTED_HTTP)
+        assert not cache.is_cacheable(encrypted)  # type: ignore[arg-type]
+        assert not cache.is_cacheable(_StreamDetails("x", provider="nocache"))  # type: ignore[arg-type]
+        assert await cache.get(track1) is None  # type: ignore[arg-type]
+        await _store(cache, track1, 100)
+        await _store(cache, track2, 100)
+        # an incomplete play is not stored
+        temp_path = await cache.start_write(track3)  # type: ignore[arg-type]
+        assert temp_path is not None
+        # a track is written only once at a time
+        assert await cache.start_write(track3) is None  # type: ignore[arg-type]
+        pathlib.Path(temp_path).write_bytes(b"x" * 50)
+        await cache.finish_write(track3, temp_path, complete=False)  # type: ignore[arg-type]
+        assert not pathlib.Path(temp_path).exists()
+        assert await cache.get(track3) is None  # type: ignore[arg-type]
+        # access track1 so track2 becomes the least recently used file
+        assert (cache_path := await cache.get(track1)) is not None  # type: ignore[arg-type]
+        assert pathlib.Path(cache_path).stat().st_size == 100
+        await _store(cache, track3, 150)
+        assert await cache.get(track2) is None  # type: ignore[arg-type]
+        assert await cache.get(track1) is not None  # type: ignore[arg-type]
+        stats = await cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] == 250
+        assert stats["evictions"] == 1
+        assert stats["stores"] == 3
+
+        # the index is restored from the database (and stale files are removed)
+        stale_file = tmp_path / "audio_cache" / "stale.part"
+        stale_file.write_bytes(b"x")
+        cache2 = AudioCache(cache.mass, cache.cache_dir)
+        await cache2.setup(enabled=True, max_size=300)
+        assert cache2.size == 250
+        assert await cache2.get(track3) is not None  # type: ignore[arg-type]
+        assert not stale_file.exists()
+        # a disabled cache frees its disk space
+        await cache2.setup(enabled=False, max_size=300)
+        assert cache2.size == 0
+        assert not any(pathlib.Path(cache2.cache_dir).iterdir())
+    finally:
+        await db.close()
+
+
+@pytest.mark.parametrize(
+    ("media_type", "cacheable"),
+    [
+        (MediaType.TRACK, True),
+        (MediaType.PODCAST_EPISODE, True),
+        (MediaType.AUDIOBOOK, True),
+        (MediaType.RADIO, False),
+    ],
+)
+async def test_audio_cache_media_types(
+    tmp_path: pathlib.Path, media_type: MediaType, cacheable: bool
+) -> None:
+    """Test which media types are cached (and can be looked up)."""
+    cache, db = await _get_audio_cache(tmp_path)
+    try:
+        await cache.setup(enabled=True, max_size=300)
+        streamdetails = _StreamDetails("streaming://item/1", media_type=media_type)
+        assert cache.is_cacheable(streamdetails) is cacheable  # type: ignore[arg-type]
+        if cacheable:
+            await _store(cache, streamdetails, 100)
+            assert await cache.get(streamdetails) is not None  # type: ignore[arg-type]
+        # multi-file streams (e.g. audiobooks of multiple files) are never cached
+        multi_file = _StreamDetails("streaming://item/2", media_type=media_type, path=["a", "b"])
+        assert not cache.is_cacheable(multi_file)  # type: ignore[arg-type]
+    finally:
+        await db.close()
@@ -0,0 +1,152 @@
+"""Tests for the cache controller and its in-memory cache."""
+
+import logging
+import pathlib
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from music_assistant.constants import DB_TABLE_CACHE
+from music_assistant.controllers.cache import (
+    CLEANUP_CHUNK_SIZE,
+    COMPRESS_THRESHOLD,
+    PAYLOAD_JSON,
+    CacheController,
+    MemoryCache,
+    decode_cache_data,
+    encode_cache_data,
+)
+
+
+def test_memory_cache_lru() -> None:
+    """Test that the least recently used item is evicted first."""
+    cache = MemoryCache(max_bytes=300)
+    cache.set("a", 1, size=100)
+    cache.set("b", 2, size=100)
+    cache.set("c", 3, size=100)
+    # access "a" so "b" becomes the least recently used item
+    assert cache.get("a") == 1
+    cache.set("d", 4, size=100)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.size == 300
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_byte_budget() -> None:
+    """Test that the cache is bounded by the size of its items."""
+    cache = MemoryCache(max_bytes=1000)
+    for idx in range(10):
+        cache.set(f"small{idx}", idx, size=10)
+    cache.set("large", "x", size=950)
+    assert cache.size <= 1000
+    assert "large" in cache
+    assert len(cache) == 6
+    # items larger than the budget are not stored at all
+    cache.set("huge", "x", size=2000)
+    assert "huge" not in cache
+    assert "large" in cache
+
+
+def test_memory_cache_group_quota() -> None:
+    """Test that a single group can not use more than its share of the cache."""
+    cache = MemoryCache(max_bytes=1000, group_quota=0.5)
+    cache.set("other", 0, size=400, group="provider2/0")
+    for idx in range(10):
+        cache.set(f"item{idx}", idx, size=100, group="provider1/0")
+    stats = cache.stats()
+    assert stats["groups"]["provider1/0"]["bytes"] == 500
+    assert "other" in cache
+    assert "item9" in cache
+    assert "item4" not in cache
+    cache.pop("other")
+    assert "provider2/0" not in cache.stats()["groups"]
+    cache.clear()
+    assert cache.size == 0
+    assert len(cache) == 0
+
+
+def test_memory_cache_group_quota_evict_all() -> None:
+    """Test replacing all items of a group to make room within its quota."""
+    cache = MemoryCache(max_bytes=1000, group_quota=0.5)
+    cache.set("a", 1, size=300, group="g")
+    cache.set("b", 2, size=300, group="g")
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    assert cache.stats()["groups"]["g"] == {"entries": 1, "bytes": 300}
+    assert cache.pop("b") == 2
+    assert "g" not in cache.stats()["groups"]
+    assert cache.size == 0
+
+
+def test_cache_data_encoding() -> None:
+    """Test the (binary) encoding of cache payloads."""
+    small = {"name": "test", "items": [1, 2, 3]}
+    payload, size = encode_cache_data(small)
+    assert payload[:1] == PAYLOAD_JSON
+    assert decode_cache_data(payload) == (small, size)
+    # large payloads are stored compressed
+    large = [{"name": f"Track {idx}", "artist": "Artist"} for idx in range(1000)]
+    payload, size = encode_cache_data(large)
+    assert size > COMPRESS_THRESHOLD
+    assert len(payload) < size
+    assert decode_cache_data(payload) == (large, size)
+    # legacy records are stored as json text
+    assert decode_cache_data('{"name": "test"}')[0] == {"name": "test"}
+
+
+async def _get_cache_controller(cache_path: pathlib.Path) -> CacheController:
+    """Return a cache controller (without the MusicAssistant server) with its database."""
+    controller = CacheController.__new__(CacheController)
+    controller.mass = SimpleNamespace(cache_path=str(cache_path))  # type: ignore[assignment]
+    controller.logger = logging.getLogger(__name__)
+    controller.config = SimpleNamespace(get_value=lambda _key: None)  # type: ignore[assignment]
+    controller.database = None
+    controller._mem_cache = MemoryCache(max_bytes=1024 * 1024)
+    await controller._setup_database()
+    return controller
+
+
+async def test_auto_cleanup(tmp_path: pathlib.Path) -> None:
+    """Test that the cleanup removes (only) the expired records, in chunks."""
+    controller = await _get_cache_controller(tmp_path)
+    assert controller.database is not None
+    try:
+        now = int(time.time())
+        expired_count = CLEANUP_CHUNK_SIZE * 2 + 100
+        await controller.database.execute(
+            f"WITH RECURSIVE seq(idx) AS (SELECT 1 UNION ALL SELECT idx + 1 FROM seq "
+            f"WHERE idx < {expired_count}) "
+            f"INSERT INTO {DB_TABLE_CACHE}(key, provider, expires, data) "
+            f"SELECT 'expired' || idx, 'test', {now - 60}, NULL FROM seq"
+        )
+        for idx in range(10):
+            await controller.set(f"live{idx}", idx, provider="test")
+        controller._mem_cache.set("test/0/expired", ("data", None, now - 60))
+        controller._mem_cache.set("test/0/short", ("data", None, now + 60))
+        await controller.database.commit()
+
+        deleted_chunks: list[int] = []
+        delete_records = controller._CacheController__delete_records  # type: ignore[attr-defined]
+
+        async def count_deleted_records(*args: Any, **kwargs: Any) -> int:
+            removed = int(await delete_records(*args, **kwargs))
+            deleted_chunks.append(removed)
+            return removed
+
+        controller._CacheController__delete_records = count_deleted_records  # type: ignore[attr-defined]
+        await controller.auto_cleanup()
+
+        assert deleted_chunks == [CLEANUP_CHUNK_SIZE, CLEANUP_CHUNK_SIZE, 100, 0]
+        rows = await controller.database.get_rows(DB_TABLE_CACHE, limit=0)
+        assert sorted(row["key"] for row in rows) == [f"live{idx}" for idx in range(10)]
+        # the expired entries are removed from the memory cache as well
+        assert "test/0/expired" not in controller._mem_cache
+        assert "test/0/short" in controller._mem_cache
+        assert "test/0/live0" in controller._mem_cache
+        assert await controller.get("live0", provider="test") == 0
+    finally:
+        await controller.database.close()
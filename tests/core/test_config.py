@@ -0,0 +1,214 @@
+"""Tests for the (resolved) config snapshots of the config controller."""
+
+import logging
+import pathlib
+from collections.abc import Coroutine
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from music_assistant_models.dsp import DSPConfig
+from music_assistant_models.enums import ProviderType
+
+from music_assistant.controllers.config import ConfigController
+from music_assistant.controllers.players.player_controller import PlayerController
+from music_assistant.mass import MusicAssistant
+
+PLAYER_ID = "test_player"
+
+
+def _discard(coro: Coroutine[Any, Any, Any]) -> None:
+    """Discard the (scheduled) save to disk."""
+    coro.close()
+
+
+def _player(player_id: str = PLAYER_ID) -> Any:
+    """Return a stand-in for a Player."""
+    return SimpleNamespace(
+        player_id=player_id,
+        name="Test",
+        display_name="Test",
+        enabled=True,
+        available=True,
+        extra_data={},
+        group_members=[],
+        synced_to=None,
+        active_group=None,
+        state=SimpleNamespace(available=True),
+        set_config=Mock(),
+        on_config_updated=AsyncMock(),
+        on_unload=AsyncMock(),
+        update_state=Mock(),
+    )
+
+
+@pytest.fixture
+def mass(tmp_path: pathlib.Path) -> Any:
+    """Return a stand-in for the MusicAssistant server, with a config and player controller."""
+    mass = SimpleNamespace(
+        closing=False,
+        storage_path=str(tmp_path),
+        loop=SimpleNamespace(create_task=_discard, call_later=Mock()),
+        create_task=Mock(),
+        signal_event=Mock(),
+        cache=SimpleNamespace(get=AsyncMock(return_value=None)),
+        player_queues=SimpleNamespace(
+            on_player_register=AsyncMock(), on_player_remove=Mock(), on_player_update=Mock()
+        ),
+    )
+    config = ConfigController(mass)  # type: ignore[arg-type]
+    config.initialized = True
+    # every call resolves a new config object
+    config.get_player_config = AsyncMock(  # type: ignore[method-assign]
+        side_effect=lambda player_id: SimpleNamespace(player_id=player_id)
+    )
+    config.get_core_config = AsyncMock(  # type: ignore[method-assign]
+        side_effect=lambda domain: SimpleNamespace(domain=domain)
+    )
+    mass.config = config
+    players = PlayerController.__new__(PlayerController)
+    players.mass = mass  # type: ignore[assignment]
+    players.logger = logging.getLogger(__name__)
+    players._players = {PLAYER_ID: _player()}
+    players._player_throttlers = {}
+    players._poll_scheduler = Mock()
+    players._cleanup_player_memberships = AsyncMock()  # type: ignore[method-assign]
+    players._handle_group_dsp_change = Mock()  # type: ignore[method-assign]
+    mass.players = players
+    return mass
+
+
+async def test_player_config_snapshot(mass: Any) -> None:
+    """Test that the resolved config of a player is reused until it is invalidated."""
+    config: ConfigController = mass.config
+    snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    assert await config.get_player_config_snapshot(PLAYER_ID) is snapshot
+    assert config.get_player_config.call_count == 1  # type: ignore[attr-defined]
+    # invalidating (the snapshot of) another player keeps it
+    config.invalidate_config_snapshots("other_player")
+    assert await config.get_player_config_snapshot(PLAYER_ID) is snapshot
+    config.invalidate_config_snapshots(PLAYER_ID)
+    assert await config.get_player_config_snapshot(PLAYER_ID) is not snapshot
+
+
+async def test_player_config_snapshot_unavailable(mass: Any) -> None:
+    """Test that the snapshot of an unregistered player is never stored."""
+    config: ConfigController = mass.config
+    snapshot = await config.get_player_config_snapshot("unknown_player")
+    assert await config.get_player_config_snapshot("unknown_player") is not snapshot
+    assert not config._player_config_snapshots
+
+
+async def test_player_config_snapshot_invalidated_while_resolving(mass: Any) -> None:
+    """Test that a snapshot which got invalidated while it was resolved is discarded."""
+    config: ConfigController = mass.config
+
+    async def get_player_config(player_id: str) -> Any:
+        # e.g. the config is saved while the config entries are fetched
+        config.invalidate_config_snapshots()
+        return SimpleNamespace(player_id=player_id)
+
+    config.get_player_config = get_player_config  # type: ignore[method-assign,assignment]
+    await config.get_player_config_snapshot(PLAYER_ID)
+    assert not config._player_config_snapshots
+
+
+async def test_config_snapshots_save(mass: Any) -> None:
+    """Test that any save of the (player, DSP or core) config drops all snapshots."""
+    config: ConfigController = mass.config
+    mass.players.on_player_config_change = AsyncMock()
+    mass.players.on_player_dsp_change = AsyncMock()
+    mass.streams = SimpleNamespace(reload=AsyncMock())
+
+    player_snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    core_snapshot = await config.get_core_config_snapshot("streams")
+    assert await config.get_core_config_snapshot("streams") is core_snapshot
+    config.get_player_config.side_effect = lambda player_id: Mock(  # type: ignore[attr-defined]
+        player_id=player_id, **{"update.return_value": {"volume"}, "to_raw.return_value": {}}
+    )
+    await config.save_player_config(PLAYER_ID, {"volume": 50})
+    assert not config._player_config_snapshots
+    assert not config._core_config_snapshots
+
+    player_snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    await config.save_dsp_config(PLAYER_ID, DSPConfig())
+    assert await config.get_player_config_snapshot(PLAYER_ID) is not player_snapshot
+
+    player_snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    core_snapshot = await config.get_core_config_snapshot("streams")
+    config.get_core_config.side_effect = lambda domain: Mock(  # type: ignore[attr-defined]
+        domain=domain, **{"update.return_value": {"port"}, "to_raw.return_value": {}}
+    )
+    await config.save_core_config("streams", {"port": 8097})
+    assert await config.get_player_config_snapshot(PLAYER_ID) is not player_snapshot
+    assert await config.get_core_config_snapshot("streams") is not core_snapshot
+
+
+async def test_player_config_snapshot_register(mass: Any) -> None:
+    """Test that the snapshot is dropped when the player is (re)registered or unregistered."""
+    config: ConfigController = mass.config
+    players: PlayerController = mass.players
+
+    snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    await players.register_or_update(_player())
+    assert PLAYER_ID not in config._player_config_snapshots
+
+    await config.get_player_config_snapshot(PLAYER_ID)
+    await players.unregister(PLAYER_ID)
+    assert PLAYER_ID not in config._player_config_snapshots
+
+    # a snapshot resolved while the player is not registered is not stored
+    await config.get_player_config_snapshot(PLAYER_ID)
+    assert PLAYER_ID not in config._player_config_snapshots
+
+    await players.register(_player())
+    assert await config.get_player_config_snapshot(PLAYER_ID) is not snapshot
+    assert PLAYER_ID in config._player_config_snapshots
+
+
+async def test_player_config_snapshot_state_update(mass: Any) -> None:
+    """Test that the snapshot is dropped when the features or group members change."""
+    config: ConfigController = mass.config
+    players: PlayerController = mass.players
+    player = players._players[PLAYER_ID]
+
+    snapshot = await config.get_player_config_snapshot(PLAYER_ID)
+    players.signal_player_state_update(player, {"elapsed_time": (0, 10)}, skip_forward=True)
+    assert await config.get_player_config_snapshot(PLAYER_ID) is snapshot
+
+    changes: list[dict[str, tuple[Any, Any]]] = [
+        {"supported_features": (set(), {"enqueue"})},
+        {"group_members": ([], [PLAYER_ID, "other_player"])},
+    ]
+    for changed_values in changes:
+        players.signal_player_state_update(player, changed_values, skip_forward=True)
+        assert PLAYER_ID not in config._player_config_snapshots
+        await config.get_player_config_snapshot(PLAYER_ID)
+        assert PLAYER_ID in config._player_config_snapshots
+
+
+async def test_config_snapshots_provider_unload(mass: Any) -> None:
+    """Test that unloading a provider drops all snapshots."""
+    config: ConfigController = mass.config
+    server = MusicAssistant.__new__(MusicAssistant)
+    server.config = config
+    server.music = SimpleNamespace(unschedule_provider_sync=Mock())  # type: ignore[assignment]
+    server.signal_event = Mock()  # type: ignore[method-assign]
+    server._update_available_providers_cache = AsyncMock()  # type: ignore[method-assign]
+    provider = SimpleNamespace(
+        instance_id="test",
+        name="Test",
+        domain="test",
+        type=ProviderType.METADATA,
+        manifest=SimpleNamespace(mdns_discovery=None, depends_on=None),
+        unload=AsyncMock(),
+    )
+    server._providers = {"test": provider}  # type: ignore[dict-item]
+
+    await config.get_player_config_snapshot(PLAYER_ID)
+    await config.get_core_config_snapshot("streams")
+    await server.unload_provider("test")
+    provider.unload.assert_awaited_once()
+    assert not config._player_config_snapshots
+    assert not config._core_config_snapshots
@@ -0,0 +1,180 @@
+"""Tests for the database helpers."""
+
+import asyncio
+import contextvars
+import pathlib
+
+import pytest
+
+from music_assistant.helpers import database
+from music_assistant.helpers.database import UNSET, DatabaseConnection, fts_match_query
+
+
+def test_fts_match_query() -> None:
+    """Test building a FTS5 match expression from a search string."""
+    assert fts_match_query("beatles") == '"beatles"*'
+    assert fts_match_query("The Beatles - Yesterday") == '"The"* "Beatles"* "Yesterday"*'
+    # special characters can never end up as (invalid) fts query syntax
+    assert fts_match_query('AC/DC "live"') == '"AC"* "DC"* "live"*'
+    assert fts_match_query("Океан Ельзи") == '"Океан"* "Ельзи"*'
+    assert fts_match_query(" - ") is None
+    assert fts_match_query("love", ("name", "sort_name")) == '{name sort_name} : ("love"*)'
+
+
+async def test_iter_items(tmp_path: pathlib.Path) -> None:
+    """Test iterating all (matching) rows of a table in batches."""
+    db = DatabaseConnection(str(tmp_path / "test.db"))
+    await db.setup()
+    try:
+        await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [even] BOOLEAN)")
+        for item_id in range(1, 1201):
+            await db.insert("items", {"item_id": item_id, "even": item_id % 2 == 0})
+        item_ids = [row["item_id"] async for row in db.iter_items("items")]
+        assert item_ids == list(range(1, 1201))
+        even_rows = [row async for row in db.iter_items("items", {"even": True})]
+        assert [row["item_id"] for row in even_rows] == list(range(2, 1201, 2))
+        # the internal rowid used for seeking is not part of the returned rows
+        assert set(even_rows[0].keys()) == {"item_id", "even"}
+    finally:
+        await db.close()
+
+
+def _in_transaction(db: DatabaseConnection) -> bool:
+    """Return if the (write) connection has uncommitted writes."""
+    return db._db.in_transaction
+
+
+async def test_batch_writes(tmp_path: pathlib.Path) -> None:
+    """Test that writes within a batch are committed in (large) transactions."""
+    db = DatabaseConnection(str(tmp_path / "test.db"))
+    await db.setup()
+    try:
+        await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT)")
+        await db.commit()
+        await db.insert("items", {"item_id": 1, "name": "one"})
+        assert not _in_transaction(db)
+        async with db.batch():
+            await db.insert("items", {"item_id": 2, "name": "two"})
+            async with db.batch():
+                # nested batch does not commit on exit
+                await db.update("items", {"item_id": 2}, {"name": "TWO"})
+            assert _in_transaction(db)
+            await db.delete("items", {"item_id": 1})
+            assert _in_transaction(db)
+        assert not _in_transaction(db)
+        assert [dict(row) for row in await db.get_rows("items")] == [{"item_id": 2, "name": "TWO"}]
+    finally:
+        await db.close()
+
+
+async def test_batch_scope(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a batch only defers its own writes, and commits them in time."""
+    monkeypatch.setattr(database, "BATCH_COMMIT_INTERVAL", 0.1)
+    db = DatabaseConnection(str(tmp_path / "test.db"), read_pool_size=1)
+    await db.setup()
+    try:
+        await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT)")
+        await db.commit()
+        async with db.batch():
+            await db.insert("items", {"item_id": 1, "name": "one"})
+            assert _in_transaction(db)
+
+            async def _write_outside_batch() -> bool:
+                await db.insert("items", {"item_id": 2, "name": "two"})
+                # the write is committed immediately, so it is visible to the read pool
+                return await db.get_row("items", {"item_id": 2}) is not None
+
+            task = asyncio.create_task(_write_outside_batch(), context=contextvars.Context())
+            assert await task
+            assert not _in_transaction(db)
+            # pending writes of the batch are committed after BATCH_COMMIT_INTERVAL
+            await db.insert("items", {"item_id": 3, "name": "three"})
+            assert _in_transaction(db)
+            await asyncio.sleep(0.3)
+            assert not _in_transaction(db)
+    finally:
+        await db.close()
+
+
+async def test_bulk_writes(tmp_path: pathlib.Path) -> None:
+    """Test inserting/upserting multiple rows at once."""
+    db = DatabaseConnection(str(tmp_path / "test.db"))
+    await db.setup()
+    try:
+        await db.execute(
+            "CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT, "
+            "[count] INTEGER DEFAULT 0)"
+        )
+        await db.insert_many(
+            "items",
+            [
+                {"item_id": 1, "name": "one"},
+                {"item_id": 2, "name": "two", "count": UNSET},
+                {"item_id": 3, "name": "three", "count": 3},
+            ],
+        )
+        await db.upsert_many(
+            "items", [{"item_id": 1, "name": "ONE"}, {"item_id": 4, "name": "four", "count": 4}]
+        )
+        assert not _in_transaction(db)
+        rows = await db.get_rows("items", order_by="item_id")
+        assert [(row["item_id"], row["name"], row["count"]) for row in rows] == [
+            (1, "ONE", 0),
+            (2, "two", 0),
+            (3, "three", 3),
+            (4, "four", 4),
+        ]
+    finally:
+        await db.close()
+
+
+async def test_read_pool(tmp_path: pathlib.Path) -> None:
+    """Test routing reads to the read-only connections (and to the writer within a batch)."""
+    db = DatabaseConnection(str(tmp_path / "test.db"), read_pool_size=2)
+    await db.setup()
+    try:
+        await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT)")
+        await db.insert("items", {"item_id": 1, "name": "one"})
+        assert await db.get_count("items") == 1
+        async with db.batch():
+            await db.insert("items", {"item_id": 2, "name": "two"})
+            # reads within the batch see its (uncommitted) writes
+            assert await db.get_row("items", {"item_id": 2})
+            assert await db.get_count("items") == 2
+
+            async def _read_outside_batch() -> int:
+                return await db.get_count_from_query("SELECT * FROM items")
+
+            # reads outside the batch are served by the read pool (last committed state)
+            task = asyncio.create_task(_read_outside_batch(), context=contextvars.Context())
+            assert await task == 1
+        assert await db.get_count("items") == 2
+        assert [row["item_id"] async for row in db.iter_items("items")] == [1, 2]
+    finally:
+        await db.close()
+
+
+async def test_read_pool_during_batch(tmp_path: pathlib.Path) -> None:
+    """Test that reads see the (own) writes of other tasks while a batch is open."""
+    db = DatabaseConnection(str(tmp_path / "test.db"), read_pool_size=1)
+    await db.setup()
+    try:
+        await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT)")
+        await db.commit()
+
+        async def _add_item(item_id: int) -> bool:
+            # e.g. adding an item to the library (in its own batch) during a library sync
+            async with db.batch():
+                await db.insert("items", {"item_id": item_id, "name": "added"})
+            return await db.get_row("items", {"item_id": item_id}) is not None
+
+        async with db.batch():
+            await db.insert("items", {"item_id": 1, "name": "synced"})
+            task = asyncio.create_task(_add_item(2), context=contextvars.Context())
+            assert await task
+        # a raw (uncommitted) statement outside of a batch is read from the writer
+        await db.execute("INSERT INTO items(item_id, name) VALUES (3, 'raw')")
+        assert await db.get_count("items") == 3
+        await db.commit()
+    finally:
+        await db.close()
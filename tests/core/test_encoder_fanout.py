@@ -0,0 +1,77 @@
+"""Tests for sharing encoders between the clients of a multi-client stream."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from music_assistant_models.enums import ContentType
+from music_assistant_models.media_items import AudioFormat
+
+from music_assistant.helpers import encoder_fanout
+from music_assistant.helpers.encoder_fanout import EncoderFanOut
+
+PCM_FORMAT = AudioFormat(content_type=ContentType.PCM_S16LE, sample_rate=44100, bit_depth=16)
+FLAC_FORMAT = AudioFormat(content_type=ContentType.FLAC, sample_rate=44100, bit_depth=16)
+
+
+class _RawSource:
+    """(Endless) raw audio source which records its subscriptions."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.subscriptions = 0
+        self.closed = 0
+
+    async def subscribe(self) -> AsyncGenerator[bytes, None]:
+        """Subscribe to the raw audio."""
+        self.subscriptions += 1
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield b"x" * 100
+        finally:
+            self.closed += 1
+
+
+async def _passthrough_ffmpeg_stream(
+    audio_input: AsyncGenerator[bytes, None], **_kwargs: Any
+) -> AsyncGenerator[bytes, None]:
+    """Stand-in for get_ffmpeg_stream which passes the input as-is."""
+    try:
+        async for chunk in audio_input:
+            yield chunk
+    finally:
+        await audio_input.aclose()
+
+
+@pytest.fixture(autouse=True)
+def _passthrough_encoder(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(encoder_fanout, "get_ffmpeg_stream", _passthrough_ffmpeg_stream)
+
+
+async def _listen(stream: AsyncGenerator[bytes, None], chunks: int) -> None:
+    """Read a number of chunks from the stream and disconnect."""
+    async for _ in stream:
+        chunks -= 1
+        if not chunks:
+            break
+    await stream.aclose()
+
+
+async def test_encoder_fanout() -> None:
+    """Test that listeners share an encoder, which stops when the last listener leaves."""
+    raw_source = _RawSource()
+    fanout = EncoderFanOut(raw_source.subscribe, PCM_FORMAT)
+    listener1 = fanout.get_stream(FLAC_FORMAT)
+    listener2 = fanout.get_stream(FLAC_FORMAT)
+    await asyncio.gather(_listen(listener1, 3), anext(listener2))
+    # the second listener is still connected
+    assert fanout.encoder_count == 1
+    assert fanout.subscriber_count == 1
+    assert raw_source.closed == 0
+    await _listen(listener2, 2)
+    assert fanout.encoder_count == 0
+    assert raw_source.subscriptions == 1
+    assert raw_source.closed == 1
+    assert fanout.encoders_saved == 1
@@ -0,0 +1,61 @@
+"""Tests for the broadcasting of events to the WebSocket clients."""
+
+from typing import Any
+from unittest.mock import Mock
+
+from music_assistant_models.enums import EventType
+from music_assistant_models.event import MassEvent
+
+from music_assistant.controllers.webserver.event_broadcast import EventBroadcaster
+
+
+def _client(accepts: bool = True) -> Any:
+    """Return a stand-in for a WebsocketClientHandler."""
+    return Mock(**{"accepts_event.return_value": accepts})
+
+
+def test_event_broadcast() -> None:
+    """Test that an event is serialized once and sent to all clients that accept it."""
+    unsub = Mock()
+    mass = Mock(**{"subscribe.return_value": unsub})
+    broadcaster = EventBroadcaster(mass)
+    clients = [_client(), _client(accepts=False), _client()]
+    remove_callbacks = [broadcaster.add_client(client) for client in clients]
+    mass.subscribe.assert_called_once()
+    handle_event = mass.subscribe.call_args.args[0]
+
+    mass_event = MassEvent(EventType.PLAYER_UPDATED, object_id="test_player")
+    message = mass_event.to_json()
+    event = Mock(wraps=mass_event, event=EventType.PLAYER_UPDATED)
+    handle_event(event)
+    event.to_json.assert_called_once()
+    for client in clients:
+        client.accepts_event.assert_called_once_with(event)
+    clients[0].send_serialized.assert_called_once_with(message)
+    clients[1].send_serialized.assert_not_called()
+    clients[2].send_serialized.assert_called_once_with(message)
+    stats = broadcaster.get_stats()
+    assert stats["clients"] == 3
+    assert stats["events"][EventType.PLAYER_UPDATED.value]["count"] == 1
+    assert stats["events"][EventType.PLAYER_UPDATED.value]["recipients"] == 2
+
+    # the broadcaster unsubscribes (from the mass events) when the last client is removed
+    for remove_client in remove_callbacks:
+        unsub.assert_not_called()
+        remove_client()
+    unsub.assert_called_once()
+
+
+def test_event_broadcast_no_recipients() -> None:
+    """Test that an event is not serialized if no client accepts it."""
+    mass = Mock()
+    broadcaster = EventBroadcaster(mass)
+    client = _client(accepts=False)
+    broadcaster.add_client(client)
+    event = Mock(
+        wraps=MassEvent(EventType.QUEUE_UPDATED, object_id="test_queue"),
+        event=EventType.QUEUE_UPDATED,
+    )
+    mass.subscribe.call_args.args[0](event)
+    event.to_json.assert_not_called()
+    client.send_serialized.assert_not_called()
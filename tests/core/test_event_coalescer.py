@@ -0,0 +1,45 @@
+"""Tests for the coalescing of events."""
+
+import asyncio
+
+from music_assistant_models.enums import EventType
+from music_assistant_models.event import MassEvent
+
+from music_assistant.helpers.event_coalescer import EventCoalescer
+
+
+async def test_event_coalescing() -> None:
+    """Test that bursts of events are coalesced per object."""
+    batches: list[list[tuple[EventType, str | None, int]]] = []
+
+    def dispatch(events: list[MassEvent]) -> None:
+        batches.append([(x.event, x.object_id, x.data) for x in events])
+
+    coalescer = EventCoalescer(
+        asyncio.get_running_loop(), dispatch, {EventType.PLAYER_UPDATED: 0.05}
+    )
+    for idx in range(5):
+        coalescer.signal(MassEvent(event=EventType.PLAYER_UPDATED, object_id="player1", data=idx))
+        coalescer.signal(MassEvent(event=EventType.PLAYER_UPDATED, object_id="player2", data=idx))
+    # events of other types are dispatched right away
+    coalescer.signal(MassEvent(event=EventType.QUEUE_UPDATED, object_id="queue1", data=0))
+    # the first event is dispatched right away
+    assert batches == [
+        [(EventType.PLAYER_UPDATED, "player1", 0)],
+        [(EventType.QUEUE_UPDATED, "queue1", 0)],
+    ]
+    await asyncio.sleep(0.08)
+    # the remaining events are coalesced (last one wins) into a single batch
+    assert batches[2] == [
+        (EventType.PLAYER_UPDATED, "player2", 4),
+        (EventType.PLAYER_UPDATED, "player1", 4),
+    ]
+    # pending events for an object are dispatched before other events for that object
+    coalescer.signal(MassEvent(event=EventType.PLAYER_UPDATED, object_id="player1", data=5))
+    coalescer.signal(MassEvent(event=EventType.PLAYER_REMOVED, object_id="player1", data=6))
+    assert batches[3:] == [
+        [(EventType.PLAYER_UPDATED, "player1", 5)],
+        [(EventType.PLAYER_REMOVED, "player1", 6)],
+    ]
+    coalescer.flush()
+    assert len(batches) == 5
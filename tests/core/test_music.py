@@ -0,0 +1,156 @@
+"""Tests for the library database of the music controller."""
+
+import json
+import logging
+import pathlib
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from music_assistant.controllers.media.tracks import TRACK_VIEW_QUERY
+from music_assistant.controllers.music import MusicController
+from music_assistant.helpers.database import DatabaseConnection
+
+
+@pytest.fixture
+async def database(tmp_path: pathlib.Path) -> AsyncGenerator[DatabaseConnection, None]:
+    """Return the (empty) library database, with all tables, indexes and triggers."""
+    controller = MusicController.__new__(MusicController)
+    controller.mass = SimpleNamespace(storage_path=str(tmp_path))  # type: ignore[assignment]
+    controller.logger = logging.getLogger(__name__)
+    controller._database = None
+    controller.fts_enabled = False
+    controller._fts_rebuild_tables = set()
+    controller._track_view_rebuild = False
+    await controller._setup_database()
+    yield controller.database
+    await controller.database.close()
+
+
+async def _assert_track_view(database: DatabaseConnection) -> list[dict[str, Any]]:
+    """Assert that the track_view table matches the (correlated subqueries) track query."""
+    stored = await database.get_rows_from_query(
+        "SELECT track_id, album_id, data FROM track_view ORDER BY track_id, album_id", limit=0
+    )
+    expected = await database.get_rows_from_query(
+        f"SELECT * FROM ({TRACK_VIEW_QUERY}) ORDER BY track_id, album_id", limit=0
+    )
+    assert [dict(row) for row in stored] == [dict(row) for row in expected]
+    return [{**row, "data": json.loads(row["data"])} for row in stored]
+
+
+async def _insert(database: DatabaseConnection, table: str, values: dict[str, Any]) -> None:
+    """Insert a row, with the (required) defaults of the media tables."""
+    if table in ("tracks", "albums", "artists"):
+        values = {
+            "sort_name": values["name"].lower(),
+            "search_name": values["name"].lower(),
+            "search_sort_name": values["name"].lower(),
+            "metadata": "{}",
+            "external_ids": "[]",
+            **values,
+        }
+        if table == "albums":
+            values.setdefault("album_type", "album")
+    await database.insert(table, values)
+
+
+def _provider_mapping(item_id: int, provider_item_id: str, media_type: str = "track") -> Any:
+    return {
+        "media_type": media_type,
+        "item_id": item_id,
+        "provider_domain": "test",
+        "provider_instance": "test",
+        "provider_item_id": provider_item_id,
+    }
+
+
+async def _insert_tracks(database: DatabaseConnection) -> None:
+    """Insert two tracks (without an album they get a row with album_id 0)."""
+    await _insert(database, "tracks", {"item_id": 1, "name": "Track 1"})
+    await _insert(database, "tracks", {"item_id": 2, "name": "Track 2"})
+    rows = await _assert_track_view(database)
+    assert [(row["track_id"], row["album_id"]) for row in rows] == [(1, 0), (2, 0)]
+
+
+async def test_track_view_provider_mappings(database: DatabaseConnection) -> None:
+    """Test that the track_view table is kept in sync with the provider mappings."""
+    await _insert_tracks(database)
+    # only the mappings of tracks are part of the view
+    await database.insert("provider_mappings", _provider_mapping(1, "t1"))
+    await database.insert("provider_mappings", _provider_mapping(2, "t2"))
+    await database.insert("provider_mappings", _provider_mapping(1, "a1", "album"))
+    rows = await _assert_track_view(database)
+    assert [x["item_id"] for x in rows[0]["data"]["provider_mappings"]] == ["t1"]
+    await database.update(
+        "provider_mappings", {"provider_item_id": "t1"}, {"available": False, "url": "url"}
+    )
+    await _assert_track_view(database)
+    # a mapping which moves to another track refreshes both tracks
+    await database.execute("UPDATE provider_mappings SET item_id = 1 WHERE item_id = 2")
+    rows = await _assert_track_view(database)
+    assert rows[1]["data"]["provider_mappings"] == []
+    await database.delete("provider_mappings", {"provider_item_id": "t1"})
+    await _assert_track_view(database)
+
+
+async def test_track_view_artists(database: DatabaseConnection) -> None:
+    """Test that the track_view table is kept in sync with the artists of the tracks."""
+    await _insert_tracks(database)
+    await _insert(database, "artists", {"item_id": 1, "name": "Artist 1"})
+    await _insert(database, "artists", {"item_id": 2, "name": "Artist 2"})
+    await database.insert("track_artists", {"track_id": 1, "artist_id": 1})
+    await database.insert("track_artists", {"track_id": 1, "artist_id": 2})
+    await database.insert("track_artists", {"track_id": 2, "artist_id": 2})
+    await _assert_track_view(database)
+    await database.update("artists", {"item_id": 2}, {"name": "Renamed", "sort_name": "renamed"})
+    rows = await _assert_track_view(database)
+    assert rows[1]["data"]["artists"][0]["name"] == "Renamed"
+    await database.delete("track_artists", {"track_id": 1, "artist_id": 1})
+    await _assert_track_view(database)
+    await database.delete("artists", {"item_id": 2})
+    await _assert_track_view(database)
+
+
+async def test_track_view_albums(database: DatabaseConnection) -> None:
+    """Test that the track_view table is kept in sync with the albums of the tracks."""
+    await _insert_tracks(database)
+    await _insert(database, "albums", {"item_id": 1, "name": "Album 1"})
+    await _insert(database, "albums", {"item_id": 2, "name": "Album 2"})
+    # a track has a row for each album it is on
+    album_track = {"track_id": 1, "album_id": 1, "disc_number": 1, "track_number": 1}
+    await database.insert("album_tracks", album_track)
+    await database.insert("album_tracks", {**album_track, "album_id": 2, "track_number": 5})
+    rows = await _assert_track_view(database)
+    assert [(row["track_id"], row["album_id"]) for row in rows] == [(1, 1), (1, 2), (2, 0)]
+    await database.update("album_tracks", {"track_id": 1, "album_id": 2}, {"track_number": 6})
+    await _assert_track_view(database)
+    # an album track which moves to another track refreshes both tracks
+    await database.execute(
+        "UPDATE album_tracks SET track_id = 2 WHERE track_id = 1 AND album_id = 1"
+    )
+    await _assert_track_view(database)
+    await database.update(
+        "albums", {"item_id": 1}, {"name": "Renamed", "metadata": '{"images": []}'}
+    )
+    rows = await _assert_track_view(database)
+    assert rows[1]["data"]["track_album"]["name"] == "Renamed"
+    # changes of other columns leave the rows untouched
+    await database.update("albums", {"item_id": 1}, {"year": 2000})
+    await _assert_track_view(database)
+    await database.delete("album_tracks", {"track_id": 1, "album_id": 2})
+    await _assert_track_view(database)
+    await database.delete("albums", {"item_id": 1})
+    await _assert_track_view(database)
+
+
+async def test_track_view_tracks(database: DatabaseConnection) -> None:
+    """Test that the rows of a track are updated and removed with the track."""
+    await _insert_tracks(database)
+    await database.update("tracks", {"item_id": 1}, {"name": "Renamed"})
+    await _assert_track_view(database)
+    await database.delete("tracks", {"item_id": 1})
+    rows = await _assert_track_view(database)
+    assert {row["track_id"] for row in rows} == {2}
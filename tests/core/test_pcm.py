@@ -0,0 +1,86 @@
+"""Tests for the in-process PCM audio helpers."""
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from music_assistant_models.enums import ContentType
+from music_assistant_models.media_items import AudioFormat
+
+from music_assistant.helpers import pcm
+
+PCM_FORMAT = AudioFormat(
+    content_type=ContentType.PCM_S16LE, sample_rate=1000, bit_depth=16, channels=2
+)
+
+
+def _tone(seconds: float) -> npt.NDArray[np.float32]:
+    """Return a (stereo) sine tone sampled at 1000Hz."""
+    position = np.arange(int(seconds * 1000), dtype=np.float32) / 1000
+    samples = 0.5 * np.sin(2 * np.pi * 50 * position)
+    return np.stack([samples, samples], axis=1).astype(np.float32)
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    [ContentType.PCM_S16LE, ContentType.PCM_S24LE, ContentType.PCM_S32LE, ContentType.PCM_F32LE],
+)
+def test_pcm_conversion_roundtrip(content_type: ContentType) -> None:
+    """Test the conversion of raw PCM audio to (float) samples and back."""
+    bit_depth = 32 if content_type == ContentType.PCM_F32LE else int(content_type.value[1:3])
+    pcm_format = AudioFormat(
+        content_type=content_type, sample_rate=1000, bit_depth=bit_depth, channels=2
+    )
+    samples = _tone(0.5)
+    audio_data = pcm.array_to_pcm(samples, pcm_format)
+    assert len(audio_data) == len(samples) * 2 * bit_depth // 8
+    assert np.allclose(pcm.pcm_to_array(audio_data, pcm_format), samples, atol=1e-4)
+    # incomplete frames are ignored
+    assert len(pcm.pcm_to_array(audio_data[:-1], pcm_format)) == len(samples) - 1
+
+
+def test_strip_silence() -> None:
+    """Test stripping silence from the begin and end of PCM audio."""
+    silence = np.zeros((2000, 2), dtype=np.float32)
+    samples = np.concatenate([silence, _tone(1), silence])
+    audio_data = pcm.array_to_pcm(samples, PCM_FORMAT)
+    frame_size = 4
+    # strip from begin: 0.1 seconds of silence is kept
+    stripped = pcm.strip_silence(audio_data, PCM_FORMAT)
+    assert len(stripped) // frame_size == 2000 + 1000 + 100
+    # strip from end
+    stripped = pcm.strip_silence(audio_data, PCM_FORMAT, reverse=True)
+    assert len(stripped) // frame_size == 2000 + 1000 + 100
+
+
+def test_crossfade() -> None:
+    """Test mixing two parts of PCM audio."""
+    fade_out = np.full((1000, 2), 0.5, dtype=np.float32)
+    fade_out[:200] = 0.25
+    fade_in = np.full((800, 2), -0.5, dtype=np.float32)
+    mixed = pcm.pcm_to_array(
+        pcm.crossfade(
+            pcm.array_to_pcm(fade_out, PCM_FORMAT),
+            pcm.array_to_pcm(fade_in, PCM_FORMAT),
+            PCM_FORMAT,
+        ),
+        PCM_FORMAT,
+    )
+    # the parts overlap by the length of the shortest part: the tail of the fade out
+    # part is mixed with the head of the fade in part (like ffmpeg's acrossfade)
+    assert len(mixed) == 1000
+    assert np.allclose(mixed[:200], 0.25, atol=1e-3)
+    assert mixed[200, 0] == pytest.approx(0.5, abs=1e-2)
+    assert mixed[600, 0] == pytest.approx(0.0, abs=1e-2)
+    assert mixed[-1, 0] == pytest.approx(-0.5, abs=1e-3)
+    # the rest of a longer fade in part follows the mixed part
+    mixed = pcm.pcm_to_array(
+        pcm.crossfade(
+            pcm.array_to_pcm(fade_out[:300], PCM_FORMAT),
+            pcm.array_to_pcm(-fade_out, PCM_FORMAT),
+            PCM_FORMAT,
+        ),
+        PCM_FORMAT,
+    )
+    assert len(mixed) == 1000
+    assert mixed[0, 0] == pytest.approx(0.25, abs=1e-2)
+    assert np.allclose(mixed[300:], -0.5, atol=1e-3)
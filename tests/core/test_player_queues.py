@@ -0,0 +1,227 @@
+"""Tests for the player queues controller."""
+
+import logging
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from music_assistant_models.media_items import ProviderMapping, Track
+from music_assistant_models.queue_item import QueueItem
+
+from music_assistant.controllers import player_queues
+from music_assistant.controllers.player_queues import PlayerQueuesController
+from music_assistant.helpers.queue_items import QueueItems, QueueItemsChange, QueueItemsHistory
+
+QUEUE_ID = "test_queue"
+
+
+def _track(index: int, available: bool = True) -> Track:
+    return Track(
+        item_id=str(index),
+        provider="test",
+        name=f"Track {index}",
+        provider_mappings={
+            ProviderMapping(
+                item_id=str(index),
+                provider_domain="test",
+                provider_instance="test",
+                available=available,
+            )
+        },
+    )
+
+
+def _queue_items(count: int) -> list[QueueItem]:
+    items = [QueueItem.from_media_item(QUEUE_ID, _track(index)) for index in range(count)]
+    for index, item in enumerate(items):
+        item.sort_index = index
+    return items
+
+
+class _Controller(PlayerQueuesController):
+    """PlayerQueuesController (without the MusicAssistant server) with a single queue."""
+
+    def __init__(self, queue_items: list[QueueItem], **queue_attrs: Any) -> None:
+        """Initialize."""
+        self.logger = logging.getLogger(__name__)
+        queue = SimpleNamespace(shuffle_enabled=False, current_index=None, index_in_buffer=None)
+        for key, value in queue_attrs.items():
+            setattr(queue, key, value)
+        self._queues = {QUEUE_ID: queue}  # type: ignore[dict-item]
+        self._queue_items = {QUEUE_ID: QueueItems(queue_items)}
+        self.changed_items: list[QueueItem] = []
+
+    def update_items(
+        self,
+        queue_id: str,
+        queue_items: list[QueueItem],
+        changed_items: list[QueueItem] | None = None,
+    ) -> None:
+        """Update the queue items (without persisting or signaling them)."""
+        self._queue_items[queue_id] = QueueItems(queue_items)
+        self.changed_items += changed_items or []
+
+    @property
+    def queue_items(self) -> list[QueueItem]:
+        """Return the items of the queue."""
+        return list(self._queue_items[QUEUE_ID])
+
+
+class _Tracks:
+    """(Endless) generator of playlist tracks, which records if it was closed."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.yielded = 0
+        self.closed = False
+
+    async def iter_tracks(self) -> AsyncGenerator[Track, None]:
+        """Yield the tracks."""
+        try:
+            while True:
+                self.yielded += 1
+                yield _track(100 + self.yielded)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _small_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(player_queues, "PROGRESSIVE_ENQUEUE_BATCH_SIZE", 5)
+
+
+def test_add_remaining_tracks() -> None:
+    """Test that the tracks are added after the anchor, before the items that follow it."""
+    items = _queue_items(5)
+    controller = _Controller(items, current_index=0)
+    new_items = [QueueItem.from_media_item(QUEUE_ID, _track(index)) for index in range(10, 13)]
+    anchor = controller._add_remaining_tracks(QUEUE_ID, new_items, items[1].queue_item_id)
+    assert anchor == new_items[-1].queue_item_id
+    assert controller.queue_items == [*items[:2], *new_items, *items[2:]]
+    # the sort order matches the queue order (and the items that follow are updated)
+    sort_indexes = [x.sort_index for x in controller.queue_items]
+    assert sort_indexes == sorted(sort_indexes)
+    assert len(set(sort_indexes)) == len(sort_indexes)
+    assert controller.changed_items == items[2:]
+
+
+def test_add_remaining_tracks_shuffle() -> None:
+    """Test that shuffled tracks are only inserted in the upcoming part of the queue."""
+    items = _queue_items(10)
+    controller = _Controller(items, shuffle_enabled=True, current_index=3, index_in_buffer=4)
+    new_items = [QueueItem.from_media_item(QUEUE_ID, _track(index)) for index in range(10, 60)]
+    controller._add_remaining_tracks(QUEUE_ID, new_items, items[9].queue_item_id)
+    # the played items and the item in the buffer are untouched
+    assert controller.queue_items[:5] == items[:5]
+    inserted = {x.queue_item_id for x in controller.queue_items[5:]}
+    assert inserted == {x.queue_item_id for x in [*items[5:], *new_items]}
+    # un-shuffling restores the playlist order (after the anchor)
+    unshuffled = sorted(controller.queue_items, key=lambda x: x.sort_index)
+    assert unshuffled == [*items, *new_items]
+
+
+def test_add_remaining_tracks_anchor_gone() -> None:
+    """Test that no tracks are added if the anchor is no longer in the queue."""
+    controller = _Controller(_queue_items(3))
+    new_items = [QueueItem.from_media_item(QUEUE_ID, _track(10))]
+    assert controller._add_remaining_tracks(QUEUE_ID, new_items, "removed") is None
+    assert len(controller.queue_items) == 3
+
+
+async def test_enqueue_remaining_tracks_anchor_gone() -> None:
+    """Test that the progressive enqueue stops (and closes the tracks) if the queue is cleared."""
+    items = _queue_items(1)
+    controller = _Controller(items)
+    tracks = _Tracks()
+    org_update_items = controller.update_items
+
+    def update_items(
+        queue_id: str,
+        queue_items: list[QueueItem],
+        changed_items: list[QueueItem] | None = None,
+    ) -> None:
+        org_update_items(queue_id, queue_items, changed_items)
+        if len(queue_items) > 10:
+            # the queue was cleared (after two batches)
+            org_update_items(queue_id, [])
+
+    controller.update_items = update_items  # type: ignore[method-assign]
+    await controller._enqueue_remaining_tracks(
+        QUEUE_ID, tracks.iter_tracks(), items[0].queue_item_id
+    )
+    assert tracks.closed
+    assert tracks.yielded == 15
+    assert not controller.queue_items
+
+
+async def test_enqueue_remaining_tracks_error() -> None:
+    """Test that the tracks are closed if adding them to the queue fails."""
+    items = _queue_items(1)
+    controller = _Controller(items)
+    tracks = _Tracks()
+
+    controller.update_items = Mock(side_effect=RuntimeError("Update failed"))  # type: ignore[method-assign]
+    with pytest.raises(RuntimeError):
+        await controller._enqueue_remaining_tracks(
+            QUEUE_ID, tracks.iter_tracks(), items[0].queue_item_id
+        )
+    assert tracks.closed
+
+
+@pytest.mark.parametrize(
+    ("start_item", "expected"),
+    [
+        (None, [0, 2, 3, 4]),
+        ("3", [3, 4]),
+        ("test://track/2", [2, 3, 4]),
+        # the (unavailable) start item is skipped, the tracks after it are played
+        ("1", [2, 3, 4]),
+    ],
+)
+async def test_iter_playlist_tracks(start_item: str | None, expected: list[int]) -> None:
+    """Test the tracks to play of a playlist, from the start item on."""
+    controller = _Controller([])
+
+    async def playlist_tracks(*_: Any) -> AsyncGenerator[Track, None]:
+        for index in range(5):
+            yield _track(index, available=index != 1)
+
+    controller.mass = SimpleNamespace(  # type: ignore[assignment]
+        music=SimpleNamespace(playlists=SimpleNamespace(tracks=playlist_tracks))
+    )
+    playlist = SimpleNamespace(item_id="1", provider="test")
+    tracks = [
+        int(x.item_id)
+        async for x in controller._iter_playlist_tracks(playlist, start_item)  # type: ignore[arg-type]
+    ]
+    assert tracks == expected
+
+
+async def test_load_item(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the (enriched) item is persisted when loaded, without an items update."""
+    items = _queue_items(3)
+    controller = _Controller(items, display_name="Test")
+    library_track = _track(0)
+    signal_event = Mock()
+    controller.mass = SimpleNamespace(  # type: ignore[assignment]
+        music=SimpleNamespace(get_library_item_by_prov_id=AsyncMock(return_value=library_track)),
+        signal_event=signal_event,
+    )
+    items_store = Mock()
+    items_store.update.return_value = [QueueItemsChange("replace", 0, 1, items=[items[0]])]
+    controller._items_store = items_store
+    history = QueueItemsHistory()
+    controller._items_history = {QUEUE_ID: history}
+    version = history.version
+    monkeypatch.setattr(player_queues, "get_stream_details", AsyncMock())
+    await controller._load_item(items[0], 1)
+    assert items[0].media_item is library_track
+    items_store.update.assert_called_once_with(
+        QUEUE_ID, controller._queue_items[QUEUE_ID], [items[0]]
+    )
+    assert history.version == version + 1
+    # the order and number of the items did not change: no (full) items update
+    assert not controller.changed_items
+    signal_event.assert_not_called()
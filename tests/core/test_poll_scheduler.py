@@ -0,0 +1,109 @@
+"""Tests for the scheduler of player polls."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from music_assistant.controllers.players import poll_scheduler
+from music_assistant.controllers.players.poll_scheduler import PlayerPollScheduler
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Player:
+    """Minimal stand-in for a Player that needs polling."""
+
+    def __init__(self, player_id: str, provider: str, delay: float = 0, fail: bool = False):
+        """Initialize."""
+        self.player_id = player_id
+        self.display_name = player_id
+        self.provider = SimpleNamespace(instance_id=provider)
+        self.needs_poll = True
+        self.poll_interval = 0.05
+        self.extra_data: dict[str, Any] = {}
+        self.delay = delay
+        self.fail = fail
+        self.polls = 0
+
+    async def poll(self) -> None:
+        """Poll the player."""
+        self.polls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("unreachable")
+
+
+@pytest.fixture(autouse=True)
+def _short_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(poll_scheduler, "POLL_TIMEOUT", 0.1)
+    monkeypatch.setattr(poll_scheduler, "POLL_MAX_BACKOFF", 0.4)
+
+
+async def test_poll_scheduler() -> None:
+    """Test that unreachable players do not delay (and are polled less than) other players."""
+    players = {
+        "fast1": _Player("fast1", "provider1"),
+        "fast2": _Player("fast2", "provider1"),
+        "hanging": _Player("hanging", "provider2", delay=60),
+        "failing": _Player("failing", "provider2", fail=True),
+    }
+    scheduler = PlayerPollScheduler(players.get, LOGGER, max_concurrency=3)  # type: ignore[arg-type]
+    scheduler.start()
+    try:
+        for player_id in players:
+            scheduler.schedule(player_id)
+        await asyncio.sleep(1)
+        stats = scheduler.stats()
+    finally:
+        await scheduler.stop()
+    # the fast players are polled at (about) their interval
+    assert players["fast1"].polls >= 10
+    assert players["fast2"].polls >= 10
+    # the unreachable players back off
+    assert players["hanging"].polls <= 4
+    assert players["failing"].polls <= 5
+    assert stats["unhealthy_players"].keys() == {"hanging", "failing"}
+    assert stats["providers"]["provider1"]["failures"] == 0
+    assert stats["providers"]["provider2"]["timeouts"] == players["hanging"].polls
+    assert stats["providers"]["provider2"]["max_latency_ms"] >= 100
+
+
+async def test_poll_scheduler_remove() -> None:
+    """Test that removed players (or players that no longer need polling) are not polled."""
+    players = {"player1": _Player("player1", "provider1"), "player2": _Player("player2", "p")}
+    scheduler = PlayerPollScheduler(players.get, LOGGER)  # type: ignore[arg-type]
+    scheduler.start()
+    try:
+        scheduler.schedule("player1")
+        scheduler.schedule("player2")
+        await asyncio.sleep(0.12)
+        scheduler.remove("player1")
+        players["player2"].needs_poll = False
+        polls = (players["player1"].polls, players["player2"].polls)
+        await asyncio.sleep(0.2)
+        assert (players["player1"].polls, players["player2"].polls) == polls
+        assert scheduler.stats()["scheduled"] == 0
+    finally:
+        await scheduler.stop()
+
+
+async def test_poll_scheduler_interval_change() -> None:
+    """Test that a lowered poll interval is picked up before the scheduled deadline."""
+    player = _Player("player", "provider1")
+    player.poll_interval = 10
+    scheduler = PlayerPollScheduler({"player": player}.get, LOGGER)  # type: ignore[arg-type]
+    scheduler.start()
+    try:
+        scheduler.schedule("player")
+        await asyncio.sleep(0.05)
+        assert player.polls == 1
+        # e.g. a player which polls more often while it is playing
+        player.poll_interval = 0.05
+        scheduler.schedule("player")
+        await asyncio.sleep(0.3)
+        assert player.polls >= 4
+    finally:
+        await scheduler.stop()
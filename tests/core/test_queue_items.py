@@ -0,0 +1,156 @@
+"""Tests for the queue items helpers."""
+
+import random
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from music_assistant.helpers import queue_items
+from music_assistant.helpers.queue_items import (
+    QueueItems,
+    QueueItemsChange,
+    QueueItemsHistory,
+    apply_queue_items_change,
+    diff_queue_items,
+)
+
+
+@dataclass
+class _Item:
+    """Minimal stand-in for a QueueItem."""
+
+    queue_item_id: str
+
+
+def _assert_indexed(items: QueueItems, removed: list[_Item]) -> None:
+    """Assert that all (and only) the items in the list are found at their index."""
+    for index, item in enumerate(items):
+        assert items.index_of(item.queue_item_id) == index
+        assert items.get_by_id(item.queue_item_id) is item
+    for removed_item in removed:
+        assert items.index_of(removed_item.queue_item_id) is None
+
+
+def test_queue_items_index() -> None:
+    """Test that the index stays in sync with the list operations."""
+    items = QueueItems(_Item(str(x)) for x in range(10))  # type: ignore[misc]
+    removed: list[Any] = []
+    _assert_indexed(items, removed)
+    items.append(_Item("10"))  # type: ignore[arg-type]
+    items.extend([_Item("11"), _Item("12")])  # type: ignore[list-item]
+    _assert_indexed(items, removed)
+    items.insert(0, _Item("13"))  # type: ignore[arg-type]
+    items.insert(-1, _Item("14"))  # type: ignore[arg-type]
+    _assert_indexed(items, removed)
+    # move
+    items.insert(2, items.pop(8))
+    _assert_indexed(items, removed)
+    removed.append(items.pop())
+    removed.append(items.pop(3))
+    del items[-2]
+    items.remove(items[0])
+    _assert_indexed(items, [])
+    removed.append(items[4])
+    items[4] = _Item("15")  # type: ignore[call-overload]
+    _assert_indexed(items, removed)
+    random.shuffle(items)
+    _assert_indexed(items, removed)
+    items.sort(key=lambda x: int(x.queue_item_id))
+    _assert_indexed(items, removed)
+    items[2:5] = [_Item("16")]  # type: ignore[list-item]
+    del items[:2]
+    _assert_indexed(items, [])
+    # slices are plain lists
+    assert type(items[1:]) is list
+    items.clear()
+    _assert_indexed(items, removed)
+
+
+def test_queue_items_random_operations() -> None:
+    """Test the index against a linear scan after random mutations."""
+    rnd = random.Random(1)
+    items = QueueItems()
+    counter = 0
+    for _ in range(2000):
+        action = rnd.random()
+        if action < 0.4 or not items:
+            counter += 1
+            items.insert(rnd.randint(-len(items), len(items)), _Item(str(counter)))  # type: ignore[arg-type]
+        elif action < 0.6:
+            items.append(_Item(str(counter := counter + 1)))  # type: ignore[arg-type]
+        elif action < 0.8:
+            items.pop(rnd.randrange(len(items)))
+        else:
+            items.insert(rnd.randrange(len(items)), items.pop(rnd.randrange(len(items))))
+        queue_item_id = str(rnd.randint(1, counter))
+        expected = next(
+            (idx for idx, item in enumerate(items) if item.queue_item_id == queue_item_id),
+            None,
+        )
+        assert items.index_of(queue_item_id) == expected
+
+
+def _apply_diff(old: list[str], new: list[str]) -> list[str]:
+    """Apply the diff between old and new to (a copy of) old."""
+    result = list(old)
+    for change in diff_queue_items(old, new):
+        serialized: dict[str, Any] = {"op": change.op, "index": change.index}
+        if change.op == "insert":
+            serialized["items"] = new[change.index : change.index + change.count]
+        else:
+            serialized["count"] = change.count
+            serialized["to"] = change.to
+        result = apply_queue_items_change(result, serialized)
+    return result
+
+
+def test_diff_queue_items() -> None:
+    """Test the (minimal) diff of the typical queue edits."""
+    old = [str(x) for x in range(10)]
+    assert diff_queue_items(old, old) == []
+    # append
+    changes = diff_queue_items(old, [*old, "10", "11"])
+    assert [(x.op, x.index, x.count) for x in changes] == [("insert", 10, 2)]
+    # delete
+    changes = diff_queue_items(old, old[:3] + old[4:])
+    assert [(x.op, x.index, x.count) for x in changes] == [("remove", 3, 1)]
+    # move a single item down and up
+    new = old[:2] + old[3:8] + [old[2]] + old[8:]
+    changes = diff_queue_items(old, new)
+    assert [(x.op, x.index, x.count, x.to) for x in changes] == [("move", 2, 1, 7)]
+    assert _apply_diff(old, new) == new
+    new = [*old[:2], old[7], *old[2:7], *old[8:]]
+    changes = diff_queue_items(old, new)
+    assert [(x.op, x.index, x.count, x.to) for x in changes] == [("move", 7, 1, 2)]
+    assert _apply_diff(old, new) == new
+    # (re)shuffle of the remaining items
+    rnd = random.Random(2)
+    for _ in range(200):
+        new = [x for x in old if rnd.random() > 0.2]
+        tail = new[rnd.randrange(len(new)) :]
+        rnd.shuffle(tail)
+        new = new[: len(new) - len(tail)] + tail
+        new.insert(rnd.randrange(len(new) + 1), "new")
+        assert _apply_diff(old, new) == new
+
+
+def test_queue_items_history(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the versioned history of queue item changes."""
+    monkeypatch.setattr(queue_items, "HISTORY_MAX_VERSIONS", 3)
+    history = QueueItemsHistory()
+    start = history.version
+    assert history.get_changes(start) == []
+    assert history.latest_changes == []
+    for index in range(4):
+        assert history.add([QueueItemsChange("remove", index, 1)]) == start + index + 1
+    assert [x.index for x in history.latest_changes] == [3]
+    # the changes since a version are returned in order
+    changes = history.get_changes(start + 2)
+    assert changes is not None
+    assert [x.index for x in changes] == [2, 3]
+    # the changes of the oldest version(s) are no longer available
+    assert history.get_changes(start + 1) is not None
+    assert history.get_changes(start) is None
+    # unknown (future) versions require a full refresh
+    assert history.get_changes(start + 10) is None
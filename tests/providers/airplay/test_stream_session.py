@@ -0,0 +1,205 @@
+"""Stress tests for the (per client) buffering of the AirPlay stream session."""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from music_assistant.providers.airplay import stream_session
+from music_assistant.providers.airplay.constants import AIRPLAY_CLIENT_MAX_RESYNCS
+from music_assistant.providers.airplay.stream_session import AirPlayStreamSession
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 50
+# 1000 bytes per second: each chunk is 50ms of audio
+PCM_FORMAT = SimpleNamespace(pcm_sample_size=1000)
+CHUNKS = [bytes([index]) * CHUNK_SIZE for index in range(60)]
+
+
+class _Stream:
+    """Minimal stand-in for the (RAOP/AirPlay2) stream of a player."""
+
+    def __init__(self, session: AirPlayStreamSession) -> None:
+        """Initialize."""
+        self.session = session
+        self.running = True
+
+    async def stop(self) -> None:
+        """Stop the stream."""
+        self.running = False
+
+
+class _Player:
+    """Minimal stand-in for an AirPlayPlayer, with a (simulated) read speed."""
+
+    def __init__(self, player_id: str, write_delay: float, burst: int = 0) -> None:
+        """Initialize."""
+        self.player_id = player_id
+        self.write_delay = write_delay
+        # number of chunks which are read without delay (e.g. the initial burst of ffmpeg)
+        self.burst = burst
+        self.stream: _Stream | None = None
+        self.received: list[bytes] = []
+        self.eof = False
+
+    def set_state_from_stream(self, state: Any, elapsed_time: float) -> None:
+        """Update the state of the player from the stream."""
+
+
+def _get_session(players: list[_Player], late_join: bool) -> AirPlayStreamSession:
+    tasks: set[asyncio.Task[Any]] = set()
+
+    def create_task(coro: Any) -> asyncio.Task[Any]:
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    provider = SimpleNamespace(
+        mass=SimpleNamespace(create_task=create_task),
+        logger=LOGGER,
+        config=SimpleNamespace(get_value=lambda _key, _default=None: late_join),
+    )
+    session = AirPlayStreamSession(provider, list(players), PCM_FORMAT)  # type: ignore[arg-type]
+
+    async def prepare_client(player: _Player) -> None:
+        player.stream = _Stream(session)
+        session._start_client_writer(player)  # type: ignore[arg-type]
+
+    async def start_client(player: _Player, start_ntp: int) -> None:
+        pass
+
+    async def write_chunk(player: _Player, chunk: bytes) -> None:
+        if len(player.received) >= player.burst:
+            await asyncio.sleep(player.write_delay)
+        player.received.append(chunk)
+
+    async def write_eof(player: _Player) -> None:
+        player.eof = True
+
+    session._prepare_client = prepare_client  # type: ignore[assignment,method-assign]
+    session._start_client = start_client  # type: ignore[assignment,method-assign]
+    session._write_chunk_to_player = write_chunk  # type: ignore[assignment,method-assign]
+    session._write_eof_to_player = write_eof  # type: ignore[assignment,method-assign]
+    return session
+
+
+async def _source(chunks: list[bytes] = CHUNKS) -> AsyncGenerator[bytes, None]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _stream(session: AirPlayStreamSession, players: list[_Player]) -> float:
+    """Stream the source to the players, return the duration."""
+    for player in players:
+        await session._prepare_client(player)  # type: ignore[arg-type]
+    session.start_time = time.time()
+    session._clients_ready.set()
+    start = time.time()
+    await asyncio.wait_for(session._audio_streamer(_source()), 10)
+    for player in players:
+        while player in session.sync_clients and not player.eof:
+            await asyncio.sleep(0.01)
+    return time.time() - start
+
+
+@pytest.fixture(autouse=True)
+def _small_buffers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(stream_session, "AIRPLAY_CLIENT_BUFFER_SECONDS", 0.5)
+    monkeypatch.setattr(stream_session, "AIRPLAY_PRELOAD_SECONDS", 0)
+
+
+@pytest.mark.parametrize("late_join", [False, True])
+async def test_slow_clients(late_join: bool) -> None:
+    """Test that slow (and stalled) clients do not hold back the other clients."""
+    fast_players = [_Player(f"fast{x}", write_delay=0.001) for x in range(3)]
+    slow_player = _Player("slow", write_delay=0.5)
+    stalled_player = _Player("stalled", write_delay=3600)
+    players = [*fast_players, slow_player, stalled_player]
+    session = _get_session(players, late_join)
+    duration = await _stream(session, players)
+    # the source advances at the session clock (3 seconds of audio, 0.5 seconds buffered ahead)
+    assert 2 < duration < 4
+    # the fast players received all (and only) the audio, in order
+    for player in fast_players:
+        assert player.received == CHUNKS
+        assert player.eof
+    # the lagging players were resynced (if allowed) and finally removed
+    assert session.sync_clients == fast_players
+    expected_resyncs = AIRPLAY_CLIENT_MAX_RESYNCS if late_join else 0
+    assert session._client_resyncs.get("stalled", 0) == expected_resyncs
+    assert len(slow_player.received) < len(CHUNKS)
+    await session.stop()
+
+
+async def test_paused_client() -> None:
+    """Test that the source waits for a single (paused) client instead of dropping it."""
+    player = _Player("player", write_delay=0.001)
+    session = _get_session([player], late_join=True)
+    await session._prepare_client(player)  # type: ignore[arg-type]
+    session.start_time = time.time()
+    session._clients_ready.set()
+    player.write_delay = 1.5  # paused
+    streamer = asyncio.create_task(session._audio_streamer(_source()))
+    await asyncio.sleep(1)
+    assert session.seconds_streamed <= 0.6
+    player.write_delay = 0.001  # resumed
+    await asyncio.wait_for(streamer, 10)
+    while not player.eof:
+        await asyncio.sleep(0.01)
+    assert player.received == CHUNKS
+    assert session.sync_clients == [player]
+    await session.stop()
+
+
+async def test_realtime_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that clients which read in real-time (with different buffering) are in sync."""
+    monkeypatch.setattr(stream_session, "AIRPLAY_PRELOAD_SECONDS", 0.4)
+    # each player reads a chunk (50ms of audio) per 50ms, after an initial burst
+    players = [_Player(f"player{x}", write_delay=0.05, burst=x * 3) for x in range(3)]
+    session = _get_session(players, late_join=True)
+    duration = await _stream(session, players)
+    assert duration < 4
+    for player in players:
+        assert player.received == CHUNKS
+        assert player.eof
+    assert session.sync_clients == players
+    assert not session._client_resyncs
+    await session.stop()
+
+
+async def test_replace_stream() -> None:
+    """Test that the buffered audio of the previous source is dropped on replace."""
+
+    async def _endless_source() -> AsyncGenerator[bytes, None]:
+        while True:
+            yield b"\x01" * CHUNK_SIZE
+
+    player = _Player("player", write_delay=0.001)
+    session = _get_session([player], late_join=True)
+    await session._prepare_client(player)  # type: ignore[arg-type]
+    session.start_time = time.time()
+    session._clients_ready.set()
+    session._audio_source_task = asyncio.create_task(session._audio_streamer(_endless_source()))
+    await asyncio.sleep(0.3)
+    player.write_delay = 1  # (temporarily) slow, so its buffer fills up
+    await asyncio.sleep(1.5)
+    assert session._client_buffers["player"].full
+    old_received = len(player.received)
+    new_chunks = [b"\x02" * CHUNK_SIZE] * 10
+    await asyncio.wait_for(session.replace_stream(_source(new_chunks)), 5)
+    player.write_delay = 0.001
+    await asyncio.wait_for(session._audio_source_task, 5)
+    while not player.eof:
+        await asyncio.sleep(0.01)
+    # only the chunk which was being written (when the stream was replaced) is played
+    old_chunks = [x for x in player.received if x[0] == 1]
+    assert len(old_chunks) <= old_received + 1
+    assert player.received[len(old_chunks) :] == new_chunks
+    assert session.seconds_streamed == pytest.approx(len(player.received) * 0.05)
+    await session.stop()
@@ -1,7 +1,13 @@
 """Tests for utility/helper functions."""
 
+import os
+import pathlib
+from dataclasses import replace
+
 import pytest
 
+from music_assistant.helpers.database import DatabaseConnection
+from music_assistant.helpers.tags import AudioTags
 from music_assistant.providers.filesystem_local import helpers
 
 # ruff: noqa: S108
@@ -112,3 +118,39 @@ def test_get_artist_dir() -> None:
 def test_get_album_dir(album_name: str, track_dir: str, expected: str) -> None:
     """Test the extraction of an album dir."""
     assert helpers.get_album_dir(track_dir, album_name) == expected
+
+
+async def test_audio_tags_cache(tmp_path: pathlib.Path) -> None:
+    """Test that cached tags are only returned for unchanged files."""
+    db = DatabaseConnection(str(tmp_path / "cache.db"))
+    await db.setup()
+    try:
+        tags_cache = helpers.AudioTagsCache(db, "audio_tags")
+        await tags_cache.setup()
+        (tmp_path / "track.mp3").write_bytes(b"data")
+        with os.scandir(tmp_path) as entries:
+            entry = next(x for x in entries if x.name == "track.mp3")
+            item = helpers.FileSystemItem.from_dir_entry(entry, str(tmp_path))
+        tags = AudioTags(
+            raw={},
+            sample_rate=44100,
+            channels=2,
+            bits_per_sample=16,
+            format="mp3",
+            bit_rate=320,
+            duration=180.5,
+            tags={"title": "Track"},
+            has_cover_image=False,
+            filename=item.absolute_path,
+        )
+        assert await tags_cache.get(item) is None
+        await tags_cache.set(item, tags)
+        assert await tags_cache.get(item) == tags
+        # the cached tags are not used if the size, modification time or inode changed
+        assert await tags_cache.get(replace(item, file_size=5)) is None
+        assert await tags_cache.get(replace(item, checksum="0")) is None
+        assert await tags_cache.get(replace(item, inode=(item.inode or 0) + 1)) is None
+        await tags_cache.delete([item.absolute_path])
+        assert await tags_cache.get(item) is None
+    finally:
+        await db.close()
@@ -0,0 +1,150 @@
+"""Tests for the (pipelined) library scan of the filesystem provider."""
+
+import asyncio
+import logging
+import pathlib
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from music_assistant.providers import filesystem_local
+from music_assistant.providers.filesystem_local import LocalFileSystemProvider
+from music_assistant.providers.filesystem_local.constants import (
+    CONF_ENTRY_IGNORE_ALBUM_PLAYLISTS,
+    CONF_ENTRY_SCAN_CONCURRENCY,
+)
+from music_assistant.providers.filesystem_local.helpers import FileSystemItem, LibraryScanProgress
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Database:
+    """Minimal stand-in for a DatabaseConnection, which records its batches."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.batches = 0
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[None, None]:
+        """Run the writes in a (committed) batch."""
+        yield
+        self.batches += 1
+
+
+def _get_provider(
+    base_path: pathlib.Path, database: _Database, cache_database: _Database
+) -> LocalFileSystemProvider:
+    """Return a provider (without the MusicAssistant server) for the given folder."""
+    config_values: dict[str, Any] = {
+        CONF_ENTRY_SCAN_CONCURRENCY.key: 2,
+        CONF_ENTRY_IGNORE_ALBUM_PLAYLISTS.key: True,
+    }
+    provider = LocalFileSystemProvider.__new__(LocalFileSystemProvider)
+    provider.mass = SimpleNamespace(  # type: ignore[assignment]
+        loop=asyncio.get_running_loop(),
+        music=SimpleNamespace(database=database),
+        cache=SimpleNamespace(database=cache_database),
+    )
+    provider.config = SimpleNamespace(  # type: ignore[assignment]
+        instance_id="filesystem_test",
+        name="Test",
+        get_value=lambda key, default=None: config_values.get(key, default),
+    )
+    provider.logger = LOGGER
+    provider.base_path = str(base_path)
+    provider.media_content_type = "music"
+    provider.tags_cache = None
+    return provider
+
+
+class _Pipeline:
+    """Stand-in for the tags parsing and the processing of the (scanned) items."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.processed: list[str] = []
+        self.block = asyncio.Event()
+        self.block.set()
+
+    async def get_tags(self, item: FileSystemItem, *args: Any) -> Any:
+        """Return the tags of a file (raise for the bad files)."""
+        if item.filename.startswith("bad"):
+            raise ValueError("Invalid file")
+        return SimpleNamespace()
+
+    async def process_item(
+        self, item: FileSystemItem, prev_checksum: str | None, tags: Any = None
+    ) -> bool:
+        """Process a (new or changed) item."""
+        await self.block.wait()
+        self.processed.append(item.relative_path)
+        return True
+
+
+@pytest.fixture
+def library(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Return a folder with (fake) audio files."""
+    for index in range(10):
+        folder = tmp_path / f"album{index % 3}"
+        folder.mkdir(exist_ok=True)
+        (folder / f"track{index}.mp3").write_bytes(b"data")
+    (tmp_path / "album0" / "bad.flac").write_bytes(b"data")
+    (tmp_path / "album0" / "cover.jpg").write_bytes(b"data")
+    return tmp_path
+
+
+async def _scan(
+    provider: LocalFileSystemProvider,
+    pipeline: _Pipeline,
+    file_checksums: dict[str, str],
+    cur_filenames: set[str],
+) -> LibraryScanProgress:
+    provider._get_tags = pipeline.get_tags  # type: ignore[method-assign,assignment]
+    provider._process_item = pipeline.process_item  # type: ignore[method-assign]
+    return await provider._scan_library(
+        provider._listdir(provider.base_path), file_checksums, cur_filenames
+    )
+
+
+async def test_scan_library(library: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only the new/changed files are processed, in batches of writes."""
+    monkeypatch.setattr(filesystem_local, "SCAN_BATCH_SIZE", 3)
+    database, cache_database = _Database(), _Database()
+    provider = _get_provider(library, database, cache_database)
+    pipeline = _Pipeline()
+    # two files did not change since the previous scan, one did
+    unchanged = {"album0/track0.mp3", "album1/track1.mp3"}
+    file_checksums = {path: str(int((library / path).stat().st_mtime)) for path in unchanged}
+    file_checksums["album2/track2.mp3"] = "0"
+    cur_filenames: set[str] = set()
+    progress = await _scan(provider, pipeline, file_checksums, cur_filenames)
+    assert progress.scanned == 11
+    assert progress.changed == 9
+    assert progress.processed == 8
+    assert progress.errors == 1
+    assert sorted(pipeline.processed) == sorted(
+        f"album{index % 3}/track{index}.mp3" for index in range(2, 10)
+    )
+    assert cur_filenames == {f"album{index % 3}/track{index}.mp3" for index in range(10)}
+    # the writes are committed per SCAN_BATCH_SIZE items (and the remainder)
+    assert database.batches == 3
+    # the writes to the tags cache are committed per batch of the directory walk
+    assert cache_database.batches == 4
+
+
+async def test_scan_library_cancel(library: pathlib.Path) -> None:
+    """Test that the scan (and all of its stages) stops when it is cancelled."""
+    provider = _get_provider(library, _Database(), _Database())
+    pipeline = _Pipeline()
+    pipeline.block.clear()
+    scan_task = asyncio.create_task(_scan(provider, pipeline, {}, set()))
+    await asyncio.sleep(0.2)
+    assert not scan_task.done()
+    scan_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(scan_task, 5)
+    assert not pipeline.processed
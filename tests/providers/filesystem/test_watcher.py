@@ -0,0 +1,95 @@
+"""Tests for the watcher of the media folder."""
+
+import asyncio
+import logging
+import pathlib
+
+import pytest
+
+from music_assistant.providers.filesystem_local import watcher
+from music_assistant.providers.filesystem_local.watcher import (
+    FileSystemWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Changes:
+    """Collect the changes reported by a watcher."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.changed: set[str] = set()
+        self.deleted: set[str] = set()
+        self.event = asyncio.Event()
+
+    async def callback(self, changed: set[str], deleted: set[str]) -> None:
+        """Handle the reported changes."""
+        self.changed |= changed
+        self.deleted |= deleted
+        self.event.set()
+
+    async def wait(self, watcher: FileSystemWatcher) -> None:
+        """Wait for the next report of the watcher."""
+        if isinstance(watcher, PollingWatcher):
+            changed, deleted = await asyncio.to_thread(watcher.poll)
+            for path in deleted:
+                watcher._add_change(path, deleted=True)
+            for path in changed:
+                watcher._add_change(path)
+        await asyncio.wait_for(self.event.wait(), 5)
+        self.event.clear()
+
+
+def _write(path: pathlib.Path, data: bytes = b"data") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+@pytest.fixture(autouse=True)
+def _short_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(watcher, "WATCH_DELAY", 0.05)
+
+
+@pytest.mark.parametrize("watcher_cls", [InotifyWatcher, PollingWatcher])
+async def test_watcher(tmp_path: pathlib.Path, watcher_cls: type[FileSystemWatcher]) -> None:
+    """Test the changes reported by the watchers."""
+    if watcher_cls is InotifyWatcher and not InotifyWatcher.is_available():
+        pytest.skip("inotify is not available")
+    _write(tmp_path / "Artist" / "Album" / "01.flac")
+    _write(tmp_path / "Artist" / "Album" / "02.flac")
+    changes = _Changes()
+    fs_watcher = watcher_cls(str(tmp_path), changes.callback, LOGGER)
+    await fs_watcher.start()
+    try:
+        # new file in an existing directory
+        _write(tmp_path / "Artist" / "Album" / "03.flac")
+        # ignored (hidden) file
+        _write(tmp_path / "Artist" / "Album" / ".03.flac.part")
+        # new directory (tree)
+        _write(tmp_path / "Other" / "Album" / "01.mp3")
+        await changes.wait(fs_watcher)
+        assert "Artist/Album/03.flac" in changes.changed
+        assert "Other" in changes.changed
+        assert not any(".part" in path for path in changes.changed)
+        assert not changes.deleted
+
+        # files in the new directory are watched as well
+        changes.changed.clear()
+        await asyncio.sleep(0.01)
+        _write(tmp_path / "Other" / "Album" / "02.mp3")
+        await changes.wait(fs_watcher)
+        assert "Other/Album/02.mp3" in changes.changed
+
+        # delete and rename
+        changes.changed.clear()
+        await asyncio.sleep(0.01)
+        (tmp_path / "Artist" / "Album" / "01.flac").unlink()
+        (tmp_path / "Other").rename(tmp_path / "Renamed")
+        await changes.wait(fs_watcher)
+        assert changes.deleted == {"Artist/Album/01.flac", "Other"}
+        assert "Renamed" in changes.changed
+    finally:
+        await fs_watcher.stop()
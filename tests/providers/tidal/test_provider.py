@@ -1,5 +1,6 @@
 """Test Tidal Provider integration."""
 
+import asyncio
 from collections.abc import AsyncGenerator
 from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
@@ -12,13 +13,24 @@ from music_assistant_models.media_items import Album, Artist, Playlist, Track
 from music_assistant.providers.tidal.provider import TidalProvider
 
 
+def _create_task(target: Any, *args: Any, **kwargs: Any) -> asyncio.Task[Any]:
+    """Create a task (like MusicAssistant.create_task), ignoring the task id options."""
+    kwargs.pop("task_id", None)
+    kwargs.pop("abort_existing", None)
+    if asyncio.iscoroutinefunction(target):
+        target = target(*args, **kwargs)
+    return asyncio.create_task(target)
+
+
 @pytest.fixture
 def mass_mock() -> Mock:
     """Return a mock MusicAssistant instance."""
     mass = Mock()
     mass.http_session = AsyncMock()
     mass.metadata.locale = "en_US"
+    mass.create_task = Mock(side_effect=_create_task)
     mass.cache.get = AsyncMock(return_value=None)
+    mass.cache.get_entry = AsyncMock(return_value=None)
     mass.cache.set = AsyncMock()
     mass.cache.delete = AsyncMock()
     return mass